@@ -4,58 +4,40 @@
 #include <ctype.h>
 #include <math.h>
 #include <stdbool.h>
+#include <stdint.h>
 
 /**
  * TEXTGUARD ADVANCED ENGINE (C VERSION - RANKING ENABLED)
  * Includes: Bloom Filter, Winnowing, and Frequency Ranking via Heap Logic.
+ *
+ * Also builds as a shared library for the Python "c" backend:
+ *   cc -O2 -shared -fPIC -DTEXTGUARD_LIB -o libtextguard.so PlagiarismDetector2.c -lm
+ * The tg_* functions below are the library API; main() is left out of that build.
+ *
+ * All buffers are heap-allocated and grow on demand: token lists double their
+ * capacity, hash tables double once they pass MAX_LOAD, so input size is only
+ * bounded by memory and every stage stays linear.
  */
 
-#define MAX_TEXT 100000
-#define MAX_WORDS 20000
-#define MAX_WORD_LEN 64
-#define BLOOM_SIZE 1000000
-#define MOD1 1000000007LL
-#define MOD2 1000000009LL
-#define BASE 131LL
-#define TABLE_SIZE 100003
+#define MOD1 1000000007ULL
+#define MOD2 1000000009ULL
+#define BASE 131ULL
+#define MAX_LOAD 0.7
+#define BLOOM_ERROR 0.01
 #define TOP_K 5
 
-// --- DATA STRUCTURES ---
-
-//double hash of an n-gram.
-typedef struct {
-    long long h1;
-    long long h2;
-} Fingerprint;
-
-
-typedef struct {
-    unsigned char *bits;
-    int size;
-} BloomFilter;
-
-typedef struct {
-    Fingerprint *items;
-    bool *occupied;
-    int capacity;
-    int size;
-} FingerprintSet;
-
-// Structure to track how many times a matching phrase appeared
-typedef struct {
-    Fingerprint fp;
-    char phrase[MAX_WORD_LEN * 5]; // Store actual text for display
-    int frequency;
-    bool occupied;
-} FreqEntry;
+// --- UTILITIES ---
 
-//ranking plagiarism intensity
-typedef struct {
-    FreqEntry *table;
-    int capacity;
-} FrequencyMap;
+static uint64_t mix64(uint64_t x) {
+    // SplitMix64 finalizer, same as textguard.engine.mix64
+    x = (x ^ (x >> 30)) * 0xBF58476D1CE4E5B9ULL;
+    x = (x ^ (x >> 27)) * 0x94D049BB133111EBULL;
+    return x ^ (x >> 31);
+}
 
-// --- UTILITIES ---
+static bool is_space(uint32_t c) {
+    return c == ' ' || c == '\t' || c == '\n' || c == '\r' || c == '\f' || c == '\v';
+}
 
 // Function to read entire file content into a string
 char* read_file(const char* filename) {
@@ -66,109 +48,241 @@ char* read_file(const char* filename) {
     fseek(f, 0, SEEK_SET);
     char *buffer = malloc(length + 1);
     if (buffer) {
-        fread(buffer, 1, length, f);
-        buffer[length] = '\0';
+        size_t got = fread(buffer, 1, length, f);
+        buffer[got] = '\0';
     }
     fclose(f);
     return buffer;
 }
 
+// One line of any length from a stream (without the newline)
+char* read_line(FILE *f) {
+    size_t cap = 256, len = 0;
+    char *line = malloc(cap);
+    if (!line) return NULL;
+    int c;
+    while ((c = fgetc(f)) != EOF && c != '\n') {
+        if (len + 1 == cap) {
+            char *grown = realloc(line, cap *= 2);
+            if (!grown) { free(line); return NULL; }
+            line = grown;
+        }
+        line[len++] = (char)c;
+    }
+    line[len] = '\0';
+    return line;
+}
+
 char* preprocess(const char *text) {
     char *clean = malloc(strlen(text) + 1);
-    int j = 0;
-    for (int i = 0; text[i]; i++) {
-        if (isalnum(text[i])) clean[j++] = (char)tolower(text[i]);
+    if (!clean) return NULL;
+    size_t j = 0;
+    for (size_t i = 0; text[i]; i++) {
+        unsigned char c = (unsigned char)text[i];
+        if (isalnum(c)) clean[j++] = (char)tolower(c);
         else if (j > 0 && clean[j-1] != ' ') clean[j++] = ' ';
     }
+    if (j > 0 && clean[j-1] == ' ') j--;
     clean[j] = '\0';
     return clean;
 }
 
-int tokenize(char *clean, char words[MAX_WORDS][MAX_WORD_LEN]) {
-    int count = 0;
-    char *token = strtok(clean, " ");
-    while (token && count < MAX_WORDS) {
-        strncpy(words[count++], token, MAX_WORD_LEN - 1);
-        token = strtok(NULL, " ");
+// --- TOKEN LIST (growable, offsets into the cleaned text) ---
+
+typedef struct {
+    const char *text;
+    size_t *start;
+    size_t *len;
+    size_t count;
+    size_t capacity;
+} TokenList;
+
+static int token_push(TokenList *tl, size_t start, size_t len) {
+    if (tl->count == tl->capacity) {
+        size_t cap = tl->capacity ? tl->capacity * 2 : 1024;
+        size_t *s = realloc(tl->start, cap * sizeof(size_t));
+        if (!s) return -1;
+        tl->start = s;
+        size_t *l = realloc(tl->len, cap * sizeof(size_t));
+        if (!l) return -1;
+        tl->len = l;
+        tl->capacity = cap;
     }
-    return count;
+    tl->start[tl->count] = start;
+    tl->len[tl->count] = len;
+    tl->count++;
+    return 0;
 }
 
-// --- BLOOM FILTER ---
+// Splits in place on spaces; no copies and no per-word length limit
+int tokenize(const char *clean, TokenList *tl) {
+    tl->text = clean;
+    size_t i = 0;
+    while (clean[i]) {
+        while (clean[i] == ' ') i++;
+        if (!clean[i]) break;
+        size_t start = i;
+        while (clean[i] && clean[i] != ' ') i++;
+        if (token_push(tl, start, i - start) < 0) return -1;
+    }
+    return 0;
+}
 
-BloomFilter* create_bloom() {
-    BloomFilter *bf = malloc(sizeof(BloomFilter));
-    bf->size = BLOOM_SIZE;
-    bf->bits = calloc((BLOOM_SIZE / 8) + 1, sizeof(unsigned char));
-    return bf;
+void free_tokens(TokenList *tl) {
+    free(tl->start);
+    free(tl->len);
+    tl->start = tl->len = NULL;
+    tl->count = tl->capacity = 0;
 }
 
-void bloom_add(BloomFilter *bf, Fingerprint f) {
-    int idx1 = abs((int)(f.h1 % bf->size));
-    int idx2 = abs((int)(f.h2 % bf->size));
-    bf->bits[idx1/8] |= (1 << (idx1%8));
-    bf->bits[idx2/8] |= (1 << (idx2%8));
+// Prints token i .. i+n-1 straight from the text: no phrase buffer, no strcat
+void print_phrase(const TokenList *tl, size_t i, int n) {
+    for (int k = 0; k < n && i + k < tl->count; k++) {
+        if (k) putchar(' ');
+        fwrite(tl->text + tl->start[i + k], 1, tl->len[i + k], stdout);
+    }
 }
 
-bool bloom_check(BloomFilter *bf, Fingerprint f) {
-    int idx1 = abs((int)(f.h1 % bf->size));
-    int idx2 = abs((int)(f.h2 % bf->size));
-    if (!(bf->bits[idx1/8] & (1 << (idx1%8)))) return false;
-    if (!(bf->bits[idx2/8] & (1 << (idx2%8)))) return false;
-    return true;
+// --- HASH SET (open addressing, resized past MAX_LOAD) ---
+
+typedef struct {
+    uint64_t *keys;
+    unsigned char *used;
+    size_t capacity;
+    size_t size;
+} HashSet;
+
+static int set_alloc(HashSet *hs, size_t capacity) {
+    hs->keys = malloc(capacity * sizeof(uint64_t));
+    hs->used = calloc(capacity, 1);
+    hs->capacity = capacity;
+    hs->size = 0;
+    if (!hs->keys || !hs->used) { free(hs->keys); free(hs->used); return -1; }
+    return 0;
+}
+
+static int set_init(HashSet *hs, size_t expected) {
+    size_t cap = 16;
+    while (cap * MAX_LOAD < expected) cap *= 2;
+    return set_alloc(hs, cap);
 }
 
-// --- HASH SETS & FREQUENCY MAP ---
+static void set_free(HashSet *hs) {
+    free(hs->keys);
+    free(hs->used);
+}
 
-FingerprintSet* create_set() {
-    FingerprintSet *fs = malloc(sizeof(FingerprintSet));
-    fs->capacity = TABLE_SIZE;
-    fs->items = malloc(sizeof(Fingerprint) * TABLE_SIZE);
-    fs->occupied = calloc(TABLE_SIZE, sizeof(bool));
-    fs->size = 0;
-    return fs;
+static size_t set_slot(const HashSet *hs, uint64_t key) {
+    size_t mask = hs->capacity - 1;
+    size_t slot = mix64(key) & mask;
+    while (hs->used[slot] && hs->keys[slot] != key) slot = (slot + 1) & mask;
+    return slot;
 }
 
-void set_insert(FingerprintSet *fs, Fingerprint f) {
-    int idx = abs((int)(f.h1 % fs->capacity));
-    while (fs->occupied[idx]) {
-        if (fs->items[idx].h1 == f.h1 && fs->items[idx].h2 == f.h2) return;
-        idx = (idx + 1) % fs->capacity;
+static int set_grow(HashSet *hs) {
+    // Doubles the capacity and rehashes every key
+    HashSet bigger;
+    if (set_alloc(&bigger, hs->capacity * 2) < 0) return -1;
+    for (size_t i = 0; i < hs->capacity; i++) {
+        if (!hs->used[i]) continue;
+        size_t slot = set_slot(&bigger, hs->keys[i]);
+        bigger.keys[slot] = hs->keys[i];
+        bigger.used[slot] = 1;
     }
-    fs->items[idx] = f;
-    fs->occupied[idx] = true;
-    fs->size++;
+    bigger.size = hs->size;
+    set_free(hs);
+    *hs = bigger;
+    return 0;
 }
 
-bool set_contains(FingerprintSet *fs, Fingerprint f) {
-    int idx = abs((int)(f.h1 % fs->capacity));
-    while (fs->occupied[idx]) {
-        if (fs->items[idx].h1 == f.h1 && fs->items[idx].h2 == f.h2) return true;
-        idx = (idx + 1) % fs->capacity;
+// 1 if inserted, 0 if already present, -1 on allocation failure
+static int set_insert(HashSet *hs, uint64_t key) {
+    size_t slot = set_slot(hs, key);
+    if (hs->used[slot]) return 0;
+    if (hs->size + 1 > hs->capacity * MAX_LOAD) {
+        if (set_grow(hs) < 0) return -1;
+        slot = set_slot(hs, key);
     }
-    return false;
+    hs->keys[slot] = key;
+    hs->used[slot] = 1;
+    hs->size++;
+    return 1;
 }
 
-FrequencyMap* create_freq_map() {
-    FrequencyMap *fm = malloc(sizeof(FrequencyMap));
-    fm->capacity = TABLE_SIZE;
-    fm->table = calloc(TABLE_SIZE, sizeof(FreqEntry));
-    return fm;
+static bool set_contains(const HashSet *hs, uint64_t key) {
+    return hs->used[set_slot(hs, key)];
 }
 
-void freq_update(FrequencyMap *fm, Fingerprint f, char *phrase) {
-    int idx = abs((int)(f.h1 % fm->capacity));
-    while (fm->table[idx].occupied) {
-        if (fm->table[idx].fp.h1 == f.h1 && fm->table[idx].fp.h2 == f.h2) {
-            fm->table[idx].frequency++;
-            return;
-        }
-        idx = (idx + 1) % fm->capacity;
+// --- FREQUENCY MAP (matched hash -> count and first position) ---
+
+typedef struct {
+    uint64_t key;
+    long long frequency;
+    size_t first;
+} FreqEntry;
+
+typedef struct {
+    FreqEntry *entries;   // dense, in first-occurrence order
+    size_t *slots;        // 1 + entry index, 0 = empty
+    size_t count;
+    size_t entry_capacity;
+    size_t capacity;
+} FrequencyMap;
+
+static int freq_init(FrequencyMap *fm) {
+    fm->capacity = 16;
+    fm->entry_capacity = 16;
+    fm->count = 0;
+    fm->slots = calloc(fm->capacity, sizeof(size_t));
+    fm->entries = malloc(fm->entry_capacity * sizeof(FreqEntry));
+    if (!fm->slots || !fm->entries) { free(fm->slots); free(fm->entries); return -1; }
+    return 0;
+}
+
+static void freq_free(FrequencyMap *fm) {
+    free(fm->slots);
+    free(fm->entries);
+}
+
+static size_t freq_slot(const size_t *slots, size_t capacity, const FreqEntry *entries, uint64_t key) {
+    size_t mask = capacity - 1;
+    size_t slot = mix64(key) & mask;
+    while (slots[slot] && entries[slots[slot] - 1].key != key) slot = (slot + 1) & mask;
+    return slot;
+}
+
+static int freq_grow(FrequencyMap *fm) {
+    size_t cap = fm->capacity * 2;
+    size_t *slots = calloc(cap, sizeof(size_t));
+    if (!slots) return -1;
+    for (size_t i = 0; i < fm->count; i++) {
+        slots[freq_slot(slots, cap, fm->entries, fm->entries[i].key)] = i + 1;
+    }
+    free(fm->slots);
+    fm->slots = slots;
+    fm->capacity = cap;
+    return 0;
+}
+
+static int freq_update(FrequencyMap *fm, uint64_t key, size_t pos) {
+    size_t slot = freq_slot(fm->slots, fm->capacity, fm->entries, key);
+    if (fm->slots[slot]) {
+        fm->entries[fm->slots[slot] - 1].frequency++;
+        return 0;
     }
-    fm->table[idx].fp = f;
-    fm->table[idx].frequency = 1;
-    strncpy(fm->table[idx].phrase, phrase, sizeof(fm->table[idx].phrase) - 1);
-    fm->table[idx].occupied = true;
+    if (fm->count + 1 > fm->capacity * MAX_LOAD) {
+        if (freq_grow(fm) < 0) return -1;
+        slot = freq_slot(fm->slots, fm->capacity, fm->entries, key);
+    }
+    if (fm->count == fm->entry_capacity) {
+        FreqEntry *grown = realloc(fm->entries, fm->entry_capacity * 2 * sizeof(FreqEntry));
+        if (!grown) return -1;
+        fm->entries = grown;
+        fm->entry_capacity *= 2;
+    }
+    fm->entries[fm->count] = (FreqEntry){key, 1, pos};
+    fm->slots[slot] = ++fm->count;
+    return 0;
 }
 
 // --- HEAP RANKING LOGIC ---
@@ -191,23 +305,279 @@ void min_heapify(FreqEntry heap[], int n, int i) {
     }
 }
 
-// --- CORE LOGIC ---
+// Top-k entries by frequency, highest first; O(N log K)
+int top_k(const FrequencyMap *fm, FreqEntry heap[], int k) {
+    int heapSize = 0;
+    for (size_t i = 0; i < fm->count; i++) {
+        if (heapSize < k) {
+            heap[heapSize++] = fm->entries[i];
+            if (heapSize == k) {
+                for (int j = (k / 2) - 1; j >= 0; j--) min_heapify(heap, k, j);
+            }
+        } else if (fm->entries[i].frequency > heap[0].frequency) {
+            heap[0] = fm->entries[i];
+            min_heapify(heap, k, 0);
+        }
+    }
+    // Heap-sort the survivors: popping minima to the back leaves them descending
+    if (heapSize < k) {
+        for (int j = (heapSize / 2) - 1; j >= 0; j--) min_heapify(heap, heapSize, j);
+    }
+    for (int end = heapSize - 1; end > 0; end--) {
+        swap(&heap[0], &heap[end]);
+        min_heapify(heap, end, 0);
+    }
+    return heapSize;
+}
+
+// --- LIBRARY API (Python "c" backend) ---
+// Hashes match TextGuardEngine bit for bit: shingles are the code points of
+// words joined by single spaces, hashed mod MOD1 and MOD2 and packed as
+// (h1 << 32) | h2 (or h1 alone when dual == 0).
+
+typedef struct {
+    uint64_t *pow1;
+    uint64_t *pow2;
+    size_t len;
+} PowerTable;
+
+static int power_reserve(PowerTable *pt, size_t e) {
+    // BASE^0..BASE^e for both moduli, grown on demand
+    if (e < pt->len) return 0;
+    size_t cap = pt->len ? pt->len : 64;
+    while (cap <= e) cap *= 2;
+    uint64_t *p1 = realloc(pt->pow1, cap * sizeof(uint64_t));
+    if (!p1) return -1;
+    pt->pow1 = p1;
+    uint64_t *p2 = realloc(pt->pow2, cap * sizeof(uint64_t));
+    if (!p2) return -1;
+    pt->pow2 = p2;
+    if (pt->len == 0) { pt->pow1[0] = 1; pt->pow2[0] = 1; pt->len = 1; }
+    for (size_t i = pt->len; i < cap; i++) {
+        pt->pow1[i] = pt->pow1[i - 1] * BASE % MOD1;
+        pt->pow2[i] = pt->pow2[i - 1] * BASE % MOD2;
+    }
+    pt->len = cap;
+    return 0;
+}
 
-Fingerprint get_double_hash(char words[][MAX_WORD_LEN], int start, int n) {
-    long long h1 = 0, h2 = 0;
-    for (int i = 0; i < n; i++) {
-        for (int j = 0; words[start + i][j]; j++) {
-            h1 = (h1 * BASE + words[start + i][j]) % MOD1;
-            h2 = (h2 * BASE + words[start + i][j]) % MOD2;
+/**
+ * Shingle hashes of a whitespace-separated code point buffer.
+ * Keeps the prefix hash of the virtual single-spaced text at the start of the
+ * last n words (a ring buffer), so every shingle is one prefix difference:
+ * H(end) - H(start) * BASE^(end - start). Writes at most words - n + 1 hashes.
+ * Returns the number written, or -1 on allocation failure.
+ */
+long long tg_shingle_hashes(const uint32_t *text, size_t len, int n, int dual, uint64_t *out) {
+    if (n < 1) return 0;
+    uint64_t *start1 = malloc(n * sizeof(uint64_t));
+    uint64_t *start2 = malloc(n * sizeof(uint64_t));
+    size_t *start_pos = malloc(n * sizeof(size_t));
+    PowerTable pt = {NULL, NULL, 0};
+    if (!start1 || !start2 || !start_pos) { free(start1); free(start2); free(start_pos); return -1; }
+
+    uint64_t h1 = 0, h2 = 0;
+    size_t pos = 0, words = 0;
+    long long count = 0;
+    size_t i = 0;
+    while (i < len) {
+        while (i < len && is_space(text[i])) i++;
+        if (i >= len) break;
+        if (words > 0) {
+            // One virtual space between words
+            h1 = (h1 * BASE + ' ') % MOD1;
+            h2 = (h2 * BASE + ' ') % MOD2;
+            pos++;
+        }
+        size_t slot = words % n;
+        start1[slot] = h1; start2[slot] = h2; start_pos[slot] = pos;
+        for (; i < len && !is_space(text[i]); i++, pos++) {
+            h1 = (h1 * BASE + text[i]) % MOD1;
+            h2 = (h2 * BASE + text[i]) % MOD2;
         }
-        if (i < n - 1) { h1 = (h1 * BASE + ' ') % MOD1; h2 = (h2 * BASE + ' ') % MOD2; }
+        words++;
+        if (words >= (size_t)n) {
+            size_t first = (words - n) % n;
+            size_t span = pos - start_pos[first];
+            if (power_reserve(&pt, span) < 0) { count = -1; break; }
+            uint64_t s1 = (h1 + MOD1 - start1[first] * pt.pow1[span] % MOD1) % MOD1;
+            uint64_t s2 = (h2 + MOD2 - start2[first] * pt.pow2[span] % MOD2) % MOD2;
+            out[count++] = dual ? (s1 << 32) | s2 : s1;
+        }
+    }
+    free(start1); free(start2); free(start_pos); free(pt.pow1); free(pt.pow2);
+    return count;
+}
+
+/**
+ * Robust winnowing with a monotonic deque, as in winnow_positions(): the
+ * rightmost minimum of each window of w hashes, each position kept once.
+ * Returns the number of fingerprints written, or -1 on allocation failure.
+ */
+long long tg_winnow(const uint64_t *hashes, size_t count, int w, uint64_t *out_hashes, int64_t *out_pos) {
+    if (count < (size_t)w) {
+        for (size_t i = 0; i < count; i++) { out_hashes[i] = hashes[i]; out_pos[i] = (int64_t)i; }
+        return (long long)count;
+    }
+    // Ring buffer deque of positions; w + 1 slots since a push precedes the expiry pop
+    size_t cap = (size_t)w + 1;
+    size_t *window = malloc(cap * sizeof(size_t));
+    if (!window) return -1;
+    size_t head = 0, size = 0;
+    long long selected = -1, written = 0;
+    for (size_t i = 0; i < count; i++) {
+        while (size && hashes[window[(head + size - 1) % cap]] >= hashes[i]) size--;
+        window[(head + size) % cap] = i;
+        size++;
+        if (window[head] + w <= i) { head = (head + 1) % cap; size--; }
+        if (i + 1 < (size_t)w) continue;
+        size_t low = window[head];
+        if (selected > (long long)(i - w) && hashes[selected] == hashes[low]) continue;
+        selected = (long long)low;
+        out_hashes[written] = hashes[low];
+        out_pos[written++] = (int64_t)low;
+    }
+    free(window);
+    return written;
+}
+
+/**
+ * Buffer -> positional fingerprints in one call (shingle, then winnow).
+ * out_hashes/out_pos need room for len / 2 + 1 entries (the most shingles len can hold).
+ */
+long long tg_fingerprint(const uint32_t *text, size_t len, int n, int w, int dual,
+                         uint64_t *out_hashes, int64_t *out_pos) {
+    uint64_t *hashes = malloc((len / 2 + 1) * sizeof(uint64_t));
+    if (!hashes) return -1;
+    long long count = tg_shingle_hashes(text, len, n, dual, hashes);
+    if (count > 0) count = tg_winnow(hashes, (size_t)count, w, out_hashes, out_pos);
+    free(hashes);
+    return count;
+}
+
+// Fingerprint index: Bloom filter sized like textguard.engine.BloomFilter
+// for the expected count, plus a growable set for exact confirmation.
+typedef struct {
+    unsigned char *bits;
+    uint64_t size;
+    int hash_count;
+    HashSet set;
+} TGIndex;
+
+TGIndex* tg_index_new(size_t expected, double error_rate) {
+    TGIndex *idx = calloc(1, sizeof(TGIndex));
+    if (!idx) return NULL;
+    double cap = expected ? (double)expected : 1.0;
+    uint64_t bits = (uint64_t)ceil(-cap * log(error_rate) / (log(2.0) * log(2.0)));
+    if (bits < 64) bits = 64;
+    // Power of two with an odd step below: probes never repeat a bit
+    idx->size = 64;
+    while (idx->size < bits) idx->size <<= 1;
+    idx->hash_count = (int)nearbyint((double)bits / cap * log(2.0));
+    if (idx->hash_count < 1) idx->hash_count = 1;
+    idx->bits = calloc((idx->size + 7) / 8, 1);
+    if (!idx->bits || set_init(&idx->set, expected) < 0) {
+        free(idx->bits); free(idx);
+        return NULL;
     }
-    return (Fingerprint){h1, h2};
+    return idx;
+}
+
+void tg_index_free(TGIndex *idx) {
+    if (!idx) return;
+    free(idx->bits);
+    set_free(&idx->set);
+    free(idx);
 }
 
+static bool index_bloom_check(const TGIndex *idx, uint64_t h) {
+    uint64_t mask = idx->size - 1;
+    uint64_t bit = h & mask;
+    uint64_t step = mix64(h) | 1;
+    for (int i = 0; i < idx->hash_count; i++) {
+        if (!(idx->bits[bit >> 3] & (1 << (bit & 7)))) return false;
+        bit = (bit + step) & mask;
+    }
+    return true;
+}
+
+// Adds fingerprints; returns how many were new, or -1 on allocation failure
+long long tg_index_add(TGIndex *idx, const uint64_t *hashes, size_t count) {
+    long long added = 0;
+    for (size_t i = 0; i < count; i++) {
+        uint64_t h = hashes[i];
+        uint64_t mask = idx->size - 1;
+        uint64_t bit = h & mask;
+        uint64_t step = mix64(h) | 1;
+        for (int k = 0; k < idx->hash_count; k++) {
+            idx->bits[bit >> 3] |= (unsigned char)(1 << (bit & 7));
+            bit = (bit + step) & mask;
+        }
+        int inserted = set_insert(&idx->set, h);
+        if (inserted < 0) return -1;
+        added += inserted;
+    }
+    return added;
+}
+
+size_t tg_index_size(const TGIndex *idx) { return idx->set.size; }
+uint64_t tg_index_bloom_bits(const TGIndex *idx) { return idx->size; }
+int tg_index_hash_count(const TGIndex *idx) { return idx->hash_count; }
+
+// Steps 2-3 of execute_scan into a FrequencyMap; returns total matches or -1
+static long long index_scan(const TGIndex *idx, const uint64_t *hashes, size_t count,
+                            FrequencyMap *fm, size_t *out_skips) {
+    long long matches = 0;
+    size_t skips = 0;
+    for (size_t i = 0; i < count; i++) {
+        uint64_t h = hashes[i];
+        if (!index_bloom_check(idx, h)) { skips++; continue; }
+        if (!set_contains(&idx->set, h)) continue;
+        matches++;
+        if (freq_update(fm, h, i) < 0) return -1;
+    }
+    *out_skips = skips;
+    return matches;
+}
+
+/**
+ * Scans a suspect's shingle hashes against the index (steps 2-3 of
+ * execute_scan). Distinct matched hashes are written in first-occurrence
+ * order with their counts and first positions; each output array needs room
+ * for count entries. Returns total matches, or -1 on allocation failure.
+ */
+long long tg_scan(const TGIndex *idx, const uint64_t *hashes, size_t count,
+                  uint64_t *out_keys, int64_t *out_counts, int64_t *out_first,
+                  size_t *out_unique, size_t *out_skips) {
+    FrequencyMap fm;
+    if (freq_init(&fm) < 0) return -1;
+    long long matches = index_scan(idx, hashes, count, &fm, out_skips);
+    if (matches >= 0) {
+        for (size_t i = 0; i < fm.count; i++) {
+            out_keys[i] = fm.entries[i].key;
+            out_counts[i] = fm.entries[i].frequency;
+            out_first[i] = (int64_t)fm.entries[i].first;
+        }
+        *out_unique = fm.count;
+    }
+    freq_free(&fm);
+    return matches;
+}
+
+// --- CORE LOGIC ---
+
+// Cleaned bytes as code points for the hashing API
+uint32_t* to_code_points(const char *clean, size_t *len) {
+    *len = strlen(clean);
+    uint32_t *points = malloc((*len + 1) * sizeof(uint32_t));
+    if (!points) return NULL;
+    for (size_t i = 0; i < *len; i++) points[i] = (unsigned char)clean[i];
+    return points;
+}
+
+#ifndef TEXTGUARD_LIB
 int main() {
     char *docA = NULL, *docB = NULL;
-    char buffer[MAX_TEXT];
     int choice;
 
     printf("=== TEXTGUARD C-CORE (FREQUENCY RANKING MODE) ===\n");
@@ -215,29 +585,24 @@ int main() {
     printf("1. Manual Text Entry\n");
     printf("2. Read from .txt Files\n");
     printf("Choice: ");
-    scanf("%d", &choice);
+    if (scanf("%d", &choice) != 1) return 1;
     getchar(); // clear newline
 
     if (choice == 1) {
         printf("\nEnter Original Document (A):\n");
-        fgets(buffer, MAX_TEXT, stdin);
-        docA = strdup(buffer);
+        docA = read_line(stdin);
         printf("\nEnter Suspect Document (B):\n");
-        fgets(buffer, MAX_TEXT, stdin);
-        docB = strdup(buffer);
+        docB = read_line(stdin);
     } else {
         char filename[256];
         printf("\nEnter filename for Original (A) (e.g., doc1.txt): ");
-        scanf("%s", filename);
-        docA = read_file(filename);
+        if (scanf("%255s", filename) == 1) docA = read_file(filename);
         printf("Enter filename for Suspect (B) (e.g., doc2.txt): ");
-        scanf("%s", filename);
-        docB = read_file(filename);
-        
-        if (!docA || !docB) {
-            printf("Error: Could not read files. Ensure they exist in the directory.\n");
-            return 1;
-        }
+        if (scanf("%255s", filename) == 1) docB = read_file(filename);
+    }
+    if (!docA || !docB) {
+        printf("Error: Could not read files. Ensure they exist in the directory.\n");
+        return 1;
     }
 
     int n = 3, w = 3;
@@ -245,68 +610,53 @@ int main() {
 
     // 1. Prepare Doc A
     char *cleanA = preprocess(docA);
-    char wordsA[MAX_WORDS][MAX_WORD_LEN];
-    int wcA = tokenize(cleanA, wordsA);
-    int numHashesA = wcA - n + 1;
-    Fingerprint *hashesA = malloc(sizeof(Fingerprint) * numHashesA);
-    for (int i = 0; i < numHashesA; i++) hashesA[i] = get_double_hash(wordsA, i, n);
-
-    FingerprintSet *fpsA = create_set();
-    BloomFilter *bf = create_bloom();
-    for (int i = 0; i <= numHashesA - w; i++) {
-        Fingerprint minF = hashesA[i];
-        for (int j = 1; j < w; j++) if (hashesA[i+j].h1 < minF.h1) minF = hashesA[i+j];
-        set_insert(fpsA, minF);
-        bloom_add(bf, minF);
-    }
+    size_t lenA;
+    uint32_t *pointsA = to_code_points(cleanA, &lenA);
+    uint64_t *fpsA = malloc((lenA / 2 + 1) * sizeof(uint64_t));
+    int64_t *posA = malloc((lenA / 2 + 1) * sizeof(int64_t));
+    long long numFpsA = tg_fingerprint(pointsA, lenA, n, w, 1, fpsA, posA);
+    if (numFpsA < 0) { printf("Error: out of memory.\n"); return 1; }
+
+    TGIndex *index = tg_index_new((size_t)numFpsA, BLOOM_ERROR);
+    if (!index || tg_index_add(index, fpsA, (size_t)numFpsA) < 0) { printf("Error: out of memory.\n"); return 1; }
 
     // 2. Scan Doc B and Track Frequencies
     char *cleanB = preprocess(docB);
-    char wordsB[MAX_WORDS][MAX_WORD_LEN];
-    int wcB = tokenize(cleanB, wordsB);
-    int numHashesB = wcB - n + 1;
-    int total_matches = 0;
-    FrequencyMap *fm = create_freq_map();
-
-    for (int i = 0; i < numHashesB; i++) {
-        Fingerprint f = get_double_hash(wordsB, i, n);
-        if (bloom_check(bf, f) && set_contains(fpsA, f)) {
-            total_matches++;
-            // Reconstruct phrase for the frequency map
-            char phrase[256] = "";
-            for(int k=0; k<n; k++) { strcat(phrase, wordsB[i+k]); if(k<n-1) strcat(phrase, " "); }
-            freq_update(fm, f, phrase);
-        }
+    TokenList wordsB = {0};
+    size_t lenB;
+    uint32_t *pointsB = to_code_points(cleanB, &lenB);
+    uint64_t *hashesB = malloc((lenB / 2 + 1) * sizeof(uint64_t));
+    long long numHashesB = tg_shingle_hashes(pointsB, lenB, n, 1, hashesB);
+    FrequencyMap fm;
+    size_t skips = 0;
+    long long total_matches = -1;
+    if (tokenize(cleanB, &wordsB) == 0 && numHashesB >= 0 && freq_init(&fm) == 0) {
+        total_matches = index_scan(index, hashesB, (size_t)numHashesB, &fm, &skips);
     }
+    if (total_matches < 0) { printf("Error: out of memory.\n"); return 1; }
 
     // 3. Extract Top K using Min-Heap
     FreqEntry heap[TOP_K];
-    int heapSize = 0;
-    for (int i = 0; i < TABLE_SIZE; i++) {
-        if (fm->table[i].occupied) {
-            if (heapSize < TOP_K) {
-                heap[heapSize] = fm->table[i];
-                heapSize++;
-                if (heapSize == TOP_K) {
-                    for (int j = (TOP_K / 2) - 1; j >= 0; j--) min_heapify(heap, TOP_K, j);
-                }
-            } else if (fm->table[i].frequency > heap[0].frequency) {
-                heap[0] = fm->table[i];
-                min_heapify(heap, TOP_K, 0);
-            }
-        }
-    }
+    int heapSize = top_k(&fm, heap, TOP_K);
 
     // 4. Final Display
-    double score = (double)total_matches / (fpsA->size) * 100.0;
+    size_t fps = tg_index_size(index);
+    double score = fps ? (double)total_matches / fps * 100.0 : 0.0;
     printf("\nOverall Verbatim Score: %.1f%%\n", score);
     printf("\nTOP %d MOST FREQUENT PLAGIARIZED PHRASES:\n", heapSize);
     printf("--------------------------------------------------\n");
-    for (int i = heapSize - 1; i >= 0; i--) {
-        printf("[%d] Freq: %d | Phrase: \"%s\"\n", heapSize - i, heap[i].frequency, heap[i].phrase);
+    for (int i = 0; i < heapSize; i++) {
+        printf("[%d] Freq: %lld | Phrase: \"", i + 1, heap[i].frequency);
+        print_phrase(&wordsB, heap[i].first, n);
+        printf("\"\n");
     }
 
     // Cleanup
-    free(docA); free(docB); free(cleanA); free(cleanB); free(hashesA);
+    free(docA); free(docB); free(cleanA); free(cleanB);
+    free(pointsA); free(pointsB); free(fpsA); free(posA); free(hashesB);
+    free_tokens(&wordsB);
+    freq_free(&fm);
+    tg_index_free(index);
     return 0;
-}
\ No newline at end of file
+}
+#endif
@@ -0,0 +1,214 @@
+"""
+Stage-by-stage benchmarks for the TextGuard engine on synthetic corpora.
+
+    python -m benchmarks.bench_engine --sizes 1KB,100KB,1MB --repeat 5 -o results.json
+    python -m benchmarks.bench_engine --compare before.json after.json
+
+Each (size, backend) case generates a deterministic source/suspect pair, times
+preprocess, hashing, winnowing, bloom build/probe, top-k and the full
+execute_scan separately, and reports p50/p90/max seconds, tokens/s and peak
+traced memory. Results are JSON so two runs can be diffed with --compare.
+"""
+import argparse
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+from textguard.engine import BloomFilter, TextGuardEngine
+
+# --- SYNTHETIC CORPORA ---
+
+UNITS = {"B": 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+
+def parse_size(text):
+    text = text.strip().upper()
+    for unit in ("GB", "MB", "KB", "B"):
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * UNITS[unit])
+    return int(text)
+
+def make_vocabulary(rng, size=20000):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(2, 10))) for _ in range(size)]
+
+def make_text(rng, vocab, weights, size_bytes):
+    # Zipf-distributed words with sentence punctuation, about size_bytes long
+    words, length = [], 0
+    while length < size_bytes:
+        batch = rng.choices(vocab, weights=weights, k=1024)
+        for i, word in enumerate(batch):
+            if i % 17 == 16:
+                word += "."
+            words.append(word)
+            length += len(word) + 1
+    return " ".join(words)[:size_bytes]
+
+def make_pair(size_bytes, plagiarism=0.3, passage_words=40, mutation=0.02, seed=42):
+    """
+    Source text plus a suspect of the same size in which a `plagiarism`
+    fraction of words comes from copied source passages. `mutation` is the
+    chance that a copied word is replaced, which simulates light paraphrasing.
+    """
+    rng = random.Random(seed)
+    vocab = make_vocabulary(rng)
+    weights = [1 / (rank + 1) for rank in range(len(vocab))]
+    source = make_text(rng, vocab, weights, size_bytes).split()
+    filler = make_text(rng, vocab, weights, size_bytes).split()
+
+    suspect, i = [], 0
+    while i < len(filler):
+        if rng.random() < plagiarism:
+            start = rng.randrange(max(1, len(source) - passage_words))
+            for word in source[start:start + passage_words]:
+                suspect.append(rng.choice(vocab) if rng.random() < mutation else word)
+        else:
+            suspect.extend(filler[i:i + passage_words])
+        i += passage_words
+    return " ".join(source), " ".join(suspect[:len(filler)])
+
+# --- STAGE TIMING ---
+
+def timed(fn, repeat):
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return times, result
+
+def peak_memory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def summarize(times, tokens):
+    times = np.array(times)
+    p50 = float(np.percentile(times, 50))
+    return {
+        "p50": p50,
+        "p90": float(np.percentile(times, 90)),
+        "max": float(times.max()),
+        "tokens_per_s": tokens / p50 if p50 > 0 else None,
+    }
+
+def bench_case(source, suspect, backend, n, w, repeat, memory):
+    engine = TextGuardEngine(n=n, w=w, backend=backend)
+    stages = {}
+
+    t, words_a = timed(lambda: engine.tokenize(source), repeat)
+    words_b = engine.tokenize(suspect)
+    tokens = len(words_a)
+    stages["preprocess"] = t
+
+    hash_fn = engine.hash_tokens
+    winnow_fn = engine.vector_winnow if engine.vectorized else engine.winnow_positions
+    stages["hash"], hashes_a = timed(lambda: hash_fn(words_a), repeat)
+    stages["winnow"], _ = timed(lambda: winnow_fn(hashes_a), repeat)
+
+    hashes_b = hash_fn(words_b)
+    fingerprints = engine.document_fingerprints({"words": words_a, "hashes": hashes_a, "fingerprints": None})
+
+    def bloom_build():
+        bloom = BloomFilter(len(fingerprints), engine.bloom_error)
+        if engine.vectorized:
+            bloom.add_many(fingerprints)
+        else:
+            for f in fingerprints:
+                bloom.add(f)
+        return bloom
+    stages["bloom_build"], bloom = timed(bloom_build, repeat)
+    if engine.vectorized:
+        stages["bloom_probe"], _ = timed(lambda: bloom.contains_many(hashes_b), repeat)
+        freq = dict(zip(*[a.tolist() for a in np.unique(hashes_b[np.isin(hashes_b, fingerprints)], return_counts=True)]))
+    else:
+        stages["bloom_probe"], _ = timed(lambda: [h in bloom for h in hashes_b], repeat)
+        freq = {}
+        for h in hashes_b:
+            if h in fingerprints:
+                freq[h] = freq.get(h, 0) + 1
+    stages["top_k"], _ = timed(lambda: engine.get_top_k_matches(freq, k=5), repeat)
+    stages["execute_scan"], res = timed(lambda: engine.execute_scan(source, suspect), repeat)
+
+    result = {
+        "tokens": tokens,
+        "stages": {name: summarize(t, tokens) for name, t in stages.items()},
+        "score": res["score"] if res else None,
+    }
+    if memory:
+        result["peak_bytes"] = peak_memory(lambda: TextGuardEngine(n=n, w=w, backend=backend).execute_scan(source, suspect))
+    return result
+
+# --- REPORTING ---
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {"python": platform.python_version(), "numpy": np.__version__,
+            "platform": platform.platform(), "commit": commit or None}
+
+def print_case(name, case):
+    print(f"\n{name}  ({case['tokens']:,} tokens, score {case['score']:.1f}%)"
+          + (f", peak {case['peak_bytes'] / (1 << 20):.1f} MiB" if "peak_bytes" in case else ""))
+    for stage, stats in case["stages"].items():
+        print(f"  {stage:<13} p50 {stats['p50'] * 1e3:10.2f} ms   p90 {stats['p90'] * 1e3:10.2f} ms"
+              f"   {stats['tokens_per_s'] or 0:14,.0f} tok/s")
+
+def compare(before_path, after_path):
+    with open(before_path) as f:
+        before = json.load(f)["cases"]
+    with open(after_path) as f:
+        after = json.load(f)["cases"]
+    print(f"{'case':<22} {'stage':<13} {'before ms':>11} {'after ms':>11} {'speedup':>8}")
+    for name in sorted(set(before) & set(after)):
+        for stage in after[name]["stages"]:
+            if stage not in before[name]["stages"]:
+                continue
+            old = before[name]["stages"][stage]["p50"]
+            new = after[name]["stages"][stage]["p50"]
+            print(f"{name:<22} {stage:<13} {old * 1e3:11.2f} {new * 1e3:11.2f} {old / new if new else float('inf'):7.2f}x")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark TextGuard engine stages on synthetic corpora.")
+    parser.add_argument("--sizes", default="1KB,100KB,1MB", help="comma-separated sizes, 1KB .. 100MB")
+    parser.add_argument("--backends", default="python,numpy")
+    parser.add_argument("--plagiarism", type=float, default=0.3, help="fraction of the suspect copied")
+    parser.add_argument("--mutation", type=float, default=0.02, help="chance a copied word is replaced")
+    parser.add_argument("-n", type=int, default=4)
+    parser.add_argument("-w", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc peak-memory run")
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two result files")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+
+    results = {"environment": environment(), "params": vars(args), "cases": {}}
+    for size_text in args.sizes.split(","):
+        size = parse_size(size_text)
+        source, suspect = make_pair(size, args.plagiarism, mutation=args.mutation, seed=args.seed)
+        for backend in args.backends.split(","):
+            name = f"{size_text.strip()}/{backend}"
+            case = bench_case(source, suspect, backend, args.n, args.w, args.repeat, not args.no_memory)
+            results["cases"][name] = case
+            print_case(name, case)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
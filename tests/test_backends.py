@@ -0,0 +1,52 @@
+import random
+import pytest
+from textguard import TextGuardEngine
+from textguard import native
+
+# --- CROSS-BACKEND EQUALITY (python / numpy / c) ---
+
+BACKENDS = ["python", "numpy"] + (["c"] if native.available() else [])
+
+def random_text(rng, vocab_size, length):
+    # Small vocabularies give repeated shingles, i.e. tied window minima
+    vocab = [f"tok{i}" for i in range(vocab_size)] + ["Ünïcode", "naïve,", "end."]
+    return " ".join(rng.choices(vocab, k=length))
+
+def cases(count=150, seed=7):
+    rng = random.Random(seed)
+    for _ in range(count):
+        n, w = rng.randint(1, 6), rng.randint(1, 8)
+        vocab_size = rng.choice([1, 2, 3, 8, 200])
+        yield n, w, random_text(rng, vocab_size, rng.randint(0, 300)), random_text(rng, vocab_size, rng.randint(0, 300))
+
+@pytest.mark.parametrize("n, w, text_a, text_b", list(cases()))
+def test_backends_agree(n, w, text_a, text_b):
+    engines = [TextGuardEngine(n=n, w=w, backend=backend) for backend in BACKENDS]
+    fingerprints = [[(int(h), int(pos)) for h, pos in engine.fingerprint(text_a)] for engine in engines]
+    assert all(f == fingerprints[0] for f in fingerprints[1:])
+
+    results = [engine.execute_scan(text_a, text_b) for engine in engines]
+    assert all(r == results[0] for r in results[1:])
+
+@pytest.mark.parametrize("n, w, text_a, text_b", list(cases(count=40, seed=11)))
+def test_stream_matches_fingerprint(n, w, text_a, text_b, tmp_path):
+    from textguard.stream import fingerprint_stream
+    path = tmp_path / "a.txt"
+    path.write_text(text_a, encoding="utf-8")
+    for backend in BACKENDS:
+        engine = TextGuardEngine(n=n, w=w, backend=backend)
+        expected = [(int(h), int(pos)) for h, pos in engine.fingerprint(text_a)]
+        assert [(int(h), int(pos)) for h, pos in fingerprint_stream(engine, str(path), chunk_size=64)] == expected
+
+# --- C CORE PAST ITS OLD FIXED LIMITS ---
+
+@pytest.mark.skipif(not native.available(), reason="C core not built")
+def test_c_core_handles_large_inputs():
+    # Over the former MAX_TEXT (100000 chars), MAX_WORDS (20000) and MAX_WORD_LEN (64)
+    rng = random.Random(19)
+    long_word = "x" * 500
+    text_a = " ".join([f"t{rng.randrange(60000)}" for _ in range(30000)] + [long_word] * 3)
+    text_b = " ".join(text_a.split()[5000:25000] + [long_word] * 3 + [f"n{i}" for i in range(5000)])
+    assert len(text_a) > 100000
+    expected = TextGuardEngine(backend="numpy").execute_scan(text_a, text_b)
+    assert TextGuardEngine(backend="c").execute_scan(text_a, text_b) == expected
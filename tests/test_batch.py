@@ -0,0 +1,55 @@
+import random
+import pytest
+from textguard import CohortScan, TextGuardEngine
+
+# --- COHORT ALL-PAIRS SCAN ---
+
+def cohort(seed, size=7):
+    # Essays over a small shared vocabulary, some of them copying from others
+    rng = random.Random(seed)
+    docs = {}
+    for i in range(size):
+        words = [f"w{rng.randrange(300)}" for _ in range(rng.randint(3, 200))]
+        if docs and rng.random() < 0.5:
+            donor = rng.choice(list(docs.values())).split()
+            start = rng.randrange(len(donor))
+            words[5:5] = donor[start:start + rng.randint(5, 60)]
+        docs[f"s{i}"] = " ".join(words)
+    return docs
+
+def distinct_fingerprints(engine, text):
+    return {h for h, _ in engine.fingerprint(text)}
+
+@pytest.mark.parametrize("seed", range(5))
+def test_pairs_match_brute_force(seed):
+    docs = cohort(seed)
+    scan = CohortScan()
+    scan.add_many(docs)
+    engine = TextGuardEngine()
+    expected = {}
+    ids = list(docs)
+    for i, a in enumerate(ids):
+        for b in ids[i + 1:]:
+            shared = len(distinct_fingerprints(engine, docs[a]) & distinct_fingerprints(engine, docs[b]))
+            if shared:
+                expected[(a, b)] = shared
+    pairs = scan.pairs()
+    assert {(a, b): c for a, b, c in pairs} == expected
+    assert [c for _, _, c in pairs] == sorted(expected.values(), reverse=True)
+    assert all(c >= 3 for _, _, c in scan.pairs(min_shared=3))
+
+@pytest.mark.parametrize("seed", range(5))
+def test_pair_matches_execute_scan(seed):
+    docs = cohort(seed)
+    scan = CohortScan()
+    scan.add_many(docs)
+    for a, b, _ in scan.pairs():
+        expected = TextGuardEngine().execute_scan(docs[a], docs[b])
+        assert scan.pair(a, b) == {key: expected[key] for key in ("score", "matches", "fps", "top_k")}
+
+def test_duplicate_and_empty_cohorts():
+    scan = CohortScan()
+    assert scan.pairs() == []
+    scan.add("a", "one two three four five")
+    with pytest.raises(KeyError):
+        scan.add("a", "again")
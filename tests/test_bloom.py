@@ -0,0 +1,53 @@
+import random
+import numpy as np
+import pytest
+from textguard import BloomFilter
+from textguard import native
+
+# --- BLOOM FILTER (Power-of-Two Size, Odd Probe Step) ---
+
+def random_hashes(count, seed):
+    rng = random.Random(seed)
+    return [rng.getrandbits(64) for _ in range(count)]
+
+@pytest.mark.parametrize("capacity", [1, 7, 100, 1000, 12345])
+def test_probes_hit_distinct_bits(capacity):
+    bloom = BloomFilter(capacity, 0.01)
+    assert bloom.size & (bloom.size - 1) == 0
+    for h in random_hashes(2000, capacity):
+        assert len(set(bloom.probes(h))) == bloom.hash_count
+
+def test_scalar_and_batch_probes_agree():
+    bloom = BloomFilter(500, 0.01)
+    hashes = random_hashes(300, 1)
+    assert bloom.probes_many(hashes).tolist() == [bloom.probes(h) for h in hashes]
+
+def test_no_false_negatives_and_bounded_false_positives():
+    members, others = random_hashes(5000, 2), random_hashes(20000, 3)
+    scalar, batch = BloomFilter(len(members), 0.01), BloomFilter(len(members), 0.01)
+    for h in members:
+        scalar.add(h)
+    batch.add_many(members)
+    assert scalar.raw == batch.raw
+    assert all(h in scalar for h in members)
+    assert batch.contains_many(members).all()
+    rate = np.mean([h in scalar for h in others])
+    assert rate <= 0.015
+    assert scalar.false_positive_rate() <= 0.01
+    assert batch.contains_many(others).tolist() == [h in scalar for h in others]
+
+def test_rejects_bad_error_rate():
+    with pytest.raises(ValueError):
+        BloomFilter(10, 1.5)
+
+@pytest.mark.skipif(not native.available(), reason="C core not built")
+def test_native_index_matches_python_filter():
+    fingerprints = np.array(random_hashes(777, 4), dtype=np.uint64)
+    probes = np.concatenate((fingerprints[:100], np.array(random_hashes(5000, 5), dtype=np.uint64)))
+    bloom = BloomFilter(len(fingerprints), 0.01)
+    bloom.add_many(fingerprints)
+    index = native.NativeIndex(fingerprints, 0.01)
+    assert (index.size, index.hash_count) == (bloom.size, bloom.hash_count)
+    matches, skips, _, _ = index.scan(probes)
+    assert matches == 100
+    assert skips == int(len(probes) - bloom.contains_many(probes).sum())
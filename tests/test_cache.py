@@ -0,0 +1,39 @@
+import subprocess
+import sys
+import pytest
+from textguard import LRUCache, TextGuardEngine
+
+# --- BOUNDED CACHES (Phrases, Prepared Documents) ---
+
+def test_lru_evicts_the_least_recently_used():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (1, None, 3)
+    assert len(cache) == 2
+
+def test_zero_size_cache_stores_nothing():
+    cache = LRUCache(0)
+    cache.put("a", 1)
+    assert cache.get("a") is None and len(cache) == 0
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_phrase_cache_stays_bounded(backend):
+    engine = TextGuardEngine(backend=backend, phrase_cache=3)
+    text = " ".join(f"w{i}" for i in range(200))
+    for shift in range(0, 100, 10):
+        suspect = " ".join(f"w{i}" for i in range(shift, shift + 50))
+        result = engine.execute_scan(text, suspect)
+        # Phrases still come from the suspect, whatever the cache evicted
+        assert all(entry["phrase"] in suspect for entry in result["top_k"])
+    assert len(engine.phrase_cache) <= 3
+
+# --- HEADLESS IMPORT ---
+
+def test_import_loads_no_ui_or_sklearn():
+    code = ("import sys, textguard; textguard.TextGuardEngine; "
+            "print(sorted(m for m in ('streamlit', 'sklearn', 'scipy', 'pandas') if m in sys.modules))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert out.strip() == "[]"
@@ -0,0 +1,62 @@
+import json
+import pytest
+from textguard.cli import EXIT_ERROR, EXIT_FLAGGED, EXIT_OK, main
+
+# --- BATCH CLI (Exit Status, Argument Checks) ---
+
+ESSAY = " ".join(f"word{i}" for i in range(300))
+OTHER = " ".join(f"other{i}" for i in range(300))
+
+@pytest.fixture
+def corpus(tmp_path):
+    for folder, files in (("sources", {"essay.txt": ESSAY}), ("suspects", {"copy.txt": ESSAY, "fresh.txt": OTHER})):
+        (tmp_path / folder).mkdir()
+        for name, text in files.items():
+            (tmp_path / folder / name).write_text(text, encoding="utf-8")
+    return tmp_path
+
+def scan(tmp_path, *extra):
+    output = tmp_path / "out.jsonl"
+    status = main(["scan", *extra, "--workers", "1", "--semantic-model", str(tmp_path / "none.json"),
+                   "-o", str(output)])
+    lines = output.read_text(encoding="utf-8").splitlines() if output.exists() else []
+    return status, [json.loads(line) for line in lines]
+
+def test_copied_suspect_exits_flagged(corpus):
+    status, records = scan(corpus, str(corpus / "sources"), str(corpus / "suspects"))
+    assert status == EXIT_FLAGGED
+    assert {r["suspect"].rsplit("/", 1)[-1]: r["verdict"] for r in records} == {"copy.txt": "CRITICAL"}
+    assert records[0]["near_duplicate"] is True
+
+def test_near_dup_off_runs_full_scans(corpus):
+    status, records = scan(corpus, str(corpus / "sources"), str(corpus / "suspects"), "--near-dup", "-1")
+    assert status == EXIT_FLAGGED
+    assert len(records) == 1 and records[0]["score"] == 100.0 and "near_duplicate" not in records[0]
+
+def test_fail_on_never_exits_ok(corpus):
+    status, _ = scan(corpus, str(corpus / "sources"), str(corpus / "suspects"), "--fail-on", "never")
+    assert status == EXIT_OK
+
+def test_unreadable_pair_exits_with_error(corpus):
+    manifest = corpus / "pairs.jsonl"
+    pairs = [{"source": str(corpus / "sources" / "essay.txt"), "suspect": str(corpus / "suspects" / "fresh.txt")},
+             {"source": str(corpus / "missing.txt"), "suspect": str(corpus / "suspects" / "fresh.txt")}]
+    manifest.write_text("".join(json.dumps(p) + "\n" for p in pairs), encoding="utf-8")
+    status, records = scan(corpus, "--manifest", str(manifest))
+    assert status == EXIT_ERROR
+    assert records[0]["verdict"] == "AUTHENTIC" and "error" in records[1]
+
+def test_missing_sources_exit_with_error(corpus, capsys):
+    status, _ = scan(corpus, "-", str(corpus / "suspects"), "--index", str(corpus / "none.tgfp"))
+    assert status == EXIT_ERROR
+    assert "no SOURCES directory" in capsys.readouterr().err
+
+@pytest.mark.parametrize("option, value", [
+    ("--top", "0"), ("--min-shared", "-3"), ("--chunksize", "0"), ("--workers", "0"),
+    ("--near-dup", "-2"), ("--near-dup", "64"), ("-n", "0"), ("--top", "many"),
+])
+def test_out_of_range_options_are_usage_errors(option, value, capsys):
+    with pytest.raises(SystemExit) as usage:
+        main(["scan", "a", "b", option, value])
+    assert usage.value.code == EXIT_ERROR
+    assert option in capsys.readouterr().err
@@ -0,0 +1,97 @@
+import random
+import pytest
+from textguard import CorpusIndex, TextGuardEngine
+
+# --- CORPUS INDEX (One-vs-Many Lookup) ---
+
+def essay(seed, length=300):
+    rng = random.Random(seed)
+    return " ".join(f"w{rng.randrange(800)}" for _ in range(length))
+
+DOCS = {f"doc{i}.txt": essay(i) for i in range(8)}
+SUSPECT = " ".join(DOCS["doc3.txt"].split()[:150] + DOCS["doc6.txt"].split()[100:160] + essay(40, 50).split())
+
+def brute_force(text):
+    # {doc_id: hit} for every source sharing a fingerprint with text
+    engine = TextGuardEngine()
+    suspect = {h for h, _ in engine.fingerprint(text)}
+    hits = {}
+    for doc_id, source in DOCS.items():
+        fps = {h for h, _ in engine.fingerprint(source)}
+        if suspect & fps:
+            shared = len(suspect & fps)
+            hits[doc_id] = {"doc_id": doc_id, "shared": shared, "score": shared / len(suspect) * 100,
+                            "coverage": shared / len(fps) * 100}
+    return hits
+
+def test_query_ranks_by_shared_fingerprints():
+    index = CorpusIndex()
+    for doc_id, text in DOCS.items():
+        index.add(doc_id, text)
+    hits = index.query(SUSPECT, k=len(DOCS))
+    assert [hit["doc_id"] for hit in hits[:2]] == ["doc3.txt", "doc6.txt"]
+    assert {hit["doc_id"]: hit for hit in hits} == brute_force(SUSPECT)
+    assert index.query(SUSPECT, k=1) == hits[:1]
+    assert index.query("too short") == []
+
+def test_postings_point_at_the_shingle():
+    index = CorpusIndex(n=3)
+    index.add("a.txt", DOCS["doc0.txt"])
+    words = DOCS["doc0.txt"].split()
+    for h, pos in index.engine.fingerprint(DOCS["doc0.txt"]):
+        assert ("a.txt", pos) in index.lookup(h)
+        assert index.engine.get_double_hash(" ".join(words[pos:pos + 3])) == h
+
+def test_bulk_and_single_adds_agree():
+    single, bulk = CorpusIndex(), CorpusIndex()
+    for doc_id, text in DOCS.items():
+        single.add(doc_id, text)
+    bulk.add_many(DOCS, workers=1)
+    assert bulk.postings == single.postings and bulk.doc_fps == single.doc_fps
+    with pytest.raises(KeyError):
+        bulk.add("doc0.txt", "again")
+
+# --- ON-DISK FORMAT (TGFP, Memory-Mapped) ---
+
+@pytest.fixture
+def saved(tmp_path):
+    index = CorpusIndex(n=3, w=5, dual_hash=False)
+    index.add_many(DOCS, workers=1)
+    path = str(tmp_path / "corpus.tgfp")
+    index.save(path)
+    return index, path
+
+def test_mapped_index_answers_like_the_dict(saved):
+    index, path = saved
+    with CorpusIndex.open(path) as mapped:
+        assert (mapped.engine.n, mapped.engine.w, mapped.engine.dual_hash) == (3, 5, False)
+        assert len(mapped) == len(DOCS) and "doc2.txt" in mapped
+        for h, postings in list(index.postings.items())[:200]:
+            assert sorted(mapped.lookup(h)) == sorted(postings)
+        assert mapped.lookup(12345) == []
+        assert mapped.query(SUSPECT, k=len(DOCS)) == index.query(SUSPECT, k=len(DOCS))
+
+def test_saved_index_loads_back(saved):
+    index, path = saved
+    loaded = CorpusIndex.load(path)
+    assert loaded.doc_fps == index.doc_fps
+    assert {h: sorted(p) for h, p in loaded.postings.items()} == {h: sorted(p) for h, p in index.postings.items()}
+    loaded.add("extra.txt", essay(77))
+    assert len(loaded) == len(DOCS) + 1
+
+def test_empty_index_round_trip(tmp_path):
+    path = str(tmp_path / "empty.tgfp")
+    CorpusIndex().save(path)
+    with CorpusIndex.open(path) as mapped:
+        assert len(mapped) == 0 and mapped.query(SUSPECT) == []
+
+def test_foreign_files_are_rejected(saved, tmp_path):
+    from textguard.storage import HEADER, VERSION, MappedIndex
+    _, path = saved
+    data = bytearray(open(path, "rb").read())
+    cases = {"magic.tgfp": b"XXXX" + data[4:], "short.tgfp": data[:HEADER.size - 1],
+             "version.tgfp": data[:4] + (VERSION + 1).to_bytes(4, "little") + data[8:]}
+    for name, junk in cases.items():
+        (tmp_path / name).write_bytes(bytes(junk))
+        with pytest.raises(ValueError):
+            MappedIndex(str(tmp_path / name))
@@ -0,0 +1,64 @@
+import io
+import json
+import pytest
+from textguard import TextGuardEngine
+from textguard.metrics import JSONLinesSink, MetricsAggregator, ScanStats
+
+# --- SCAN INSTRUMENTATION (Stages, Counters, Sinks) ---
+
+SOURCE = " ".join(f"w{i}" for i in range(500))
+SUSPECT = " ".join(f"w{i}" for i in range(200, 400)) + " " + " ".join(f"new{i}" for i in range(300))
+
+def test_plain_scans_carry_no_metrics():
+    assert "metrics" not in TextGuardEngine().execute_scan(SOURCE, SUSPECT)
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_counters_agree_with_the_result(backend):
+    result = TextGuardEngine(backend=backend, instrument=True).execute_scan(SOURCE, SUSPECT)
+    metrics = result["metrics"]
+    counters = metrics["counters"]
+    assert {"winnow", "bloom_build", "bloom_probe", "top_k", "phrases"} <= set(metrics["stages"])
+    assert all(stage["wall_s"] >= 0 and stage["cpu_s"] >= 0 for stage in metrics["stages"].values())
+    assert (counters["tokens_a"], counters["tokens_b"]) == (500, 500)
+    assert counters["shingles_b"] == 497 and counters["fingerprints_a"] == result["fps"]
+    assert counters["confirmed_hits"] == result["matches"]
+    assert counters["bloom_positives"] == counters["shingles_b"] - result["skips"]
+    assert counters["bloom_false_positives"] == counters["bloom_positives"] - result["matches"]
+
+def test_sinks_receive_every_scan():
+    stream = io.StringIO()
+    totals = MetricsAggregator()
+    lines = JSONLinesSink(stream)
+
+    def both(metrics):
+        lines(metrics)
+        totals(metrics)
+    engine = TextGuardEngine(metrics_sink=both)
+    for _ in range(3):
+        engine.execute_scan(SOURCE, SUSPECT)
+    records = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert len(records) == 3
+    snapshot = totals.snapshot()
+    assert snapshot["scans"] == 3
+    assert snapshot["counters"]["confirmed_hits"] == 3 * records[0]["counters"]["confirmed_hits"]
+    # Rates are not summed
+    assert "bloom_fp_rate" not in snapshot["counters"]
+
+def test_jsonl_sink_appends_to_a_file(tmp_path):
+    path = str(tmp_path / "metrics.jsonl")
+    for value in (1, 2):
+        sink = JSONLinesSink(path)
+        sink({"stages": {}, "counters": {"x": value}})
+        sink.close()
+    assert [json.loads(line)["counters"]["x"] for line in open(path)] == [1, 2]
+
+def test_laps_accumulate_per_stage():
+    stats = ScanStats()
+    for stage in ("hash", "scan", "hash"):
+        stats.lap(stage)
+    stats.count("hits", 2)
+    stats.count("hits")
+    result = stats.as_dict()
+    assert set(result["stages"]) == {"hash", "scan"}
+    assert result["counters"] == {"hits": 3}
+    assert result["wall_s"] >= sum(stage["wall_s"] for stage in result["stages"].values()) - 1e-9
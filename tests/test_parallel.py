@@ -0,0 +1,46 @@
+import random
+import numpy as np
+import pytest
+from textguard import TextGuardEngine
+from textguard.parallel import fingerprint_documents, fingerprint_files, imap_pool, sketch_documents
+
+# --- PROCESS-POOL FINGERPRINTING (Same Output for Any Worker Count) ---
+
+def texts(count=9, seed=2):
+    rng = random.Random(seed)
+    return [" ".join(f"w{rng.randrange(400)}" for _ in range(rng.randint(0, 300))) for _ in range(count)]
+
+def as_lists(results):
+    return [[part.tolist() if isinstance(part, np.ndarray) else part for part in result] for result in results]
+
+def test_fingerprints_match_the_engine():
+    engine = TextGuardEngine(n=3, w=5)
+    for text, (hashes, offsets) in zip(texts(), fingerprint_documents(texts(), n=3, w=5, workers=1)):
+        assert hashes.dtype == np.uint64 and offsets.dtype == np.uint32
+        assert list(zip(hashes.tolist(), offsets.tolist())) == engine.fingerprint(text)
+
+@pytest.mark.parametrize("chunksize", [1, 4])
+def test_worker_count_does_not_change_results(chunksize):
+    sketches = (True, 16, 3, True)
+    serial = sketch_documents(texts(), workers=1, sketches=sketches)
+    pooled = sketch_documents(texts(), workers=2, chunksize=chunksize, sketches=sketches)
+    assert as_lists(pooled) == as_lists(serial)
+
+def test_files_are_read_in_the_workers(tmp_path):
+    paths = []
+    for i, text in enumerate(texts()):
+        path = tmp_path / f"{i}.txt"
+        path.write_text(text, encoding="utf-8")
+        paths.append(str(path))
+    assert as_lists(fingerprint_files(paths, workers=2)) == as_lists(fingerprint_documents(texts(), workers=1))
+
+def test_short_documents_have_no_sketches():
+    hashes, offsets, signature, fingerprint = sketch_documents(["too short"], workers=1,
+                                                               sketches=(True, 8, 0, True))[0]
+    assert len(hashes) == len(offsets) == 0 and signature is None and fingerprint is None
+
+def test_pool_rejects_bad_sizes():
+    with pytest.raises(ValueError):
+        list(imap_pool(len, ["a"], -1, 1))
+    with pytest.raises(ValueError):
+        list(imap_pool(len, ["a"], 2, 0))
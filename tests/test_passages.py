@@ -0,0 +1,59 @@
+import pytest
+from textguard import TextGuardEngine
+from textguard.passages import merge_hits
+
+# --- PASSAGE MERGING (Diagonal Runs, Character Spans) ---
+
+def words(prefix, count):
+    return [f"{prefix}{i}" for i in range(count)]
+
+SOURCE = words("src", 400)
+
+def passages(engine, source, suspect):
+    return engine.execute_scan(source, suspect)["passages"]
+
+def test_verbatim_copy_is_one_passage():
+    copied = " ".join(SOURCE[120:200])
+    source, suspect = " ".join(SOURCE), "My own intro here. " + copied + ". And my own ending."
+    engine = TextGuardEngine(passages=True)
+    found = passages(engine, source, suspect)
+    assert len(found) == 1
+    span = found[0]
+    # Spans run from the first to the last matched fingerprint, so up to w - 1 tokens short at each end
+    assert source[span["start_a"]:span["end_a"]] == suspect[span["start_b"]:span["end_b"]]
+    assert source[span["start_a"]:span["end_a"]] in copied
+    assert span["tokens"] >= 80 - 2 * (engine.w - 1) and span["score"] == 1.0
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+@pytest.mark.parametrize("n, w", [(4, 4), (3, 6), (6, 2)])
+def test_single_token_edits_do_not_split_a_passage(backend, n, w):
+    edited = SOURCE[50:250]
+    edited[60] = "changed"
+    del edited[120]
+    edited.insert(150, "inserted")
+    engine = TextGuardEngine(n=n, w=w, backend=backend, passages=True)
+    found = passages(engine, " ".join(SOURCE), " ".join(edited))
+    assert len(found) == 1
+    assert found[0]["tokens"] >= len(edited) - 2 * (w - 1) and found[0]["score"] < 1.0
+
+def test_separate_copies_stay_separate():
+    suspect = " ".join(SOURCE[300:340] + words("own", 100) + SOURCE[10:60])
+    found = passages(TextGuardEngine(passages=True), " ".join(SOURCE), suspect)
+    assert len(found) == 2 and found[0]["end_b"] < found[1]["start_b"]
+    assert " ".join(SOURCE[300:340]).find(suspect[found[0]["start_b"]:found[0]["end_b"]]) >= 0
+    assert " ".join(SOURCE[10:60]).find(suspect[found[1]["start_b"]:found[1]["end_b"]]) >= 0
+
+def test_unrelated_text_has_no_passages():
+    engine = TextGuardEngine(passages=True)
+    assert passages(engine, " ".join(SOURCE), " ".join(words("own", 300))) == []
+    assert "passages" not in TextGuardEngine().execute_scan(" ".join(SOURCE), " ".join(SOURCE))
+
+def test_merge_hits_chains_diagonals():
+    hits = [(i, i + 10) for i in range(0, 60, 2)] + [(200 + i, 500 + i) for i in range(20)] + [(999, 5), (700, 900)]
+    runs = merge_hits(sorted(hits, key=lambda hit: hit[1]), gap=3)
+    assert runs == [[999, 999, 5, 5, 1], [0, 58, 10, 68, 30], [200, 219, 500, 519, 20], [700, 700, 900, 900, 1]]
+
+def test_merge_hits_joins_across_a_deleted_token():
+    # The diagonal shifts by one after the deletion; both runs continue each other
+    hits = [(i, i) for i in range(20)] + [(i, i - 1) for i in range(23, 40)]
+    assert merge_hits(hits, gap=3) == [[0, 39, 0, 38, 37]]
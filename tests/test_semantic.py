@@ -0,0 +1,43 @@
+import random
+import pytest
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from textguard.semantic import SemanticModel, load_model
+
+# --- SEMANTIC SCORE (Against scikit-learn) ---
+
+WORDS = ["river", "bank", "money", "loan", "water", "fish", "the", "and", "flows", "interest", "boat", "rate"]
+
+def random_docs(count, seed):
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(1, 40))) for _ in range(count)]
+
+def sklearn_score(vectorizer, a, b):
+    matrix = vectorizer.transform([a, b])
+    return cosine_similarity(matrix[0], matrix[1])[0][0] * 100
+
+@pytest.mark.parametrize("a, b", list(zip(random_docs(30, 1), random_docs(30, 2))))
+def test_empty_model_matches_pair_fitted_tfidf(a, b):
+    vectorizer = TfidfVectorizer(stop_words='english').fit([a, b])
+    assert SemanticModel().similarity(a, b) == pytest.approx(sklearn_score(vectorizer, a, b))
+
+@pytest.mark.parametrize("a, b", list(zip(random_docs(30, 3), random_docs(30, 4))))
+def test_corpus_model_matches_fitted_vectorizer(a, b):
+    # Corpus without "boat" and "rate": those terms are out of vocabulary in both scorers
+    corpus = [doc.replace("boat", "").replace("rate", "") for doc in random_docs(25, 5)]
+    vectorizer = TfidfVectorizer(stop_words='english').fit(corpus)
+    model = SemanticModel().fit(corpus)
+    assert model.similarity(a, b) == pytest.approx(sklearn_score(vectorizer, a, b))
+
+def test_out_of_vocabulary_text_scores_zero():
+    model = SemanticModel().fit(["river bank water"])
+    assert model.similarity("boat rate", "boat rate") == 0.0
+    assert model.transform("boat river") == {"river": 1.0}
+
+def test_model_round_trip(tmp_path):
+    model = SemanticModel().fit(random_docs(10, 6))
+    path = str(tmp_path / "model.json")
+    model.save(path)
+    loaded = load_model(path)
+    assert (len(loaded), loaded.doc_freq) == (len(model), model.doc_freq)
+    assert len(load_model(str(tmp_path / "missing.json"))) == 0
@@ -0,0 +1,137 @@
+import asyncio
+import json
+import time
+import pytest
+from textguard import CorpusIndex
+from textguard.service import ScanService, ServiceError
+
+# --- HTTP SCANNING SERVICE (Routing, Limits, Backpressure) ---
+
+def exchange(service, raw):
+    # Sends raw bytes to a live server on an ephemeral port; returns (status, JSON body)
+    async def go():
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(raw)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        head, _, body = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), json.loads(body)
+    return asyncio.run(go())
+
+TEXT = " ".join(f"word{i}" for i in range(200))
+
+def post(path, payload):
+    body = json.dumps(payload).encode("utf-8")
+    return f"POST {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+
+@pytest.fixture
+def service(tmp_path):
+    service = ScanService(workers=1, timeout=10.0, model_path=str(tmp_path / "missing.json"))
+    yield service
+    service.close()
+
+def test_scan_and_health(service):
+    status, record = exchange(service, post("/scan", {"source": TEXT, "suspect": TEXT}))
+    assert status == 200 and record["score"] == 100.0 and record["verdict"] == "CRITICAL"
+    status, health = exchange(service, b"GET /health HTTP/1.1\r\n\r\n")
+    assert status == 200 and health["served"] == 1 and health["active"] == 0
+
+@pytest.mark.parametrize("raw, status", [
+    (b"GET /nowhere HTTP/1.1\r\n\r\n", 404),
+    (b"GET /scan HTTP/1.1\r\n\r\n", 405),
+    (b"garbage\r\n\r\n", 400),
+    (post("/scan", {"source": "a"}), 400),
+    (post("/scan", {"source": "a", "suspect": "b", "n": 0}), 400),
+    (b"POST /scan HTTP/1.1\r\nContent-Length: many\r\n\r\n", 400),
+    (b"POST /scan HTTP/1.1\r\nContent-Length: 999999999\r\n\r\n", 413),
+    (post("/lookup", {"text": "a"}), 404),
+    (b"GET /" + b"x" * 70000 + b" HTTP/1.1\r\n\r\n", 414),
+    (b"GET /health HTTP/1.1\r\nX-Long: " + b"x" * 70000 + b"\r\n\r\n", 431),
+    (b"GET /health HTTP/1.1\r\n" + b"".join(b"X-%d: b\r\n" % i for i in range(101)) + b"\r\n", 431),
+])
+def test_bad_requests_get_an_error_status(service, raw, status):
+    got, body = exchange(service, raw)
+    assert got == status and "error" in body
+
+def test_unexpected_failure_answers_500(service):
+    async def broken(*args):
+        raise RuntimeError("worker died")
+    service.run_job = broken
+    status, body = exchange(service, post("/semantic", {"a": "x", "b": "y"}))
+    assert (status, body) == (500, {"error": "internal server error"})
+
+def test_bad_index_fails_at_startup(tmp_path):
+    bad = tmp_path / "bad.tgfp"
+    for junk in (b"not an index" * 10, b"TGFP"):
+        bad.write_bytes(junk)
+        with pytest.raises(ValueError):
+            ScanService(workers=1, index_path=str(bad))
+    with pytest.raises(OSError):
+        ScanService(workers=1, index_path=str(tmp_path / "missing.tgfp"))
+
+def test_lookup_opens_the_index(tmp_path):
+    index = CorpusIndex()
+    index.add("a.txt", TEXT)
+    index.save(str(tmp_path / "corpus.tgfp"))
+    service = ScanService(workers=1, index_path=str(tmp_path / "corpus.tgfp"))
+    try:
+        status, hits = exchange(service, post("/lookup", {"text": TEXT[100:600]}))
+    finally:
+        service.close()
+    assert status == 200 and hits[0]["doc_id"] == "a.txt"
+
+def test_full_queue_is_rejected_with_503():
+    service = ScanService(workers=1, concurrency=1, max_pending=0, timeout=10.0)
+
+    async def go():
+        running = asyncio.ensure_future(service.run_job(time.sleep, 0.5))
+        await asyncio.sleep(0.05)
+        with pytest.raises(ServiceError) as busy:
+            await service.run_job(time.sleep, 0)
+        await running
+        return busy.value.status
+    try:
+        assert asyncio.run(go()) == 503
+        assert service.rejected == 1 and service.active == 0
+    finally:
+        service.close()
+
+def test_timed_out_job_holds_its_slot():
+    service = ScanService(workers=1, concurrency=1, max_pending=4, timeout=0.2)
+
+    async def go():
+        with pytest.raises(ServiceError) as late:
+            await service.run_job(time.sleep, 0.6)
+        assert late.value.status == 504
+        assert service.zombies == 1
+        # The only slot still belongs to the timed-out job
+        with pytest.raises(ServiceError) as busy:
+            await service.run_job(time.sleep, 0)
+        assert busy.value.status == 503
+        await asyncio.sleep(0.6)
+        assert service.zombies == 0 and service.active == 0
+        await service.run_job(time.sleep, 0)
+    try:
+        asyncio.run(go())
+        assert service.timed_out == 1
+    finally:
+        service.close()
+
+# --- WORKER STATE (Shared Tables, Lazy Index) ---
+
+def test_worker_state_shares_tables_by_path(tmp_path):
+    from textguard.report import corpus_index, worker_state
+    model = str(tmp_path / "missing.json")
+    index_path = str(tmp_path / "not-built-yet.tgfp")
+    first = worker_state((4, 4, True, model, index_path, None, None, 0, 5, 1, "utf-8"))
+    second = worker_state((5, 4, False, model, index_path, None, None, 0, 5, 1, "utf-8"))
+    assert first["model"] is second["model"]
+    assert first["engine"] is not second["engine"]
+    assert worker_state((4, 4, False, model, None, None, None, 0, 3, 1, "utf-8"))["engine"] is first["engine"]
+    # Scans never touch the index, so a missing file only fails a lookup
+    with pytest.raises(OSError):
+        corpus_index(first)
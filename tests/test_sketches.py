@@ -0,0 +1,96 @@
+import random
+import pytest
+from textguard import MinHashIndex, SimHashIndex
+from textguard.report import near_duplicates
+from textguard.sketches import SketchIndex
+
+# --- SIMHASH NEAR-DUPLICATE INDEX ---
+
+def essay(seed, length=400):
+    rng = random.Random(seed)
+    return " ".join(f"w{rng.randrange(5000)}" for _ in range(length))
+
+DOCS = {f"doc{i}.txt": essay(i) for i in range(6)}
+
+def brute_force(index, text, k):
+    fingerprint = index.sketch(text)
+    hits = [(bin(fingerprint ^ index.sketches[number]).count("1"), doc_id)
+            for doc_id, number in index.doc_index.items() if index.sketches[number] is not None]
+    return sorted((doc_id, distance) for distance, doc_id in hits if distance <= k)
+
+@pytest.mark.parametrize("k", [0, 3, 8])
+def test_near_matches_brute_force(k):
+    index = SimHashIndex(k=k)
+    index.add_many(DOCS, workers=1)
+    edited = DOCS["doc2.txt"].replace("w1", "x1", 3)
+    for text in (DOCS["doc0.txt"], edited, essay(99)):
+        assert sorted(index.near(index.sketch(text))) == brute_force(index, text, k)
+    assert index.query(DOCS["doc3.txt"])[0] == {"doc_id": "doc3.txt", "distance": 0}
+
+def test_query_radius_is_bounded_by_the_build():
+    index = SimHashIndex(k=2)
+    with pytest.raises(ValueError):
+        index.query("some text", k=3)
+    with pytest.raises(ValueError):
+        SimHashIndex(k=64)
+
+def test_simhash_save_and_load(tmp_path):
+    index = SimHashIndex(k=5, n=3, w=2, dual_hash=False)
+    index.add_many(DOCS, workers=1)
+    index.add("short.txt", "too short")
+    path = str(tmp_path / "corpus.simhash")
+    index.save(path)
+    assert SimHashIndex.stored_settings(path) == {"k": 5, "n": 3, "w": 2, "dual_hash": 0}
+    loaded = SimHashIndex.load(path)
+    assert loaded.doc_ids == index.doc_ids and loaded.sketches == index.sketches
+    assert loaded.sketches[-1] is None
+    assert loaded.query(DOCS["doc4.txt"]) == index.query(DOCS["doc4.txt"])
+
+def test_sketch_index_is_abstract():
+    with pytest.raises(TypeError):
+        SketchIndex()
+
+    class NoBuckets(SketchIndex):
+        def sketch_options(self):
+            return (False, 0, 0, True)
+    with pytest.raises(TypeError):
+        NoBuckets()
+
+# --- NEAR-DUPLICATE SHORT-CIRCUIT (report.near_duplicates) ---
+
+def test_near_duplicates_keeps_top_hits():
+    index = SimHashIndex(k=3)
+    for doc_id in ("a.txt", "b.txt", "c.txt"):
+        index.add(doc_id, DOCS["doc1.txt"])
+    state = {"simhash": index}
+    records = near_duplicates(state, "s.txt", DOCS["doc1.txt"], 3, 2)
+    assert [r["source"] for r in records] == ["a.txt", "b.txt"]
+    assert all(r["verdict"] == "CRITICAL" and r["distance"] == 0 for r in records)
+    for top in (0, -1):
+        with pytest.raises(ValueError):
+            near_duplicates(state, "s.txt", DOCS["doc1.txt"], 3, top)
+
+# --- MINHASH LSH CANDIDATES ---
+
+def test_lsh_finds_shared_text_first():
+    index = MinHashIndex(bands=16, rows=4)
+    index.add_many(DOCS, workers=1)
+    words = DOCS["doc5.txt"].split()
+    hits = index.query(" ".join(words[:300] + essay(50, 100).split()), k=3)
+    assert hits[0]["doc_id"] == "doc5.txt" and hits[0]["score"] > 30
+    assert index.query(DOCS["doc5.txt"], k=1) == [{"doc_id": "doc5.txt", "bands": 16, "score": 100.0}]
+    assert index.threshold == pytest.approx((1 / 16) ** (1 / 4))
+    with pytest.raises(ValueError):
+        MinHashIndex(bands=0)
+
+def test_lsh_save_and_load(tmp_path):
+    index = MinHashIndex(n=3, bands=8, rows=2, seed=7)
+    index.add_many(DOCS, workers=1)
+    index.add("short.txt", "too short")
+    path = str(tmp_path / "corpus.lsh")
+    index.save(path)
+    assert MinHashIndex.stored_settings(path) == {"n": 3, "w": 4, "bands": 8, "rows": 2, "dual_hash": 1, "seed": 7}
+    loaded = MinHashIndex.load(path)
+    assert loaded.doc_ids == index.doc_ids and loaded.sketches[-1] is None
+    assert loaded.tables == index.tables
+    assert loaded.query(DOCS["doc1.txt"]) == index.query(DOCS["doc1.txt"])
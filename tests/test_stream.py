@@ -0,0 +1,95 @@
+import io
+import random
+import numpy as np
+import pytest
+from textguard import TextGuardEngine, native
+from textguard import report
+from textguard.stream import MAX_TOKEN, StreamingWinnower, iter_chunks, phrases_at, scan_stream
+from textguard.stylometry import analyze_style
+
+# --- CHUNKED STREAMING (Same Results as the In-Memory Scan) ---
+
+BACKENDS = ["python", "numpy"] + (["c"] if native.available() else [])
+
+class OneShot(io.StringIO):
+    # A stream that cannot be read twice, like a pipe
+    def seekable(self):
+        return False
+
+def random_text(rng, length):
+    vocab = [f"tok{i}" for i in range(rng.choice([2, 5, 40]))] + ["Über,", "end.", "x\ny"]
+    return " ".join(rng.choices(vocab, k=length))
+
+def test_chunks_end_at_whitespace():
+    text = "alpha beta\tgamma\ndelta " * 50 + "omega"
+    pieces = list(iter_chunks(io.StringIO(text), 7))
+    assert "".join(pieces) == text
+    assert all(piece[-1].isspace() for piece in pieces[:-1])
+
+def test_long_runs_are_cut_at_max_token(monkeypatch):
+    monkeypatch.setattr("textguard.stream.MAX_TOKEN", 10)
+    pieces = list(iter_chunks(io.StringIO("x" * 25 + " y"), 4))
+    assert "".join(pieces) == "x" * 25 + " y"
+    assert max(map(len, pieces)) <= 10 + 4
+    assert MAX_TOKEN > 10
+
+def test_chunked_winnowing_matches_one_pass():
+    rng = random.Random(8)
+    for _ in range(500):
+        w = rng.randint(1, 6)
+        hashes = np.array([rng.randrange(4) for _ in range(rng.randint(0, 50))], dtype=np.uint64)
+        engine = TextGuardEngine(n=1, w=w, backend="numpy")
+        winnower = StreamingWinnower(engine)
+        parts, i = [], 0
+        while i < len(hashes):
+            step = rng.randint(0, 7)
+            parts.append(winnower.push(hashes[i:i + step]))
+            i += step
+        parts.append(winnower.finish())
+        got = list(zip(np.concatenate([h for h, _ in parts]).tolist(), np.concatenate([p for _, p in parts]).tolist()))
+        assert got == [(int(h), pos) for h, pos in engine.winnow_positions(hashes.tolist())]
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("chunk_size", [5, 64, 1 << 20])
+def test_scan_stream_matches_execute_scan(backend, chunk_size):
+    rng = random.Random(chunk_size)
+    for _ in range(15):
+        n, w = rng.randint(1, 7), rng.randint(1, 6)
+        text_a, text_b = random_text(rng, rng.randint(0, 200)), random_text(rng, rng.randint(0, 200))
+        expected = TextGuardEngine(n=n, w=w, backend=backend).execute_scan(text_a, text_b)
+        for stream_b in (io.StringIO(text_b), OneShot(text_b)):
+            engine = TextGuardEngine(n=n, w=w, backend=backend)
+            assert scan_stream(engine, io.StringIO(text_a), stream_b, chunk_size=chunk_size) == expected
+
+def test_phrases_at_offsets():
+    engine = TextGuardEngine(n=3)
+    text = " ".join(f"w{i}" for i in range(100))
+    phrases = phrases_at(engine, io.StringIO(text), [0, 41, 97, 98], chunk_size=16)
+    assert phrases == {0: "w0 w1 w2", 41: "w41 w42 w43", 97: "w97 w98 w99"}
+
+def test_style_and_semantic_counts_over_chunks():
+    from textguard.semantic import SemanticModel
+    rng = random.Random(4)
+    text = " ".join(rng.choice(["Cats sleep.", "Dogs bark!", "why?", "birds", "sing...", "\n"]) for _ in range(400))
+    chunks = list(iter_chunks(io.StringIO(text), 13))
+    assert analyze_style(chunks) == analyze_style(text)
+    model = SemanticModel()
+    assert model.counts(chunks) == model.counts(text)
+
+# --- LARGE PAIRS IN THE CLI (compare_files) ---
+
+def test_large_pairs_are_streamed(tmp_path, monkeypatch):
+    rng = random.Random(6)
+    words = random_text(rng, 3000).split()
+    source, suspect = tmp_path / "a.txt", tmp_path / "b.txt"
+    source.write_text(" ".join(words), encoding="utf-8")
+    suspect.write_text(" ".join(words[500:2500]) + " new words at the end", encoding="utf-8")
+    state = report.worker_state((4, 4, True, str(tmp_path / "none.json"), None, None, None, 0, 5, 1, "utf-8"))
+    in_memory = report.compare_files(state, str(source), str(suspect), "utf-8")
+    monkeypatch.setattr(report, "STREAM_BYTES", 0)
+    streamed = report.compare_files(state, str(source), str(suspect), "utf-8")
+    for field in ("score", "matches", "fps", "skips", "top_k", "style", "verdict"):
+        assert streamed[field] == in_memory[field]
+    assert streamed["semantic"] == pytest.approx(in_memory["semantic"])
+    assert in_memory["exact"]["coverage"] is not None
+    assert streamed["exact"]["coverage"] is None and "skipped" in streamed["exact"]
@@ -0,0 +1,106 @@
+import random
+import numpy as np
+import pytest
+from textguard import TextGuardEngine, Tokenizer, Vocabulary
+from textguard.tokenizer import token_offsets
+
+# --- INTERNED TOKENS (Same Tokens as preprocess) ---
+
+TRICKY = [
+    "",
+    "   ",
+    "... ,,, !!!",
+    "Hello, World! hello world.",
+    "a.b a . b (c) [d]e",
+    "İstanbul ǅemal ΣΊΣΥΦΟΣ straße ﬁne",
+    "tabs\tand\nnew\r\nlines　ideographic\x1cseparators",
+    "日本語のテキスト、句読点。 emoji 😀 mixed",
+    "under_score snake_case 1,000.50 x²",
+]
+
+def random_texts(count=300, seed=5):
+    rng = random.Random(seed)
+    alphabet = "abcXYZ éÉß İ ﬁ 1_2,.;!? \t\n　日本😀-—"
+    for _ in range(count):
+        yield "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 60)))
+
+@pytest.mark.parametrize("text", TRICKY + list(random_texts()))
+def test_tokens_match_preprocess(text):
+    engine = TextGuardEngine()
+    tokens = engine.tokenize(text, offsets=True)
+    assert list(tokens) == engine.preprocess(text)
+    assert len(tokens.starts) == len(tokens.ids)
+    # Every span holds its token once lowercased and stripped of punctuation
+    for token, start, end in zip(tokens, tokens.starts.tolist(), tokens.ends.tolist()):
+        assert engine.preprocess(text[start:end]) == [token]
+
+def test_warm_vocabulary_reuses_ids():
+    tokenizer = Tokenizer()
+    first = tokenizer.tokenize("the cat, the hat. The CAT!")
+    assert first.ids.tolist() == [0, 1, 0, 2, 0, 1]
+    again = tokenizer.tokenize("hat cat the dog")
+    assert again.ids.tolist() == [2, 1, 0, 3]
+    assert len(tokenizer.vocab) == 4
+
+def test_pure_punctuation_pieces_are_dropped():
+    vocab = Vocabulary()
+    assert vocab.intern_pieces(["--", "word,", "...", "(word)"]).tolist() == [0, 0]
+    assert vocab.raw_ids == {"--": -1, "word,": 0, "...": -1, "(word)": 0}
+    assert vocab.intern_pieces([]).tolist() == []
+    assert vocab.intern_pieces(["!"]).tolist() == []
+
+def test_token_offsets_of_plain_text():
+    starts, ends = token_offsets("  one, two  -- three")
+    assert starts.tolist() == [2, 7, 15]
+    assert ends.tolist() == [6, 10, 20]
+
+# --- HASHING FROM THE PER-ID TABLES ---
+
+@pytest.mark.parametrize("n", [1, 2, 4])
+def test_python_backend_hashes_from_vocabulary(n):
+    engine = TextGuardEngine(n=n, backend="python")
+    text = " ".join(TRICKY)
+    words = engine.preprocess(text)
+    expected = [engine.get_double_hash(" ".join(words[i:i + n])) for i in range(len(words) - n + 1)]
+    assert engine.hash_tokens(engine.tokenize(text)) == expected
+    assert engine.rolling_hashes(words) == expected
+
+@pytest.mark.parametrize("n", [1, 2, 6, 7, 12])
+def test_folded_and_prefix_sum_hashes_agree(n):
+    # n <= FOLD_MAX folds token by token, longer shingles use cumulative sums
+    text = " ".join(TRICKY + list(random_texts(40)))
+    vector = TextGuardEngine(n=n, backend="numpy")
+    scalar = TextGuardEngine(n=n, backend="python")
+    assert vector.hash_tokens(vector.tokenize(text)).tolist() == scalar.rolling_hashes(scalar.preprocess(text))
+
+def test_vocabulary_tables_grow_with_new_tokens():
+    vocab = Vocabulary()
+    vocab.intern(["ab", "c"])
+    assert vocab.token_lengths().tolist() == [2, 1]
+    vocab.intern(["c", "defg"] + [f"t{i}" for i in range(2000)])
+    lengths = vocab.token_lengths()
+    assert len(lengths) == len(vocab) == 2003
+    assert lengths[:3].tolist() == [2, 1, 4]
+    assert vocab.token_hashes(131, 1000000007)[1] == ord("c")
+
+# --- BOUNDED VOCABULARY (vocab_limit) ---
+
+def test_vocabulary_is_renewed_past_the_limit():
+    engine = TextGuardEngine(vocab_limit=10)
+    old = engine.tokenize(" ".join(f"w{i}" for i in range(20)))
+    assert len(engine.vocab) == 20
+    fresh = engine.tokenize("w1 w2 w3")
+    assert fresh.vocab is not old.vocab and len(fresh.vocab) == 3
+    # Tokens handed out before the renewal still read their own vocabulary
+    assert old[:3] == ["w0", "w1", "w2"]
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_scans_agree_across_a_renewal(backend):
+    text_a = " ".join(f"w{i % 37}" for i in range(400))
+    text_b = " ".join(f"w{i % 41}" for i in range(300))
+    bounded = TextGuardEngine(backend=backend, passages=True, vocab_limit=8)
+    unbounded = TextGuardEngine(backend=backend, passages=True)
+    for _ in range(3):
+        assert bounded.execute_scan(text_a, text_b) == unbounded.execute_scan(text_a, text_b)
+        assert bounded.verify_exact(text_a, text_b) == unbounded.verify_exact(text_a, text_b)
+    assert np.array_equal(bounded.vector_hashes(text_a.split()), unbounded.vector_hashes(text_a.split()))
@@ -0,0 +1,83 @@
+import random
+import numpy as np
+import pytest
+from textguard import TextGuardEngine
+from textguard.verify import common_passages, coverage, lcp_array, suffix_array
+
+# --- SUFFIX ARRAY + LCP (Against Brute Force) ---
+
+def random_pairs(count=200, seed=3):
+    rng = random.Random(seed)
+    for _ in range(count):
+        alphabet = rng.choice([1, 2, 4, 50])
+        a = [rng.randrange(alphabet) for _ in range(rng.randint(1, 40))]
+        b = [rng.randrange(alphabet) for _ in range(rng.randint(1, 40))]
+        yield a, b
+
+def common_prefix(x, y):
+    size = 0
+    while size < min(len(x), len(y)) and x[size] == y[size]:
+        size += 1
+    return size
+
+@pytest.mark.parametrize("a, b", list(random_pairs(60)))
+def test_suffix_array_and_lcp(a, b):
+    seq = a + [-1] + b
+    sa, levels = suffix_array(np.array(seq))
+    assert sa.tolist() == sorted(range(len(seq)), key=lambda i: seq[i:])
+    lcp = lcp_array(sa, levels)
+    assert lcp.tolist() == [0] + [common_prefix(seq[sa[r - 1]:], seq[sa[r]:]) for r in range(1, len(seq))]
+
+@pytest.mark.parametrize("a, b", list(random_pairs()))
+def test_passages_cover_every_copied_run(a, b):
+    min_tokens = 3
+    found = common_passages(a, b, min_tokens)
+    for i, j, size in found:
+        assert size >= min_tokens and a[i:i + size] == b[j:j + size]
+    # Every B position inside a run of min_tokens+ tokens that also occurs in A
+    expected = set()
+    for j in range(len(b)):
+        longest = max(common_prefix(a[i:], b[j:]) for i in range(len(a)))
+        if longest >= min_tokens:
+            expected.update(range(j, j + longest))
+    covered = {j + t for _, j, size in found for t in range(size)}
+    assert covered == expected
+    assert coverage(found, len(b)) == pytest.approx(len(covered) / len(b) * 100)
+
+def test_empty_sides_have_no_passages():
+    assert common_passages([], [1, 2, 3], 1) == []
+    assert common_passages([1, 2, 3], [], 1) == []
+
+# --- EXACT VERIFICATION (TextGuardEngine.verify_exact) ---
+
+SOURCE = " ".join(f"w{i}" for i in range(300))
+
+def test_verify_exact_reports_character_spans():
+    suspect = "Intro words here. " + " ".join(f"w{i}" for i in range(100, 120)) + ", then new text."
+    exact = TextGuardEngine(backend="numpy").verify_exact(SOURCE, suspect)
+    assert len(exact["passages"]) == 1
+    span = exact["passages"][0]
+    assert span["tokens"] == 20
+    assert SOURCE[span["start_a"]:span["end_a"]] == suspect[span["start_b"]:span["end_b"]].replace(",", "")
+    assert exact["coverage"] == pytest.approx(20 / 26 * 100)
+
+def test_verify_exact_skips_pairs_over_the_limit():
+    engine = TextGuardEngine(backend="numpy")
+    exact = engine.verify_exact(SOURCE, SOURCE, max_tokens=599)
+    assert exact["coverage"] is None and exact["passages"] == []
+    assert "600 tokens" in exact["skipped"]
+    assert engine.verify_exact(SOURCE, SOURCE, max_tokens=None)["coverage"] == 100.0
+
+def test_verify_exact_rejects_bad_min_tokens():
+    with pytest.raises(ValueError):
+        TextGuardEngine().verify_exact(SOURCE, SOURCE, min_tokens=0)
+
+def test_verify_exact_reuses_scanned_tokens():
+    engine = TextGuardEngine(backend="numpy", passages=True, doc_cache=2)
+    suspect = " ".join(f"w{i}" for i in range(50, 150))
+    engine.execute_scan(SOURCE, suspect)
+
+    def no_tokenize(*args, **kwargs):
+        raise AssertionError("verify_exact tokenized a cached document again")
+    engine.tokenize = no_tokenize
+    assert engine.verify_exact(SOURCE, suspect)["coverage"] == 100.0
@@ -0,0 +1,39 @@
+# Public names resolve lazily (PEP 562): `import textguard` loads nothing
+# heavy, and each submodule is imported on first attribute access.
+EXPORTS = {
+    "BloomFilter": "engine",
+    "LRUCache": "engine",
+    "TextGuardEngine": "engine",
+    "JSONLinesSink": "metrics",
+    "MetricsAggregator": "metrics",
+    "ScanStats": "metrics",
+    "Tokenizer": "tokenizer",
+    "Tokens": "tokenizer",
+    "Vocabulary": "tokenizer",
+    "CorpusIndex": "index",
+    "MappedCorpusIndex": "index",
+    "MappedIndex": "storage",
+    "MinHashIndex": "lsh",
+    "SimHashIndex": "simhash",
+    "CohortScan": "batch",
+    "fingerprint_documents": "parallel",
+    "fingerprint_files": "parallel",
+    "fingerprint_stream": "stream",
+    "scan_stream": "stream",
+    "SemanticModel": "semantic",
+    "analyze_style": "stylometry",
+    "verdict": "report",
+}
+
+__all__ = list(EXPORTS)
+
+def __getattr__(name):
+    if name not in EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(f".{EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(EXPORTS))
@@ -0,0 +1,97 @@
+import numpy as np
+from .engine import TextGuardEngine, sorted_unique, unique_counts
+
+# --- BATCH ALL-PAIRS SCANNING (Assignment Cohorts) ---
+
+class CohortScan:
+    """
+    DSA Logic: Every document is hashed and winnowed exactly once. The
+    fingerprints form a sparse docs x hashes incidence matrix M, and
+    M @ M.T gives shared-fingerprint counts for exactly the pairs that
+    share something, so disjoint pairs cost nothing.
+    """
+    def __init__(self, n=4, w=4, backend="numpy", dual_hash=True):
+        self.engine = TextGuardEngine(n=n, w=w, backend=backend, dual_hash=dual_hash)
+        self.doc_ids = []
+        self.doc_index = {}
+        self.words = []
+        self.hashes = []
+        self.fingerprints = []
+        self.matrix = None
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def add(self, doc_id, text):
+        if doc_id in self.doc_index:
+            raise KeyError(f"Document already added: {doc_id}")
+        engine = self.engine
+        doc = engine.prepare(text)
+        words = doc["words"]
+        hashes = np.asarray(doc["hashes"], dtype=np.uint64)
+        engine.document_fingerprints(doc)
+        fingerprints = sorted_unique(doc["positions"][0])
+        self.doc_index[doc_id] = len(self.doc_ids)
+        self.doc_ids.append(doc_id)
+        self.words.append(words)
+        self.hashes.append(hashes)
+        self.fingerprints.append(fingerprints)
+        self.matrix = None
+
+    def add_many(self, docs):
+        for doc_id, text in docs.items():
+            self.add(doc_id, text)
+
+    def shared_matrix(self):
+        """
+        Upper-triangular sparse matrix; entry (i, j), i < j, is the number of
+        distinct fingerprints documents i and j have in common.
+        Time Complexity: O(F log F + sum over hashes of postings^2)
+        """
+        if self.matrix is None:
+            from scipy import sparse
+            counts = [len(f) for f in self.fingerprints]
+            all_fps = np.concatenate(self.fingerprints) if self.fingerprints else np.zeros(0, dtype=np.uint64)
+            _, columns = np.unique(all_fps, return_inverse=True)
+            rows = np.repeat(np.arange(len(counts)), counts)
+            incidence = sparse.csr_matrix(
+                (np.ones(len(rows), dtype=np.int32), (rows, columns.ravel())),
+                shape=(len(counts), int(columns.max()) + 1 if len(columns) else 0),
+            )
+            self.matrix = sparse.triu(incidence @ incidence.T, k=1).tocsr()
+        return self.matrix
+
+    def pairs(self, min_shared=1):
+        # (doc_a, doc_b, shared) for every overlapping pair, largest first
+        coo = self.shared_matrix().tocoo()
+        keep = coo.data >= min_shared
+        rows, cols, data = coo.row[keep], coo.col[keep], coo.data[keep]
+        order = np.argsort(-data, kind="stable")
+        return [(self.doc_ids[i], self.doc_ids[j], int(c))
+                for i, j, c in zip(rows[order].tolist(), cols[order].tolist(), data[order].tolist())]
+
+    def pair(self, doc_a, doc_b, k=5):
+        """
+        execute_scan(doc_a, doc_b) from the cached hashes: every shingle of B
+        is checked against A's fingerprints and the top-k phrases come from B.
+        """
+        a, b = self.doc_index[doc_a], self.doc_index[doc_b]
+        fingerprints_a, hashes_b = self.fingerprints[a], self.hashes[b]
+        hit_pos = np.flatnonzero(np.isin(hashes_b, fingerprints_a))
+        keys, first, counts = unique_counts(hashes_b[hit_pos])
+        order = np.argsort(first, kind="stable")
+        match_freq_map = dict(zip(keys[order].tolist(), counts[order].tolist()))
+        match_pos = dict(zip(keys[order].tolist(), hit_pos[first[order]].tolist()))
+
+        words_b = self.words[b]
+        top_k = [
+            {"phrase": self.engine.get_phrase(h, words_b, match_pos[h]), "count": freq}
+            for freq, h in self.engine.get_top_k_matches(match_freq_map, k=k)
+        ]
+        fps = len(fingerprints_a)
+        return {
+            "score": len(hit_pos) / fps * 100 if fps > 0 else 0,
+            "matches": len(hit_pos),
+            "fps": fps,
+            "top_k": top_k,
+        }
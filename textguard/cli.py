@@ -0,0 +1,269 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+from functools import partial
+from .index import CorpusIndex
+from .lsh import MinHashIndex
+from .simhash import SimHashIndex
+from .parallel import imap_pool, sketch_files
+from .report import LEVELS, compare_files, corpus_index, near_duplicates, read_text, worker_state
+from .semantic import MODEL_PATH, SemanticModel
+from .service import run as run_service
+
+# --- HEADLESS BATCH CLI ---
+#
+#   python -m textguard scan SOURCES_DIR SUSPECTS_DIR [--index corpus.tgfp] > results.jsonl
+#   python -m textguard scan SOURCES_DIR SUSPECTS_DIR --lsh 32x4 --near-dup 3 > results.jsonl
+#   python -m textguard scan --manifest pairs.jsonl > results.jsonl
+#   python -m textguard semantic CORPUS_DIR -o semantic_model.json
+#   python -m textguard serve --port 8765 --index corpus.tgfp
+#
+# Exit status: 0 nothing flagged, 1 at least one pair at or above --fail-on,
+# 2 usage or I/O errors.
+
+EXIT_OK, EXIT_FLAGGED, EXIT_ERROR = 0, 1, 2
+
+def scan_pair(config, pair):
+    # Worker task for manifest mode
+    source, suspect = pair
+    state = worker_state(config)
+    encoding = config[-1]
+    try:
+        return [compare_files(state, source, suspect, encoding)]
+    except (OSError, UnicodeError) as e:
+        return [{"source": source, "suspect": suspect, "error": str(e)}]
+
+def scan_suspect(config, suspect):
+    # Worker task for directory mode: candidate lookup, then full scans of the top candidates
+    state = worker_state(config)
+    near_dup, top, min_shared, encoding = config[7:]
+    try:
+        suspect_text = read_text(suspect, encoding)
+    except (OSError, UnicodeError) as e:
+        return [{"source": None, "suspect": suspect, "error": str(e)}]
+    if state["simhash"] is not None:
+        records = near_duplicates(state, suspect, suspect_text, near_dup, top)
+        if records:
+            return records
+    if state["lsh"] is not None:
+        hits = state["lsh"].query(suspect_text, k=top)
+    else:
+        hits = [hit for hit in corpus_index(state).query(suspect_text, k=top) if hit["shared"] >= min_shared]
+    records = []
+    for hit in hits:
+        source = hit["doc_id"]
+        try:
+            records.append(compare_files(state, source, suspect, encoding, suspect_text))
+        except (OSError, UnicodeError) as e:
+            records.append({"source": source, "suspect": suspect, "error": str(e)})
+    return records
+
+def parse_lsh(value):
+    # "BANDSxROWS", e.g. "32x4"
+    try:
+        bands, rows = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected BANDSxROWS such as 32x4, got {value!r}")
+    if bands < 1 or rows < 1:
+        raise argparse.ArgumentTypeError("bands and rows must be positive")
+    return bands, rows
+
+def parse_int(value, low, high=None):
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected an integer, got {value!r}")
+    if high is None and number < low:
+        raise argparse.ArgumentTypeError(f"must be at least {low}")
+    if high is not None and not low <= number <= high:
+        raise argparse.ArgumentTypeError(f"must be between {low} and {high}")
+    return number
+
+def parse_size(value):
+    # Shingle size or window, in the same 1-64 range the service accepts
+    return parse_int(value, 1, 64)
+
+def parse_count(value):
+    # --top, --min-shared, --chunksize and worker counts: 0 or less would scan nothing
+    return parse_int(value, 1)
+
+def parse_bits(value):
+    # --near-dup: SimHash bits, with -1 switching the check off
+    return parse_int(value, -1, 63)
+
+def list_files(directory, pattern):
+    return sorted(p for p in glob.glob(os.path.join(directory, "**", pattern), recursive=True)
+                  if os.path.isfile(p))
+
+def read_manifest(path):
+    # JSON lines with "source" and "suspect" paths
+    pairs = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+                pairs.append((entry["source"], entry["suspect"]))
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"{path}:{line_no}: expected {{\"source\": ..., \"suspect\": ...}} ({e})")
+    return pairs
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="textguard", description="Headless TextGuard batch scanner.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scan = commands.add_parser("scan", help="compare suspects against sources, one JSON line per comparison")
+    scan.add_argument("sources", nargs="?", help="directory of source documents to index")
+    scan.add_argument("suspects", nargs="?", help="directory of suspect documents")
+    scan.add_argument("--manifest", help="JSON lines of {\"source\": path, \"suspect\": path} pairs")
+    scan.add_argument("--index", help="corpus index file: reused when SOURCES is omitted, else written")
+    scan.add_argument("-n", type=parse_size, default=4, help="shingle size (default: 4)")
+    scan.add_argument("-w", type=parse_size, default=4, help="winnowing window (default: 4)")
+    scan.add_argument("--top", type=parse_count, default=5, help="candidate sources scanned per suspect (default: 5)")
+    scan.add_argument("--min-shared", type=parse_count, default=1, help="minimum shared fingerprints for a candidate")
+    scan.add_argument("--lsh", type=parse_lsh, metavar="BANDSxROWS",
+                      help="pick candidates with MinHash LSH tables (e.g. 32x4; stored as INDEX.lsh) "
+                           "instead of shared fingerprints; more bands raise recall, more rows precision")
+    scan.add_argument("--near-dup", type=parse_bits, default=3, metavar="BITS",
+                      help="report sources within BITS SimHash bits of a suspect as near-duplicates without "
+                           "a full scan (stored as INDEX.simhash; default: 3, -1 disables)")
+    scan.add_argument("--no-verify", dest="verify", action="store_false",
+                      help="skip the exact suffix-array pass on CRITICAL and WARNING pairs (faster on long texts)")
+    scan.add_argument("--workers", type=parse_count, default=None, help="worker processes (default: CPU count)")
+    scan.add_argument("--chunksize", type=parse_count, default=4, help="tasks sent to a worker at a time")
+    scan.add_argument("--pattern", default="*.txt", help="file glob inside directories (default: *.txt)")
+    scan.add_argument("--encoding", default="utf-8")
+    scan.add_argument("--semantic-model", default=MODEL_PATH, help="saved SemanticModel JSON")
+    scan.add_argument("--fail-on", choices=["critical", "warning", "never"], default="critical",
+                      help="lowest verdict that makes the exit status 1 (default: critical)")
+    scan.add_argument("-o", "--output", help="write JSON lines here instead of stdout")
+
+    semantic = commands.add_parser("semantic", help="fit the corpus TF-IDF model used for semantic scores")
+    semantic.add_argument("corpus", help="directory of reference documents")
+    semantic.add_argument("-o", "--output", default=MODEL_PATH)
+    semantic.add_argument("--pattern", default="*.txt")
+    semantic.add_argument("--encoding", default="utf-8")
+
+    serve = commands.add_parser("serve", help="run the local HTTP scanning service (see service.py)")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8765)
+    serve.add_argument("--workers", type=parse_count, default=None, help="worker processes (default: CPU count)")
+    serve.add_argument("--concurrency", type=parse_count, default=None, help="jobs running at once (default: workers)")
+    serve.add_argument("--max-pending", type=int, default=64, help="jobs allowed to wait before 503")
+    serve.add_argument("--timeout", type=float, default=30.0, help="per-request limit in seconds")
+    serve.add_argument("--index", help="corpus index file for /lookup")
+    serve.add_argument("--semantic-model", default=MODEL_PATH, help="saved SemanticModel JSON")
+    serve.add_argument("--no-verify", dest="verify", action="store_false",
+                       help="skip the exact suffix-array pass in /scan")
+    return parser
+
+def build_indexes(args, sources, index_path, lsh_path, simhash_path):
+    """
+    One pass over the sources: each worker reads, tokenizes and hashes a
+    document once and returns its fingerprints plus the MinHash signature
+    and SimHash the optional tables need.
+    """
+    index = CorpusIndex(n=args.n, w=args.w)
+    lsh = MinHashIndex(n=args.n, w=args.w, bands=args.lsh[0], rows=args.lsh[1]) if lsh_path else None
+    simhash = SimHashIndex(k=args.near_dup, n=args.n, w=args.w) if simhash_path else None
+    sketches = (True, lsh.num_perm if lsh is not None else 0, lsh.seed if lsh is not None else 0,
+                simhash is not None)
+    results = sketch_files(sources, n=args.n, w=args.w, workers=args.workers, encoding=args.encoding,
+                           sketches=sketches)
+    for path, (hashes, offsets, signature, fingerprint) in zip(sources, results):
+        index.add_fingerprints(path, hashes, offsets)
+        if lsh is not None:
+            lsh.add_sketch(path, signature)
+        if simhash is not None:
+            simhash.add_sketch(path, fingerprint)
+    index.save(index_path)
+    for table, path, suffix in ((lsh, lsh_path, ".lsh"), (simhash, simhash_path, ".simhash")):
+        if table is not None:
+            table.save(path)
+        elif os.path.exists(index_path + suffix):
+            # Left over from an earlier build of this index; it no longer matches
+            os.remove(index_path + suffix)
+
+def run_scan(args):
+    if args.manifest:
+        pairs = read_manifest(args.manifest)
+        config = (args.n, args.w, args.verify, args.semantic_model, None, None, None, -1,
+                  args.top, args.min_shared, args.encoding)
+        yield from imap_pool(partial(scan_pair, config), pairs, args.workers, args.chunksize)
+        return
+
+    if not args.suspects:
+        raise ValueError("scan needs SOURCES and SUSPECTS directories, or --index with SUSPECTS, or --manifest")
+    with tempfile.TemporaryDirectory() as tmp:
+        index_path = args.index or os.path.join(tmp, "corpus.tgfp")
+        lsh_path = index_path + ".lsh" if args.lsh else None
+        simhash_path = index_path + ".simhash" if args.near_dup >= 0 else None
+        if args.sources and args.sources != "-":
+            build_indexes(args, list_files(args.sources, args.pattern), index_path, lsh_path, simhash_path)
+        elif not (args.index and os.path.exists(args.index)):
+            raise ValueError("no SOURCES directory and no existing --index file")
+        elif lsh_path and not os.path.exists(lsh_path):
+            raise ValueError(f"--lsh given but {lsh_path} was never built; rerun with SOURCES")
+        if simhash_path and not os.path.exists(simhash_path):
+            # Indexes saved without SimHash tables just skip the near-duplicate check
+            simhash_path = None
+        if simhash_path:
+            # Checked here, before any worker starts, not per suspect
+            built_k = SimHashIndex.stored_settings(simhash_path)["k"]
+            if args.near_dup > built_k:
+                raise ValueError(f"--near-dup {args.near_dup} exceeds the {built_k} bits {simhash_path} "
+                                 "was built for; rerun with SOURCES to rebuild it")
+        with CorpusIndex.open(index_path) as mapped:
+            n, w = mapped.mapped.n, mapped.mapped.w
+        config = (n, w, args.verify, args.semantic_model, index_path, lsh_path, simhash_path, args.near_dup,
+                  args.top, args.min_shared, args.encoding)
+        suspects = list_files(args.suspects, args.pattern)
+        yield from imap_pool(partial(scan_suspect, config), suspects, args.workers, args.chunksize)
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        try:
+            run_service(args.host, args.port, workers=args.workers, concurrency=args.concurrency,
+                        max_pending=args.max_pending, timeout=args.timeout, index_path=args.index,
+                        model_path=args.semantic_model, verify=args.verify)
+        except (OSError, ValueError) as e:
+            print(f"textguard: error: {e}", file=sys.stderr)
+            return EXIT_ERROR
+        return EXIT_OK
+
+    if args.command == "semantic":
+        model = SemanticModel().fit_files(list_files(args.corpus, args.pattern), encoding=args.encoding)
+        model.save(args.output)
+        print(f"semantic model: {len(model)} documents, {len(model.doc_freq)} terms -> {args.output}",
+              file=sys.stderr)
+        return EXIT_OK
+
+    fail_level = LEVELS.index(args.fail_on.upper()) if args.fail_on != "never" else len(LEVELS)
+    flagged = errors = 0
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for records in run_scan(args):
+            for record in records:
+                if "error" in record:
+                    errors += 1
+                elif LEVELS.index(record["verdict"]) >= fail_level:
+                    flagged += 1
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+    except (OSError, ValueError) as e:
+        print(f"textguard: error: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if errors:
+        return EXIT_ERROR
+    return EXIT_FLAGGED if flagged else EXIT_OK
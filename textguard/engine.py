@@ -0,0 +1,765 @@
+import re
+import math
+import hashlib
+import threading
+import heapq
+from collections import OrderedDict, deque
+import numpy as np
+from .metrics import ScanStats
+from . import native
+from .tokenizer import Tokenizer, Tokens, Vocabulary, power_mod
+from .passages import fingerprint_hits, merge_hits, passage_spans
+from . import verify
+
+# --- 1. CORE DSA ENGINE (With Explicit Min-Heap Ranking) ---
+
+MASK64 = (1 << 64) - 1
+
+def mix64(x):
+    # SplitMix64 finalizer: derives an independent second hash from the first
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+def mix64_array(x):
+    # Same as mix64 on a uint64 array (multiplication wraps mod 2^64)
+    x = np.asarray(x, dtype=np.uint64)
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+def sorted_unique(values):
+    # np.unique for uint64 keys: one sort plus an adjacent-difference mask
+    # (NumPy 2's hash-based unique is many times slower on 64-bit keys)
+    values = np.sort(np.asarray(values, dtype=np.uint64))
+    return values[np.concatenate(([True], values[1:] != values[:-1]))] if len(values) else values
+
+def unique_counts(values):
+    # (keys, first_index, counts) as np.unique(return_index, return_counts), by one stable argsort
+    values = np.asarray(values, dtype=np.uint64)
+    order = np.argsort(values, kind="stable")
+    ordered = values[order]
+    starts = np.flatnonzero(np.concatenate(([True], ordered[1:] != ordered[:-1]))) if len(values) else order
+    counts = np.diff(np.append(starts, len(values)))
+    return ordered[starts], order[starts], counts
+
+def minhash(hashes, num_perm=128, seed=0, block=4096):
+    """
+    DSA Logic: MinHash over the document's set of shingle hashes. Each of
+    num_perm keyed SplitMix64 remixes acts as a random permutation; the
+    signature keeps the minimum per permutation, and two signatures agree in
+    a row with probability equal to the Jaccard similarity of the shingle sets.
+    Shingles are processed in blocks so memory stays O(num_perm * block).
+    Time Complexity: O(S * num_perm) NumPy ops for S distinct shingles
+    """
+    keys = mix64_array(np.arange(1, num_perm + 1, dtype=np.uint64) + np.uint64(seed))
+    signature = np.full(num_perm, MASK64, dtype=np.uint64)
+    hashes = sorted_unique(hashes)
+    for start in range(0, len(hashes), block):
+        chunk = hashes[start:start + block]
+        np.minimum(signature, mix64_array(chunk[None, :] ^ keys[:, None]).min(axis=1), out=signature)
+    return signature
+
+def simhash(hashes, block=8192):
+    """
+    DSA Logic: SimHash. Every distinct shingle hash is remixed to 64 even
+    bits and votes +weight / -weight on each bit, weighted by how often the
+    shingle occurs; the fingerprint keeps the bits with a positive total.
+    Documents sharing most shingles differ in only a few bits.
+    Time Complexity: O(S * 64) NumPy ops for S distinct shingles
+    """
+    keys, _, counts = unique_counts(hashes)
+    shifts = np.arange(64, dtype=np.uint64)
+    totals = np.zeros(64, dtype=np.int64)
+    for start in range(0, len(keys), block):
+        mixed = mix64_array(keys[start:start + block])
+        weights = counts[start:start + block].astype(np.int64)
+        bits = ((mixed[:, None] >> shifts) & np.uint64(1)).astype(np.int64)
+        totals += 2 * (weights @ bits) - weights.sum()
+    return sum(1 << b for b in np.flatnonzero(totals > 0).tolist())
+
+class BloomFilter:
+    """
+    DSA Logic: Bit-packed Bloom filter with k probes from double hashing,
+    g_i(x) = h1(x) + i * h2(x) mod m, where h2 is a SplitMix64 remix of h1.
+    Sized for the expected item count n and false-positive rate p:
+    m = -n ln(p) / ln(2)^2 bits, k = (m / n) ln(2). m is then rounded up to a
+    power of two, which only lowers the false-positive rate: with h2 forced
+    odd the step is coprime with m, so the k probes always land on k distinct
+    bits (and mod m is a bit mask).
+    """
+    def __init__(self, capacity, error_rate=0.01):
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        capacity = max(1, capacity)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        bits = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.size = 1 << (bits - 1).bit_length()
+        self.mask = self.size - 1
+        self.hash_count = max(1, round(bits / capacity * math.log(2)))
+        # bytearray for fast scalar probes, NumPy view of the same memory for batches
+        self.raw = bytearray((self.size + 7) // 8)
+        self.bits = np.frombuffer(self.raw, dtype=np.uint8)
+        self.count = 0
+
+    def probes(self, h):
+        h2 = mix64(h) | 1
+        return [(h + i * h2) & self.mask for i in range(self.hash_count)]
+
+    def probes_many(self, hashes):
+        # (N, k) matrix of bit positions; uint64 arithmetic wraps mod 2^64, a multiple of m
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        h2 = mix64_array(hashes) | np.uint64(1)
+        steps = np.arange(self.hash_count, dtype=np.uint64)
+        return (hashes[:, None] + steps * h2[:, None]) & np.uint64(self.mask)
+
+    def add(self, h):
+        for idx in self.probes(h):
+            self.raw[idx >> 3] |= 1 << (idx & 7)
+        self.count += 1
+
+    def __contains__(self, h):
+        # Walks the probe sequence and stops at the first clear bit
+        raw, mask = self.raw, self.mask
+        idx = h & mask
+        step = mix64(h) | 1
+        for _ in range(self.hash_count):
+            if not raw[idx >> 3] >> (idx & 7) & 1:
+                return False
+            idx = (idx + step) & mask
+        return True
+
+    def add_many(self, hashes):
+        # Scatter into one bool per bit, then pack (bit i of byte j is bit 8j + i)
+        flags = np.zeros(self.size, dtype=bool)
+        flags[self.probes_many(hashes).ravel()] = True
+        self.bits |= np.packbits(flags, bitorder="little")[:len(self.bits)]
+        self.count += len(hashes)
+
+    def contains_many(self, hashes):
+        # Probe by probe over the hashes still possibly present, so most
+        # non-members cost one or two probes as in __contains__
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        mask = np.uint64(self.mask)
+        alive = np.arange(len(hashes))
+        idx = hashes & mask
+        step = mix64_array(hashes) | np.uint64(1)
+        for i in range(self.hash_count):
+            if i:
+                idx = (idx + step) & mask
+            bytes_ = self.bits[(idx >> np.uint64(3)).astype(np.intp)]
+            hit = ((bytes_ >> (idx & np.uint64(7)).astype(np.uint8)) & 1).astype(bool)
+            alive, idx, step = alive[hit], idx[hit], step[hit]
+        found = np.zeros(len(hashes), dtype=bool)
+        found[alive] = True
+        return found
+
+    def false_positive_rate(self):
+        # Expected rate for the items added so far: (1 - e^(-kn/m))^k
+        k = self.hash_count
+        return (1 - math.exp(-k * self.count / self.size)) ** k
+
+class LRUCache:
+    """
+    Thread-safe LRU map with a fixed number of entries; maxsize=0 disables it.
+    Holds phrase text for displayed matches and per-document hashes, both of
+    which can always be recomputed on a miss.
+    """
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        with self.lock:
+            value = self.entries.get(key)
+            if value is not None:
+                self.entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+class TextGuardEngine:
+    # Longest shingle hashed token by token by vector_hashes (see there)
+    FOLD_MAX = 6
+
+    def __init__(self, n=4, w=4, rolling=True, backend="python", phrase_cache=256, dual_hash=True,
+                 doc_cache=0, instrument=False, metrics_sink=None, passages=False, vocab_limit=1 << 18):
+        if backend not in ("python", "numpy", "c"):
+            raise ValueError(f"Unknown backend: {backend}")
+        if backend == "c":
+            native.load()
+        self.n = n  
+        self.w = w  
+        self.rolling = rolling
+        self.backend = backend
+        # "numpy" and "c" share the array code paths; "c" swaps in the C core
+        self.vectorized = backend != "python"
+        self.mod1 = 1000000007
+        self.mod2 = 1000000009
+        self.base = 131
+        # Paired moduli as in the C core: (h1 << 32) | h2 in one 64-bit value
+        self.dual_hash = dual_hash
+        self.moduli = (self.mod1, self.mod2) if dual_hash else (self.mod1,)
+        self.bloom_error = 0.01
+        self.phrase_cache = LRUCache(phrase_cache)
+        self.doc_cache = LRUCache(doc_cache)
+        self.pow_tables = {mod: [1] for mod in self.moduli}
+        # Shared token interning: documents are uint32 ID arrays, token hashes cached per ID.
+        # Bounded: past vocab_limit distinct tokens the next document starts a fresh one
+        self.vocab_limit = vocab_limit
+        self.vocab = Vocabulary()
+        self.tokenizer = Tokenizer(self.vocab)
+        # Opt-in per-stage timers/counters; a sink implies instrumentation
+        self.instrument = instrument or metrics_sink is not None
+        self.metrics_sink = metrics_sink
+        # Character-span passages in execute_scan results (needs token offsets)
+        self.passages = passages
+
+    def preprocess(self, text):
+        # Cleaning and tokenizing
+        return re.sub(r'[^\w\s]', '', text.lower()).split()
+
+    def tokenize(self, text, offsets=False):
+        # preprocess() tokens as interned IDs (plus character spans if asked)
+        tokenizer = self.tokenizer
+        if len(tokenizer.vocab) > self.vocab_limit:
+            tokenizer = self.renew_vocabulary()
+        return tokenizer.tokenize(text, offsets)
+
+    def renew_vocabulary(self):
+        """
+        Swaps in an empty vocabulary so long-lived engines (UI cache, worker
+        processes) do not grow with every document scanned. Tokens already
+        handed out keep a reference to their own vocabulary, so cached and
+        in-flight documents stay valid until they are dropped.
+        """
+        self.vocab = Vocabulary()
+        self.tokenizer = Tokenizer(self.vocab)
+        return self.tokenizer
+
+    def pack(self, parts):
+        # Per-modulus hashes (ints, lists or uint64 arrays) -> one 64-bit fingerprint
+        if not self.dual_hash:
+            return parts[0]
+        h1, h2 = parts
+        if isinstance(h1, np.ndarray):
+            return (h1 << np.uint64(32)) | h2
+        if isinstance(h1, list):
+            return [(a << 32) | b for a, b in zip(h1, h2)]
+        return (h1 << 32) | h2
+
+    def get_double_hash(self, phrase):
+        parts = []
+        for mod in self.moduli:
+            h = 0
+            for char in phrase:
+                h = (h * self.base + ord(char)) % mod
+            parts.append(h)
+        return self.pack(parts)
+
+    def get_phrase(self, h, words, pos):
+        # Shingle text at token offset pos, rebuilt only when displayed
+        phrase = self.phrase_cache.get(h)
+        if phrase is None:
+            phrase = " ".join(words[pos:pos + self.n])
+            self.phrase_cache.put(h, phrase)
+        return phrase
+
+    def get_power(self, e, mod=None):
+        # base^e mod p, table grown on demand
+        mod = mod or self.mod1
+        table = self.pow_tables[mod]
+        while len(table) <= e:
+            table.append((table[-1] * self.base) % mod)
+        return table[e]
+
+    def rolling_hashes(self, words):
+        """
+        DSA Logic: Word-level Rabin-Karp over the space-joined shingle.
+        Adds the incoming word and removes the outgoing word using the power
+        table, so no shingle string is ever built.
+        Output is identical to get_double_hash(" ".join(words[i:i+n])).
+        Time Complexity: O(total_chars)
+        """
+        if len(words) < self.n:
+            return []
+        if isinstance(words, Tokens):
+            # Per-token hashes and lengths straight from the vocabulary's per-ID tables
+            sizes = words.vocab.token_lengths()[words.ids].tolist()
+            return self.pack([self.rolling_hashes_mod(words.vocab.token_hashes(self.base, mod)[words.ids].tolist(),
+                                                      sizes, mod) for mod in self.moduli])
+        sizes = [len(word) for word in words]
+        return self.pack([self.rolling_hashes_mod(self.word_hashes(words, mod), sizes, mod)
+                          for mod in self.moduli])
+
+    def word_hashes(self, words, mod):
+        base = self.base
+        hashes = []
+        for word in words:
+            h = 0
+            for char in word:
+                h = (h * base + ord(char)) % mod
+            hashes.append(h)
+        return hashes
+
+    def rolling_hashes_mod(self, word_hashes, sizes, mod):
+        # One modulus of rolling_hashes(), from each word's hash and length
+        n, base = self.n, self.base
+        space = ord(' ')
+        if n == 1:
+            return word_hashes
+
+        # Seed the first window
+        h = word_hashes[0]
+        length = sizes[0]
+        for j in range(1, n):
+            size = sizes[j]
+            h = (h * self.get_power(size + 1, mod) + space * self.get_power(size, mod) + word_hashes[j]) % mod
+            length += size + 1
+
+        hashes = [h]
+        for i in range(1, len(word_hashes) - n + 1):
+            # Remove outgoing word (plus its trailing space)
+            length -= sizes[i - 1] + 1
+            h = (h - (word_hashes[i - 1] * base + space) * self.get_power(length, mod)) % mod
+            # Add incoming word (plus its leading space)
+            size = sizes[i + n - 1]
+            h = (h * self.get_power(size + 1, mod) + space * self.get_power(size, mod) + word_hashes[i + n - 1]) % mod
+            length += size + 1
+            hashes.append(h)
+        return hashes
+
+    def shingle_hashes(self, words):
+        # List of strings or Tokens; rolling hashing reads Tokens through the vocabulary
+        if self.rolling:
+            return self.rolling_hashes(words)
+        return [self.get_double_hash(" ".join(words[i:i+self.n]))
+                for i in range(len(words) - self.n + 1)]
+
+    def vector_power(self, base, exps, mod=None):
+        # Element-wise base^exps mod p (tokenizer.power_mod)
+        return power_mod(base, exps, mod or self.mod1)
+
+    def vector_hashes(self, words):
+        """
+        DSA Logic: Vectorized polynomial hashing over token IDs.
+        Accepts Tokens or a list of strings (interned on the fly); token
+        hashes, lengths and powers come from the engine vocabulary's per-ID
+        cache. Short shingles (n <= FOLD_MAX) are folded token by token in
+        Horner form: h = h * base^(len + 1) + hash(" " + token), one array
+        pass per extra token. Longer ones place each word at its character
+        offset in the joined text scaled by base^-offset, so every shingle is
+        a cumulative-sum difference rescaled by base^end, at a cost that does
+        not grow with n. Both moduli are < 2^30, so products fit in uint64.
+        Output is identical to get_double_hash(" ".join(words[i:i+n])).
+        Time Complexity: O(N * min(n, FOLD_MAX)) NumPy ops, plus O(chars) NumPy
+        ops per never-seen token
+        """
+        n = self.n
+        if len(words) < n:
+            return np.zeros(0, dtype=np.uint64)
+        if self.backend == "c":
+            return native.shingle_hashes(words, n, self.dual_hash)
+
+        if isinstance(words, Tokens):
+            vocab, ids = words.vocab, words.ids
+        else:
+            vocab, ids = self.vocab, self.vocab.intern(words)
+        if n <= self.FOLD_MAX:
+            return self.pack([self.fold_hashes_mod(vocab, ids, mod) for mod in self.moduli])
+        # Character offset just past each word in the space-joined text
+        ends = np.cumsum(vocab.token_lengths()[ids] + np.uint64(1)) - np.uint64(1)
+        return self.pack([self.vector_hashes_mod(vocab.token_hashes(self.base, mod), ids, ends, mod)
+                          for mod in self.moduli])
+
+    def fold_hashes_mod(self, vocab, ids, mod):
+        # Horner form over whole tokens: every step appends " " + the next token
+        p = np.uint64(mod)
+        count = len(ids) - self.n + 1
+        totals = vocab.token_hashes(self.base, mod)[ids[:count]]
+        if self.n > 1:
+            spaced = vocab.spaced_hashes(self.base, mod)[ids]
+            shifts = vocab.token_shifts(self.base, mod)[ids]
+            for k in range(1, self.n):
+                totals = (totals * shifts[k:k + count] + spaced[k:k + count]) % p
+        return totals
+
+    def vector_hashes_mod(self, vocab_hash, ids, ends, mod):
+        n = self.n
+        inv_base = pow(self.base, mod - 2, mod)
+        p = np.uint64(mod)
+        # Word j plus its trailing space: (hash_j + space * base^-1) * base^-end_j
+        space = ord(' ') * inv_base % mod
+        terms = (vocab_hash + np.uint64(space)) % p
+        terms = terms[ids] * self.vector_power(inv_base, ends, mod) % p
+        sums = np.concatenate(([0], np.cumsum(terms, dtype=np.uint64))).astype(np.uint64)
+        # Differences of cumulative sums stay non-negative, so no wrap-around.
+        # Rescaling by base^end turns the last word's trailing space into exactly `space`
+        totals = (sums[n:] - sums[:-n]) % p * self.vector_power(self.base, ends[n - 1:], mod) % p
+        return (totals + np.uint64(mod - space)) % p
+
+    def vector_winnow(self, hashes, previous=None):
+        """
+        DSA Logic: Robust winnowing via sliding_window_view. Each window's
+        rightmost minimum comes from one argmin; consecutive windows with the
+        same minimum value form a run, and a run only switches to a later
+        equal minimum once the previous pick leaves the window (the
+        keep-previous rule of winnow_positions). Runs without repeated
+        minima need no Python at all. Returns (hashes, token_offsets) arrays.
+        previous continues an earlier call over the hashes just before these
+        (streaming): the offset of that call's last pick, negative once it is
+        out of the first window. It is kept, not emitted again, while minimal.
+        """
+        hashes = np.asarray(hashes, dtype=np.uint64)
+        if len(hashes) < self.w:
+            return hashes, np.arange(len(hashes))
+        if self.backend == "c" and previous is None:
+            return native.winnow(hashes, self.w)
+        windows = np.lib.stride_tricks.sliding_window_view(hashes, self.w)
+        count = len(windows)
+        rightmost = np.arange(count) + (self.w - 1 - np.argmin(windows[:, ::-1], axis=1))
+        minima = hashes[rightmost]
+
+        starts = np.flatnonzero(np.concatenate(([True], minima[1:] != minima[:-1])))
+        keep = np.zeros(count, dtype=bool)
+        keep[starts] = True
+        # Run -> first window past its current pick; equal minima at a new
+        # position mean that run's chain of picks has to be walked
+        chains = {}
+        ties = np.flatnonzero((rightmost[1:] != rightmost[:-1]) & (minima[1:] == minima[:-1])) + 1
+        for run in np.unique(np.searchsorted(starts, ties, side="right") - 1).tolist():
+            chains[run] = int(rightmost[starts[run]]) + 1
+        if previous is not None and previous >= 0 and hashes[previous] == minima[0]:
+            # The earlier pick is still in the first window and still minimal
+            keep[0] = False
+            chains[0] = previous + 1
+        if chains:
+            ends = np.append(starts[1:], count)
+            picks = rightmost.tolist()
+            for run, t in chains.items():
+                end = int(ends[run])
+                while t < end:
+                    keep[t] = True
+                    t = picks[t] + 1
+        positions = rightmost[keep]
+        return hashes[positions], positions
+
+    def build_filter(self, fingerprints_a):
+        # Bloom filter of one scan: the C core's index, or a NumPy-backed BloomFilter
+        if self.backend == "c":
+            return native.NativeIndex(fingerprints_a, self.bloom_error)
+        bloom = BloomFilter(len(fingerprints_a), self.bloom_error)
+        bloom.add_many(fingerprints_a)
+        return bloom
+
+    def scan_vectorized(self, bloom, fingerprints_a, hashes_b, stats=None):
+        # Steps 2-3 of execute_scan on NumPy arrays (or in the C core), probing this scan's filter
+        if self.backend == "c":
+            result = bloom.scan(hashes_b)
+            if stats:
+                stats.lap("bloom_probe")
+            return result
+
+        in_bloom = bloom.contains_many(hashes_b)
+        if stats:
+            stats.lap("bloom_probe")
+        # Exact check of the Bloom positives only, by binary search in A's
+        # fingerprints (document_fingerprints keeps them sorted)
+        positives = np.flatnonzero(in_bloom)
+        slots = np.searchsorted(fingerprints_a, hashes_b[positives])
+        found = fingerprints_a[np.minimum(slots, len(fingerprints_a) - 1)] == hashes_b[positives]
+        hit_pos = positives[found]
+        keys, first, counts = unique_counts(hashes_b[hit_pos])
+        # Insertion order follows first occurrence, as in the Python loop
+        order = np.argsort(first, kind="stable")
+        keys, first, counts = keys[order], first[order], counts[order]
+
+        match_freq_map = dict(zip(keys.tolist(), counts.tolist()))
+        match_pos = dict(zip(keys.tolist(), hit_pos[first].tolist()))
+        bloom_skips = int(len(hashes_b) - np.count_nonzero(in_bloom))
+        if stats:
+            stats.lap("verify")
+        return int(len(hit_pos)), bloom_skips, match_freq_map, match_pos
+
+    def winnow(self, hashes):
+        # Fingerprinting for space efficiency
+        return {h for h, _ in self.winnow_positions(hashes)}
+
+    def winnow_positions(self, hashes):
+        """
+        DSA Logic: Robust winnowing with a monotonic deque.
+        The deque front is always the rightmost minimum of the current window;
+        the previous pick is kept while it is still in the window and minimal.
+        Returns (hash, token_offset) fingerprints in document order.
+        Time Complexity: O(N)
+        """
+        w = self.w
+        if len(hashes) < w:
+            return [(h, i) for i, h in enumerate(hashes)]
+
+        fingerprints = []
+        window = deque()
+        selected = -1
+        for i, h in enumerate(hashes):
+            while window and hashes[window[-1]] >= h:
+                window.pop()
+            window.append(i)
+            if window[0] <= i - w:
+                window.popleft()
+            if i < w - 1:
+                continue
+            low = window[0]
+            if selected > i - w and hashes[selected] == hashes[low]:
+                continue
+            selected = low
+            fingerprints.append((hashes[low], low))
+        return fingerprints
+
+    def hash_tokens(self, words):
+        # Shingle hashes of a Tokens document on this engine's backend
+        if self.vectorized:
+            return self.vector_hashes(words)
+        return self.shingle_hashes(words)
+
+    def fingerprint(self, text):
+        # Positional fingerprints [(hash, token_offset), ...] of one document
+        doc = self.prepare(text)
+        if len(doc["words"]) < self.n:
+            return []
+        self.document_fingerprints(doc)
+        hashes, positions = doc["positions"]
+        if self.vectorized:
+            return list(zip(hashes.tolist(), positions.tolist()))
+        return list(zip(hashes, positions))
+
+    def get_top_k_matches(self, match_freq_map, k=5):
+        """
+        DSA Logic: Uses a Min-Heap to maintain the Top-K highest frequencies.
+        Time Complexity: O(N log K)
+        """
+        # We store tuples of (frequency, hash) in the min-heap
+        heap = []
+        for h, freq in match_freq_map.items():
+            if len(heap) < k:
+                heapq.heappush(heap, (freq, h))
+            elif freq > heap[0][0]:
+                heapq.heapreplace(heap, (freq, h))
+        
+        # Sort heap descending for display
+        return sorted(heap, key=lambda x: x[0], reverse=True)
+
+    def prepare(self, text, stats=None):
+        """
+        Tokens and shingle hashes of one document, plus its fingerprints once
+        requested. Memoized by content digest when doc_cache > 0; the engine
+        already fixes (n, w), so the digest alone is the key.
+        """
+        key = None
+        if self.doc_cache.maxsize > 0:
+            key = self.doc_key(text)
+            doc = self.doc_cache.get(key)
+            if doc is not None:
+                if stats:
+                    stats.count("doc_cache_hits")
+                    stats.lap("doc_cache")
+                return doc
+        words = self.tokenize(text, offsets=self.passages)
+        if stats:
+            stats.lap("tokenize")
+        hashes = self.hash_tokens(words)
+        if stats:
+            stats.lap("hash")
+        doc = {"words": words, "hashes": hashes, "fingerprints": None, "simhash": None}
+        if key is not None:
+            self.doc_cache.put(key, doc)
+        return doc
+
+    def doc_key(self, text):
+        return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).digest()
+
+    def document_tokens(self, text):
+        # Tokens with offsets: the ones prepare() memoized when cached (passages=True), else a fresh tokenize
+        if self.doc_cache.maxsize > 0:
+            doc = self.doc_cache.get(self.doc_key(text))
+            if doc is not None and doc["words"].starts is not None:
+                return doc["words"]
+        return self.tokenize(text, offsets=True)
+
+    def document_fingerprints(self, doc):
+        # Winnowed fingerprint set of a prepared document, computed once;
+        # the positional (hashes, positions) pair is kept for passage merging
+        if doc["fingerprints"] is None:
+            if self.vectorized:
+                hashes, positions = self.vector_winnow(doc["hashes"])
+                doc["fingerprints"] = sorted_unique(hashes)
+            else:
+                winnowed = self.winnow_positions(doc["hashes"])
+                hashes = [h for h, _ in winnowed]
+                positions = [pos for _, pos in winnowed]
+                doc["fingerprints"] = set(hashes)
+            doc["positions"] = (hashes, positions)
+        return doc["fingerprints"]
+
+    def document_simhash(self, doc):
+        # 64-bit SimHash of a prepared document, computed once and kept with it
+        if doc["simhash"] is None:
+            doc["simhash"] = simhash(doc["hashes"])
+        return doc["simhash"]
+
+    def find_passages(self, prepared_a, prepared_b):
+        """
+        Maximal copied passages between two prepared documents as character
+        spans in both, sorted by position in B. Requires passages=True so the
+        tokens carry offsets.
+        """
+        self.document_fingerprints(prepared_a)
+        fp_hashes, fp_positions = prepared_a["positions"]
+        hits = fingerprint_hits(fp_hashes, fp_positions, prepared_b["hashes"])
+        # One edited token loses up to n source shingles, and winnowing keeps one
+        # fingerprint per w shingles, so hits on either side are up to n + 2w apart
+        runs = merge_hits(hits, gap=max(self.n, self.w), join_gap=self.n + 2 * self.w)
+        return passage_spans(runs, self.n, fp_positions, prepared_a["words"], prepared_b["words"])
+
+    def verify_exact(self, doc_a, doc_b, min_tokens=None, max_tokens=verify.MAX_TOKENS):
+        """
+        Exact second stage for flagged pairs: every verbatim passage of at
+        least min_tokens tokens (default n) via a suffix array over both
+        token-ID sequences, independent of which shingles winnowing kept.
+        coverage is the exact percentage of B's tokens copied from A.
+        Pairs over max_tokens tokens in total are not verified (coverage None,
+        "skipped" says why): the suffix array needs O(N log N) int64 memory,
+        300-450 MB per million tokens. max_tokens=None lifts the cap.
+        Reuses the prepared tokens of execute_scan when doc_cache holds them.
+        Time Complexity: O(N log^2 N) worst case for N = len(A) + len(B) tokens
+        """
+        min_tokens = self.n if min_tokens is None else min_tokens
+        if min_tokens < 1:
+            raise ValueError("min_tokens must be at least 1")
+        tokens_a = self.document_tokens(doc_a)
+        tokens_b = self.document_tokens(doc_b)
+        if tokens_b.vocab is not tokens_a.vocab:
+            # The vocabulary was renewed in between; IDs must come from one table
+            tokens_a = Tokenizer(tokens_b.vocab).tokenize(doc_a, offsets=True)
+        total = len(tokens_a) + len(tokens_b)
+        if max_tokens is not None and total > max_tokens:
+            return {"coverage": None, "passages": [],
+                    "skipped": f"{total} tokens, over the exact verification limit of {max_tokens}"}
+        found = verify.common_passages(tokens_a.ids, tokens_b.ids, min_tokens)
+        return {
+            "coverage": verify.coverage(found, len(tokens_b)),
+            "passages": verify.exact_spans(found, tokens_a, tokens_b),
+        }
+
+    def execute_scan(self, doc_a, doc_b):
+        # Stage timers and counters are collected only when instrument=True
+        stats = ScanStats() if self.instrument else None
+        prepared_a = self.prepare(doc_a, stats)
+        prepared_b = self.prepare(doc_b, stats)
+        words_b = prepared_b["words"]
+
+        if len(prepared_a["words"]) < self.n or len(words_b) < self.n:
+            return None
+
+        # 1. Process Document A (Fingerprinting)
+        fingerprints_a = self.document_fingerprints(prepared_a)
+        all_hashes_b = prepared_b["hashes"]
+        fps = len(fingerprints_a)
+        if stats:
+            stats.lap("winnow")
+
+        # 2. Populate Bloom Filter (local to this scan, so concurrent scans never share one)
+        if self.vectorized:
+            bloom = self.build_filter(fingerprints_a)
+        else:
+            bloom = BloomFilter(len(fingerprints_a), self.bloom_error)
+            for f in fingerprints_a:
+                bloom.add(f)
+        if stats:
+            stats.lap("bloom_build")
+
+        if self.vectorized:
+            matches, bloom_skips, match_freq_map, match_pos = self.scan_vectorized(bloom, fingerprints_a, all_hashes_b, stats)
+        else:
+            # 3. Process Document B (Scanning & Frequency Tracking)
+            matches = 0
+            bloom_skips = 0
+            match_freq_map = {}
+            match_pos = {}
+
+            for i, h in enumerate(all_hashes_b):
+                if h in bloom:
+                    if h in fingerprints_a:
+                        matches += 1
+                        match_freq_map[h] = match_freq_map.get(h, 0) + 1
+                        match_pos.setdefault(h, i)
+                else:
+                    bloom_skips += 1
+            if stats:
+                # Probe and exact check share one loop here
+                stats.lap("bloom_probe")
+
+        # 4. Extract Top-K via Min-Heap logic
+        top_k_raw = self.get_top_k_matches(match_freq_map, k=5)
+        if stats:
+            stats.lap("top_k")
+        top_k_formatted = [
+            {"phrase": self.get_phrase(h, words_b, match_pos[h]), "count": freq} 
+            for freq, h in top_k_raw
+        ]
+
+        score = (matches / fps) * 100 if fps > 0 else 0
+        result = {
+            "score": score,
+            "matches": matches,
+            "skips": bloom_skips,
+            "fps": fps,
+            "top_k": top_k_formatted
+        }
+        if stats:
+            stats.lap("phrases")
+        if self.passages:
+            result["passages"] = self.find_passages(prepared_a, prepared_b)
+            if stats:
+                stats.lap("passages")
+        if stats:
+            self.record_counters(stats, bloom, prepared_a, prepared_b, matches, bloom_skips, match_freq_map)
+            result["metrics"] = stats.as_dict()
+            if self.metrics_sink is not None:
+                self.metrics_sink(result["metrics"])
+        return result
+
+    def record_counters(self, stats, bloom, prepared_a, prepared_b, matches, bloom_skips, match_freq_map):
+        # Sizes plus observed vs. expected false positives of the scan's own Bloom filter
+        shingles_b = len(prepared_b["hashes"])
+        positives = shingles_b - bloom_skips
+        negatives = shingles_b - matches
+        stats.set("tokens_a", len(prepared_a["words"]))
+        stats.set("tokens_b", len(prepared_b["words"]))
+        stats.set("shingles_a", len(prepared_a["hashes"]))
+        stats.set("shingles_b", shingles_b)
+        stats.set("fingerprints_a", len(prepared_a["fingerprints"]))
+        stats.set("bloom_positives", positives)
+        stats.set("confirmed_hits", matches)
+        stats.set("bloom_false_positives", positives - matches)
+        stats.set("bloom_fp_rate", (positives - matches) / negatives if negatives else 0.0)
+        stats.set("bloom_fp_expected", bloom.false_positive_rate())
+        stats.set("bloom_bits", bloom.size)
+        stats.set("match_map_size", len(match_freq_map))
+        stats.set("phrase_cache_size", len(self.phrase_cache))
+        stats.set("doc_cache_size", len(self.doc_cache))
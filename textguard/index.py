@@ -0,0 +1,166 @@
+import heapq
+import numpy as np
+from .engine import TextGuardEngine
+from .parallel import fingerprint_documents, fingerprint_files
+from .storage import MappedIndex, write_index
+
+# --- CORPUS FINGERPRINT INDEX (One-vs-Many Scanning) ---
+
+def rank_sources(shared, suspect_fps, doc_fps, k=10):
+    # Top-k (doc_id, shared_count) pairs by count, formatted for display
+    ranked = heapq.nlargest(k, shared, key=lambda item: item[1])
+    return [
+        {
+            "doc_id": doc_id,
+            "shared": count,
+            "score": count / suspect_fps * 100,
+            "coverage": count / doc_fps[doc_id] * 100 if doc_fps[doc_id] else 0,
+        }
+        for doc_id, count in ranked
+    ]
+
+class CorpusIndex:
+    """
+    DSA Logic: Inverted index from winnowed fingerprint hash to
+    (doc_id, token_offset) postings. Archived documents are fingerprinted
+    once on add(); a suspect is fingerprinted once and each of its hashes
+    is a single dict lookup, so query cost is proportional to the suspect.
+    """
+    def __init__(self, n=4, w=4, backend="numpy", dual_hash=True):
+        self.engine = TextGuardEngine(n=n, w=w, backend=backend, dual_hash=dual_hash)
+        self.postings = {}
+        self.doc_fps = {}
+
+    def __len__(self):
+        return len(self.doc_fps)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.doc_fps
+
+    def add(self, doc_id, text):
+        if doc_id in self.doc_fps:
+            raise KeyError(f"Document already indexed: {doc_id}")
+        fingerprints = self.engine.fingerprint(text)
+        for h, pos in fingerprints:
+            self.postings.setdefault(h, []).append((doc_id, pos))
+        self.doc_fps[doc_id] = len({h for h, _ in fingerprints})
+
+    def add_fingerprints(self, doc_id, hashes, offsets):
+        # Adds a document from precomputed (hash, offset) arrays
+        if doc_id in self.doc_fps:
+            raise KeyError(f"Document already indexed: {doc_id}")
+        hashes = hashes.tolist() if isinstance(hashes, np.ndarray) else list(hashes)
+        offsets = offsets.tolist() if isinstance(offsets, np.ndarray) else list(offsets)
+        for h, pos in zip(hashes, offsets):
+            self.postings.setdefault(h, []).append((doc_id, pos))
+        self.doc_fps[doc_id] = len(set(hashes))
+
+    def add_many(self, docs, workers=None, chunksize=8):
+        # Bulk ingestion of {doc_id: text}, fingerprinted in parallel
+        doc_ids = list(docs)
+        results = fingerprint_documents([docs[d] for d in doc_ids], n=self.engine.n, w=self.engine.w,
+                                        backend=self.engine.backend, workers=workers, chunksize=chunksize,
+                                        dual_hash=self.engine.dual_hash)
+        for doc_id, (hashes, offsets) in zip(doc_ids, results):
+            self.add_fingerprints(doc_id, hashes, offsets)
+
+    def add_files(self, paths, workers=None, chunksize=8, encoding="utf-8"):
+        # Bulk ingestion of text files; the path is used as doc_id
+        paths = [str(p) for p in paths]
+        results = fingerprint_files(paths, n=self.engine.n, w=self.engine.w, backend=self.engine.backend,
+                                    workers=workers, chunksize=chunksize, encoding=encoding,
+                                    dual_hash=self.engine.dual_hash)
+        for path, (hashes, offsets) in zip(paths, results):
+            self.add_fingerprints(path, hashes, offsets)
+
+    def lookup(self, h):
+        return self.postings.get(h, [])
+
+    def query(self, text, k=10):
+        """
+        Ranks indexed documents by fingerprints shared with the suspect.
+        score: share of the suspect's fingerprints found in the source.
+        coverage: share of the source's fingerprints found in the suspect.
+        Time Complexity: O(F + P + D log k), F suspect fingerprints, P postings hit
+        """
+        suspect = {h for h, _ in self.engine.fingerprint(text)}
+        if not suspect:
+            return []
+
+        shared = {}
+        for h in suspect:
+            for doc_id in {doc_id for doc_id, _ in self.postings.get(h, ())}:
+                shared[doc_id] = shared.get(doc_id, 0) + 1
+
+        return rank_sources(shared.items(), len(suspect), self.doc_fps, k)
+
+    # --- Persistence ---
+
+    def save(self, path):
+        # Writes the memory-mappable format described in storage.py
+        hashes, docs, offsets = [], [], []
+        doc_ids = list(self.doc_fps)
+        doc_index = {doc_id: i for i, doc_id in enumerate(doc_ids)}
+        for h, plist in self.postings.items():
+            for doc_id, pos in plist:
+                hashes.append(h)
+                docs.append(doc_index[doc_id])
+                offsets.append(pos)
+        write_index(path, self.engine.n, self.engine.w, self.engine.dual_hash, doc_ids,
+                    [self.doc_fps[d] for d in doc_ids], hashes, docs, offsets)
+
+    @classmethod
+    def load(cls, path, backend="numpy"):
+        # Reads a saved index back into memory so more documents can be added
+        with MappedIndex(path) as mapped:
+            index = cls(n=mapped.n, w=mapped.w, backend=backend, dual_hash=mapped.dual_hash)
+            doc_ids = mapped.doc_ids
+            index.doc_fps = dict(zip(doc_ids, mapped.doc_fps.tolist()))
+            counts = np.diff(mapped.post_start.astype(np.int64))
+            hashes = np.repeat(mapped.hashes, counts).tolist()
+            for h, d, pos in zip(hashes, mapped.post_doc.tolist(), mapped.post_offset.tolist()):
+                index.postings.setdefault(h, []).append((doc_ids[d], pos))
+        return index
+
+    @classmethod
+    def open(cls, path, backend="numpy"):
+        # Read-only, memory-mapped index for serving queries
+        return MappedCorpusIndex(path, backend=backend)
+
+class MappedCorpusIndex:
+    """
+    Query side of CorpusIndex over a MappedIndex file. Nothing is loaded
+    up front; only the pages touched by a lookup are read from disk.
+    """
+    def __init__(self, path, backend="numpy"):
+        self.mapped = MappedIndex(path)
+        self.engine = TextGuardEngine(n=self.mapped.n, w=self.mapped.w, backend=backend,
+                                      dual_hash=self.mapped.dual_hash)
+        self.doc_fps = dict(zip(self.mapped.doc_ids, self.mapped.doc_fps.tolist()))
+
+    def __len__(self):
+        return len(self.mapped)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.doc_fps
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.mapped.close()
+
+    def lookup(self, h):
+        return self.mapped.lookup(h)
+
+    def query(self, text, k=10):
+        suspect = [h for h, _ in self.engine.fingerprint(text)]
+        if not suspect:
+            return []
+        counts = self.mapped.shared_counts(suspect)
+        hit = np.flatnonzero(counts)
+        shared = zip([self.mapped.doc_ids[d] for d in hit.tolist()], counts[hit].tolist())
+        return rank_sources(shared, len(set(suspect)), self.doc_fps, k)
@@ -0,0 +1,84 @@
+import heapq
+import numpy as np
+from .engine import mix64_array
+from .parallel import MINHASH
+from .sketches import SketchIndex
+
+# --- MINHASH SKETCHES + LSH BANDING (Corpus-Scale Candidate Retrieval) ---
+
+def band_keys(signature, bands, rows):
+    # One uint64 bucket key per band, chaining mix64 over the band's rows
+    grid = signature[:bands * rows].reshape(bands, rows)
+    keys = np.arange(bands, dtype=np.uint64)
+    for r in range(rows):
+        keys = mix64_array(keys ^ grid[:, r])
+    return keys
+
+class MinHashIndex(SketchIndex):
+    """
+    DSA Logic: LSH banding. Signatures of bands * rows MinHash values
+    (engine.minhash) are cut into `bands` bands; each band is one hash-table
+    bucket key. Documents sharing any bucket are candidates, so a query reads
+    b buckets instead of the corpus. A pair with Jaccard s collides with
+    probability 1 - (1 - s^rows)^bands, an S-curve centred near
+    (1 / bands)^(1 / rows): more bands raise recall, more rows raise precision.
+    Time Complexity: O(S * P) to sketch, O(b + C * P) to query C candidates
+    """
+    SETTINGS = ("n", "w", "bands", "rows", "dual_hash", "seed")
+    SLOT = MINHASH
+
+    def __init__(self, n=4, w=4, bands=32, rows=4, backend="numpy", dual_hash=True, seed=0):
+        if bands < 1 or rows < 1:
+            raise ValueError("bands and rows must be positive")
+        super().__init__(n=n, w=w, backend=backend, dual_hash=dual_hash)
+        self.bands = bands
+        self.rows = rows
+        self.seed = seed
+        self.tables = [{} for _ in range(bands)]
+
+    @property
+    def num_perm(self):
+        return self.bands * self.rows
+
+    @property
+    def threshold(self):
+        # Jaccard similarity at which the collision probability is about 1/2
+        return (1 / self.bands) ** (1 / self.rows)
+
+    def sketch_options(self):
+        return (False, self.num_perm, self.seed, False)
+
+    def sketch_shape(self):
+        return (self.num_perm,)
+
+    def bucket(self, number, signature):
+        for table, key in zip(self.tables, band_keys(signature, self.bands, self.rows).tolist()):
+            table.setdefault(key, []).append(number)
+
+    def candidates(self, signature):
+        # {doc number: colliding bands} over the query's buckets
+        found = {}
+        if signature is None:
+            return found
+        for table, key in zip(self.tables, band_keys(signature, self.bands, self.rows).tolist()):
+            for number in table.get(key, ()):
+                found[number] = found.get(number, 0) + 1
+        return found
+
+    def query(self, text, k=10):
+        """
+        Top-k candidates by estimated Jaccard similarity (share of equal
+        signature rows, as a percentage), among documents sharing a bucket.
+        """
+        signature = self.sketch(text)
+        found = self.candidates(signature)
+        if not found:
+            return []
+        numbers = list(found)
+        stacked = np.stack([self.sketches[d] for d in numbers])
+        estimates = (stacked == signature).mean(axis=1).tolist()
+        ranked = heapq.nlargest(k, zip(numbers, estimates), key=lambda item: item[1])
+        return [
+            {"doc_id": self.doc_ids[d], "bands": found[d], "score": estimate * 100}
+            for d, estimate in ranked
+        ]
@@ -0,0 +1,84 @@
+import json
+import sys
+import time
+import threading
+
+# --- SCAN INSTRUMENTATION (Opt-in Stage Timers & Counters) ---
+
+class ScanStats:
+    """
+    Lap timer plus counters for one scan. Each lap(stage) charges the wall
+    and CPU time since the previous lap to that stage, so the engine only
+    marks stage boundaries; repeated stages (e.g. hashing both documents)
+    accumulate. Engines without instrumentation never create one.
+    """
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+        self.started = time.perf_counter()
+        self.last = (self.started, time.process_time())
+
+    def lap(self, stage):
+        now = (time.perf_counter(), time.process_time())
+        wall, cpu = self.stages.get(stage, (0.0, 0.0))
+        self.stages[stage] = (wall + now[0] - self.last[0], cpu + now[1] - self.last[1])
+        self.last = now
+
+    def count(self, name, value=1):
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def set(self, name, value):
+        self.counters[name] = value
+
+    def as_dict(self):
+        return {
+            "wall_s": self.last[0] - self.started,
+            "stages": {name: {"wall_s": wall, "cpu_s": cpu} for name, (wall, cpu) in self.stages.items()},
+            "counters": dict(self.counters),
+        }
+
+# --- METRICS SINKS ---
+# A sink is any callable taking the metrics dict of one scan.
+
+class JSONLinesSink:
+    # Appends one JSON object per scan to a file or stream
+    def __init__(self, target=None):
+        self.lock = threading.Lock()
+        self.owned = isinstance(target, str)
+        self.stream = open(target, "a", encoding="utf-8") if self.owned else (target or sys.stderr)
+
+    def __call__(self, metrics):
+        line = json.dumps(metrics)
+        with self.lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+    def close(self):
+        if self.owned:
+            self.stream.close()
+
+class MetricsAggregator:
+    # Running totals across scans, e.g. for a /metrics endpoint or a batch summary
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.scans = 0
+        self.stages = {}
+        self.counters = {}
+
+    def __call__(self, metrics):
+        with self.lock:
+            self.scans += 1
+            for name, stage in metrics["stages"].items():
+                wall, cpu = self.stages.get(name, (0.0, 0.0))
+                self.stages[name] = (wall + stage["wall_s"], cpu + stage["cpu_s"])
+            for name, value in metrics["counters"].items():
+                if isinstance(value, int):
+                    self.counters[name] = self.counters.get(name, 0) + value
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "scans": self.scans,
+                "stages": {name: {"wall_s": wall, "cpu_s": cpu} for name, (wall, cpu) in self.stages.items()},
+                "counters": dict(self.counters),
+            }
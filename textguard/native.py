@@ -0,0 +1,151 @@
+import os
+import math
+import ctypes
+import numpy as np
+
+# --- C CORE BRIDGE (ctypes, backend="c") ---
+# Build next to the repo root (or point TEXTGUARD_NATIVE_LIB at the library):
+#   cc -O2 -shared -fPIC -DTEXTGUARD_LIB -o libtextguard.so PlagiarismDetector2.c -lm
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIB_NAMES = ("libtextguard.so", "libtextguard.dylib", "textguard.dll")
+LIB = None
+
+u64_p = np.ctypeslib.ndpointer(dtype=np.uint64, flags="C_CONTIGUOUS")
+i64_p = np.ctypeslib.ndpointer(dtype=np.int64, flags="C_CONTIGUOUS")
+u32_p = np.ctypeslib.ndpointer(dtype=np.uint32, flags="C_CONTIGUOUS")
+
+def library_path():
+    path = os.environ.get("TEXTGUARD_NATIVE_LIB")
+    if path:
+        return path
+    for name in LIB_NAMES:
+        path = os.path.join(ROOT, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+def load():
+    # Loads the shared library once and declares the tg_* signatures
+    global LIB
+    if LIB is not None:
+        return LIB
+    path = library_path()
+    if path is None:
+        raise ImportError("TextGuard C core not built; run: cc -O2 -shared -fPIC -DTEXTGUARD_LIB "
+                          "-o libtextguard.so PlagiarismDetector2.c -lm")
+    lib = ctypes.CDLL(path)
+    size_t, longlong = ctypes.c_size_t, ctypes.c_longlong
+    lib.tg_shingle_hashes.argtypes = [u32_p, size_t, ctypes.c_int, ctypes.c_int, u64_p]
+    lib.tg_shingle_hashes.restype = longlong
+    lib.tg_winnow.argtypes = [u64_p, size_t, ctypes.c_int, u64_p, i64_p]
+    lib.tg_winnow.restype = longlong
+    lib.tg_fingerprint.argtypes = [u32_p, size_t, ctypes.c_int, ctypes.c_int, ctypes.c_int, u64_p, i64_p]
+    lib.tg_fingerprint.restype = longlong
+    lib.tg_index_new.argtypes = [size_t, ctypes.c_double]
+    lib.tg_index_new.restype = ctypes.c_void_p
+    lib.tg_index_free.argtypes = [ctypes.c_void_p]
+    lib.tg_index_free.restype = None
+    lib.tg_index_add.argtypes = [ctypes.c_void_p, u64_p, size_t]
+    lib.tg_index_add.restype = longlong
+    lib.tg_index_size.argtypes = [ctypes.c_void_p]
+    lib.tg_index_size.restype = size_t
+    lib.tg_index_bloom_bits.argtypes = [ctypes.c_void_p]
+    lib.tg_index_bloom_bits.restype = ctypes.c_uint64
+    lib.tg_index_hash_count.argtypes = [ctypes.c_void_p]
+    lib.tg_index_hash_count.restype = ctypes.c_int
+    lib.tg_scan.argtypes = [ctypes.c_void_p, u64_p, size_t, u64_p, i64_p, i64_p,
+                            ctypes.POINTER(size_t), ctypes.POINTER(size_t)]
+    lib.tg_scan.restype = longlong
+    LIB = lib
+    return lib
+
+def available():
+    try:
+        load()
+        return True
+    except (ImportError, OSError):
+        return False
+
+def code_points(text):
+    # UTF-32 code points, so the C side hashes ord(char) like the Python engine
+    return np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+
+def checked(result):
+    if result < 0:
+        raise MemoryError("TextGuard C core allocation failed")
+    return result
+
+def shingle_hashes(words, n, dual_hash=True):
+    # Same values as TextGuardEngine.vector_hashes(words)
+    count = len(words) - n + 1
+    if count <= 0:
+        return np.zeros(0, dtype=np.uint64)
+    text = code_points(" ".join(words))
+    out = np.empty(count, dtype=np.uint64)
+    written = checked(load().tg_shingle_hashes(text, len(text), n, int(dual_hash), out))
+    return out[:written]
+
+def winnow(hashes, w):
+    # Same (hashes, positions) as TextGuardEngine.vector_winnow(hashes) on the
+    # other backends, including the keep-previous tie-break (tests/test_backends.py)
+    hashes = np.ascontiguousarray(hashes, dtype=np.uint64)
+    out_hashes = np.empty(len(hashes), dtype=np.uint64)
+    out_pos = np.empty(len(hashes), dtype=np.int64)
+    written = checked(load().tg_winnow(hashes, len(hashes), w, out_hashes, out_pos))
+    return out_hashes[:written], out_pos[:written]
+
+def fingerprint_buffer(text, n, w, dual_hash=True):
+    # Positional fingerprints of an already preprocessed (space-separated) text
+    points = code_points(text)
+    room = len(points) // 2 + 1
+    out_hashes = np.empty(room, dtype=np.uint64)
+    out_pos = np.empty(room, dtype=np.int64)
+    written = checked(load().tg_fingerprint(points, len(points), n, w, int(dual_hash), out_hashes, out_pos))
+    return out_hashes[:written], out_pos[:written]
+
+class NativeIndex:
+    """
+    Fingerprint set plus Bloom filter owned by the C core. Sized and probed
+    exactly like engine.BloomFilter, so skip counts match the other backends.
+    """
+    def __init__(self, fingerprints, error_rate=0.01):
+        self.lib = load()
+        fingerprints = np.ascontiguousarray(fingerprints, dtype=np.uint64)
+        self.handle = self.lib.tg_index_new(len(fingerprints), error_rate)
+        if not self.handle:
+            raise MemoryError("TextGuard C core allocation failed")
+        checked(self.lib.tg_index_add(self.handle, fingerprints, len(fingerprints)))
+        self.count = len(fingerprints)
+        self.size = self.lib.tg_index_bloom_bits(self.handle)
+        self.hash_count = self.lib.tg_index_hash_count(self.handle)
+
+    def __len__(self):
+        return self.lib.tg_index_size(self.handle)
+
+    def false_positive_rate(self):
+        k = self.hash_count
+        return (1 - math.exp(-k * self.count / self.size)) ** k
+
+    def scan(self, hashes_b):
+        # (matches, bloom_skips, match_freq_map, match_pos) as in scan_vectorized()
+        hashes_b = np.ascontiguousarray(hashes_b, dtype=np.uint64)
+        count = len(hashes_b)
+        keys = np.empty(count, dtype=np.uint64)
+        counts = np.empty(count, dtype=np.int64)
+        first = np.empty(count, dtype=np.int64)
+        unique, skips = ctypes.c_size_t(), ctypes.c_size_t()
+        matches = checked(self.lib.tg_scan(self.handle, hashes_b, count, keys, counts, first,
+                                           ctypes.byref(unique), ctypes.byref(skips)))
+        keys = keys[:unique.value].tolist()
+        match_freq_map = dict(zip(keys, counts[:unique.value].tolist()))
+        match_pos = dict(zip(keys, first[:unique.value].tolist()))
+        return matches, skips.value, match_freq_map, match_pos
+
+    def close(self):
+        if self.handle:
+            self.lib.tg_index_free(self.handle)
+            self.handle = None
+
+    def __del__(self):
+        self.close()
@@ -0,0 +1,93 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import numpy as np
+from .engine import TextGuardEngine, minhash
+
+# --- PARALLEL FINGERPRINTING (Process Pool Ingestion) ---
+
+ENGINES = {}
+
+def get_engine(params):
+    # One engine per worker process and (n, w, backend, dual_hash)
+    if params not in ENGINES:
+        n, w, backend, dual_hash = params
+        ENGINES[params] = TextGuardEngine(n=n, w=w, backend=backend, dual_hash=dual_hash)
+    return ENGINES[params]
+
+# What sketch_text computes per document: (fingerprints, MinHash permutations,
+# MinHash seed, SimHash). Result tuple slots are HASHES, OFFSETS, MINHASH, SIMHASH
+FINGERPRINTS = (True, 0, 0, False)
+HASHES, OFFSETS, MINHASH, SIMHASH = range(4)
+
+def sketch_text(params, sketches, text):
+    """
+    Worker task: one tokenize + hash pass per document feeds every corpus
+    structure. Positional fingerprints come back as two compact arrays
+    (uint64 hashes, uint32 token offsets) instead of Python tuples, so
+    results pickle as two buffers; the MinHash signature and SimHash are
+    taken from the same shingle hashes. Sketches are None below n tokens.
+    """
+    engine = get_engine(params)
+    fingerprints, num_perm, seed, with_simhash = sketches
+    hashes = np.zeros(0, dtype=np.uint64)
+    offsets = np.zeros(0, dtype=np.uint32)
+    doc = engine.prepare(text)
+    if len(doc["words"]) < engine.n:
+        return hashes, offsets, None, None
+    if fingerprints:
+        engine.document_fingerprints(doc)
+        hashes, offsets = doc["positions"]
+        hashes, offsets = np.asarray(hashes, dtype=np.uint64), np.asarray(offsets, dtype=np.uint32)
+    signature = minhash(doc["hashes"], num_perm, seed) if num_perm else None
+    fingerprint = engine.document_simhash(doc) if with_simhash else None
+    return hashes, offsets, signature, fingerprint
+
+def sketch_file(params, sketches, encoding, path):
+    # Worker task for paths: the file is read in the worker, not sent over IPC
+    with open(path, encoding=encoding, errors="replace") as f:
+        return sketch_text(params, sketches, f.read())
+
+def sketch_documents(texts, n=4, w=4, backend="numpy", workers=None, chunksize=8, dual_hash=True,
+                     sketches=FINGERPRINTS):
+    """
+    Runs sketch_text over every text across a ProcessPoolExecutor.
+    Returns one result tuple per text in input order; each result depends
+    only on its own document, so output is identical for any worker count.
+    workers=None uses os.cpu_count(); workers=1 runs in-process.
+    """
+    return run_pool(partial(sketch_text, (n, w, backend, dual_hash), sketches), texts, workers, chunksize)
+
+def sketch_files(paths, n=4, w=4, backend="numpy", workers=None, chunksize=8, encoding="utf-8", dual_hash=True,
+                 sketches=FINGERPRINTS):
+    # Same as sketch_documents, for a list of file paths
+    return run_pool(partial(sketch_file, (n, w, backend, dual_hash), sketches, encoding), paths, workers, chunksize)
+
+def fingerprint_documents(texts, n=4, w=4, backend="numpy", workers=None, chunksize=8, dual_hash=True):
+    # [(hashes, offsets), ...] for every text, in input order
+    results = sketch_documents(texts, n, w, backend, workers, chunksize, dual_hash)
+    return [(r[HASHES], r[OFFSETS]) for r in results]
+
+def fingerprint_files(paths, n=4, w=4, backend="numpy", workers=None, chunksize=8, encoding="utf-8", dual_hash=True):
+    # Same as fingerprint_documents, for a list of file paths
+    results = sketch_files(paths, n, w, backend, workers, chunksize, encoding, dual_hash)
+    return [(r[HASHES], r[OFFSETS]) for r in results]
+
+def run_pool(task, items, workers, chunksize):
+    return list(imap_pool(task, items, workers, chunksize))
+
+def imap_pool(task, items, workers, chunksize):
+    """
+    Yields task(item) in input order as results arrive. workers=None uses
+    os.cpu_count(); workers=1 runs in-process.
+    """
+    items = list(items)
+    workers = workers or os.cpu_count() or 1
+    if workers < 1 or chunksize < 1:
+        raise ValueError("workers and chunksize must be positive")
+    if workers == 1 or len(items) <= 1:
+        for item in items:
+            yield task(item)
+        return
+    with ProcessPoolExecutor(max_workers=min(workers, len(items))) as pool:
+        yield from pool.map(task, items, chunksize=chunksize)
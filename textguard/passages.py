@@ -0,0 +1,85 @@
+import numpy as np
+
+# --- PASSAGE MERGING (Maximal Copied Spans with Character Offsets) ---
+
+def fingerprint_hits(fp_hashes_a, fp_positions_a, hashes_b, max_repeats=16):
+    """
+    (pos_a, pos_b) shingle pairs where a suspect shingle equals a source
+    fingerprint, in suspect order. Hashes repeated more than max_repeats
+    times in the source (boilerplate, repeated tokens) are skipped so the
+    hit list stays linear in the suspect length.
+    """
+    occurrences = {}
+    for h, pos in zip(np.asarray(fp_hashes_a, dtype=np.uint64).tolist(), np.asarray(fp_positions_a).tolist()):
+        occurrences.setdefault(h, []).append(pos)
+    hashes_b = np.asarray(hashes_b, dtype=np.uint64)
+    keys = np.fromiter(occurrences, dtype=np.uint64, count=len(occurrences))
+    candidates = np.flatnonzero(np.isin(hashes_b, keys))
+
+    hits = []
+    for j, h in zip(candidates.tolist(), hashes_b[candidates].tolist()):
+        positions = occurrences[h]
+        if len(positions) <= max_repeats:
+            hits.extend((i, j) for i in positions)
+    return hits
+
+def merge_hits(hits, gap, join_gap=None):
+    """
+    DSA Logic: Diagonal run merging. A verbatim passage keeps
+    pos_b - pos_a constant, so hits are chained per diagonal through a hash
+    map of open runs while consecutive hits are at most `gap` shingles apart.
+    Runs are then joined in suspect order when they continue each other in
+    both documents within join_gap (default 2 * gap): a replaced, inserted
+    or deleted token breaks up to n shingles or shifts the diagonal.
+    Returns [a0, a1, b0, b1, hits] with first/last shingle positions.
+    Time Complexity: O(H + R log R) for H hits and R runs
+    """
+    open_runs = {}
+    runs = []
+    for i, j in hits:
+        k = open_runs.get(j - i)
+        if k is not None and 0 < i - runs[k][1] <= gap:
+            run = runs[k]
+            run[1], run[3], run[4] = i, j, run[4] + 1
+        else:
+            open_runs[j - i] = len(runs)
+            runs.append([i, i, j, j, 1])
+
+    join_gap = 2 * gap if join_gap is None else join_gap
+    runs.sort(key=lambda r: (r[2], r[0]))
+    merged = []
+    for run in runs:
+        last = merged[-1] if merged else None
+        if (last is not None and run[2] <= last[3] + join_gap
+                and last[0] <= run[0] <= last[1] + join_gap):
+            last[1] = max(last[1], run[1])
+            last[3] = max(last[3], run[3])
+            last[4] += run[4]
+        else:
+            merged.append(list(run))
+    return merged
+
+def passage_spans(runs, n, fp_positions_a, tokens_a, tokens_b, min_tokens=None):
+    """
+    Converts shingle runs to character spans. A run covering shingles
+    a0..a1 covers tokens a0..a1+n-1. score is the share of source
+    fingerprints inside the run that were matched: 1.0 for a clean verbatim
+    copy, lower when edits break the chain.
+    """
+    min_tokens = n if min_tokens is None else min_tokens
+    fp_positions_a = np.unique(np.asarray(fp_positions_a, dtype=np.int64))
+    passages = []
+    for a0, a1, b0, b1, count in runs:
+        last_a, last_b = a1 + n - 1, b1 + n - 1
+        if last_b - b0 + 1 < min_tokens:
+            continue
+        inside = np.searchsorted(fp_positions_a, a1, side="right") - np.searchsorted(fp_positions_a, a0)
+        passages.append({
+            "start_a": int(tokens_a.starts[a0]),
+            "end_a": int(tokens_a.ends[last_a]),
+            "start_b": int(tokens_b.starts[b0]),
+            "end_b": int(tokens_b.ends[last_b]),
+            "tokens": last_b - b0 + 1,
+            "score": min(1.0, count / int(inside)) if inside else 1.0,
+        })
+    return passages
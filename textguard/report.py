@@ -0,0 +1,142 @@
+import os
+from .engine import TextGuardEngine
+from .index import CorpusIndex
+from .lsh import MinHashIndex
+from .simhash import SimHashIndex
+from .semantic import load_model
+from .stream import CHUNK_SIZE, iter_chunks, open_text, scan_stream
+from .stylometry import analyze_style
+
+# --- VERDICT LEVELS ---
+
+CRITICAL_SCORE = 25    # verbatim %, massive structural similarity
+WARNING_SEMANTIC = 60  # semantic %, likely paraphrasing
+
+LEVELS = ("AUTHENTIC", "WARNING", "CRITICAL")
+
+def verdict(score, semantic_score):
+    if score > CRITICAL_SCORE:
+        return "CRITICAL"
+    if semantic_score > WARNING_SEMANTIC:
+        return "WARNING"
+    return "AUTHENTIC"
+
+# --- REPORT RECORDS (Shared by the CLI and the HTTP Service) ---
+
+# Pairs whose files total more than this are compared chunk by chunk (compare_stream)
+STREAM_BYTES = 16 << 20
+
+WORKER_STATE = {}
+# Engines by (n, w) and read-only tables by path, shared by every configuration in a worker
+RESOURCES = {}
+
+def resource(load, *key):
+    # load(*key), once per worker process
+    if (load, key) not in RESOURCES:
+        RESOURCES[load, key] = load(*key)
+    return RESOURCES[load, key]
+
+def scan_engine(n, w):
+    # doc_cache holds the pair just scanned, so verify_exact reuses its tokens
+    return TextGuardEngine(n=n, w=w, backend="numpy", passages=True, doc_cache=2)
+
+def worker_state(config):
+    # Engine, semantic model, LSH and SimHash tables of one configuration; see corpus_index
+    if config not in WORKER_STATE:
+        n, w, verify, model_path, index_path, lsh_path, simhash_path, near_dup, top, min_shared, encoding = config
+        WORKER_STATE[config] = {
+            "engine": resource(scan_engine, n, w),
+            "verify": verify,
+            "model": resource(load_model, model_path),
+            "index_path": index_path,
+            "lsh": resource(MinHashIndex.load, lsh_path) if lsh_path else None,
+            "simhash": resource(SimHashIndex.load, simhash_path) if simhash_path else None,
+        }
+    return WORKER_STATE[config]
+
+def corpus_index(state):
+    # Mapped corpus index, opened on first use: only lookups and directory scans need it
+    return resource(CorpusIndex.open, state["index_path"]) if state["index_path"] else None
+
+def read_text(path, encoding):
+    with open(path, encoding=encoding, errors="replace") as f:
+        return f.read()
+
+def style_dict(text):
+    avg_sentence_len, vocab_richness = analyze_style(text)
+    return {"avg_sentence_len": avg_sentence_len, "vocab_richness": vocab_richness}
+
+def near_duplicates(state, suspect, suspect_text, near_dup, top):
+    """
+    Short-circuit records for sources within near_dup SimHash bits of the
+    suspect: whole-document resubmissions are reported as CRITICAL without
+    winnowing or a full scan, at most top of them. Empty when there is no
+    such source.
+    """
+    if top < 1:
+        raise ValueError("top must be at least 1")
+    hits = state["simhash"].query(suspect_text, k=near_dup)[:top]
+    return [
+        {"source": hit["doc_id"], "suspect": suspect, "near_duplicate": True,
+         "distance": hit["distance"], "verdict": "CRITICAL"}
+        for hit in hits
+    ]
+
+def read_chunks(path, encoding):
+    # The file's text as whitespace-ended pieces, for one more streaming pass
+    with open_text(path, encoding) as stream:
+        yield from iter_chunks(stream, CHUNK_SIZE)
+
+def compare_files(state, source, suspect, encoding, suspect_text=None):
+    # compare() for two paths; pairs over STREAM_BYTES are streamed from disk
+    if os.path.getsize(source) + os.path.getsize(suspect) > STREAM_BYTES:
+        return compare_stream(state, source, suspect, encoding)
+    if suspect_text is None:
+        suspect_text = read_text(suspect, encoding)
+    return compare(state, source, suspect, read_text(source, encoding), suspect_text)
+
+def compare(state, source, suspect, source_text, suspect_text):
+    # One comparison record: the Streamlit report as a JSON-ready dict
+    res = state["engine"].execute_scan(source_text, suspect_text)
+    semantic = state["model"].similarity(source_text, suspect_text)
+    level = verdict(res["score"] if res else 0.0, semantic)
+    # Exact suffix-array verification only for pairs the fast path flagged, unless switched off
+    flagged = state["verify"] and level != "AUTHENTIC"
+    exact = state["engine"].verify_exact(source_text, suspect_text) if flagged else None
+    styles = (style_dict(source_text), style_dict(suspect_text))
+    return record(source, suspect, res, semantic, level, styles, exact)
+
+def compare_stream(state, source, suspect, encoding):
+    """
+    compare() for two files without holding either text: scan_stream for
+    the fingerprints, then one chunked pass per file for the semantic term
+    counts and one for the style statistics. There is no exact pass, which
+    needs both token sequences in memory; flagged pairs record why.
+    """
+    res = scan_stream(state["engine"], source, suspect, encoding=encoding)
+    semantic = state["model"].similarity(read_chunks(source, encoding), read_chunks(suspect, encoding))
+    level = verdict(res["score"] if res else 0.0, semantic)
+    exact = None
+    if state["verify"] and level != "AUTHENTIC":
+        exact = {"coverage": None, "passages": [], "skipped": f"pair over {STREAM_BYTES} bytes, scanned from disk"}
+    styles = (style_dict(read_chunks(source, encoding)), style_dict(read_chunks(suspect, encoding)))
+    return record(source, suspect, res, semantic, level, styles, exact)
+
+def record(source, suspect, res, semantic, level, styles, exact):
+    # Record fields shared by compare() and compare_stream()
+    if res is None:
+        res = {"score": 0.0, "matches": 0, "skips": 0, "fps": 0, "top_k": [], "passages": []}
+    return {
+        "source": source,
+        "suspect": suspect,
+        "score": res["score"],
+        "matches": res["matches"],
+        "fps": res["fps"],
+        "skips": res["skips"],
+        "semantic": semantic,
+        "style": {"source": styles[0], "suspect": styles[1]},
+        "top_k": res["top_k"],
+        "passages": res.get("passages", []),
+        "exact": exact,
+        "verdict": level,
+    }
@@ -0,0 +1,113 @@
+import json
+import math
+import os
+from collections import Counter
+
+# --- SEMANTIC SCORING (Corpus TF-IDF Model) ---
+
+MODEL_PATH = os.environ.get("TEXTGUARD_SEMANTIC_MODEL", "semantic_model.json")
+
+def build_analyzer():
+    # Same tokens, lowercasing and stop words as TfidfVectorizer(stop_words='english');
+    # imported here so loading the package never pulls in scikit-learn
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    return TfidfVectorizer(stop_words='english').build_analyzer()
+
+class SemanticModel:
+    """
+    NLP Logic: IDF statistics learned once over the reference corpus and
+    kept as document frequencies, so new documents update them in O(terms).
+    A scan only transforms its two texts and takes a sparse dot product.
+    idf(t) = ln((1 + N) / (1 + df(t))) + 1, as TfidfVectorizer(smooth_idf=True).
+    Terms the corpus never saw are dropped, as a fitted vectorizer's
+    transform drops them. With no corpus fitted, the idf is fitted on the
+    two texts alone, which reproduces the per-scan
+    TfidfVectorizer(stop_words='english').fit_transform([a, b]) score.
+    """
+    def __init__(self):
+        self.doc_count = 0
+        self.doc_freq = Counter()
+        self.analyze = None
+
+    def analyzer(self, text):
+        # Built on the first analyzed text, not when the model is loaded
+        if self.analyze is None:
+            self.analyze = build_analyzer()
+        return self.analyze(text)
+
+    def __len__(self):
+        return self.doc_count
+
+    def add(self, text):
+        # Incremental update with one reference document
+        self.doc_freq.update(set(self.analyzer(text)))
+        self.doc_count += 1
+
+    def fit(self, texts):
+        for text in texts:
+            self.add(text)
+        return self
+
+    def fit_files(self, paths, encoding="utf-8"):
+        for path in paths:
+            with open(path, encoding=encoding, errors="replace") as f:
+                self.add(f.read())
+        return self
+
+    def idf(self, term):
+        return math.log((1 + self.doc_count) / (1 + self.doc_freq.get(term, 0))) + 1
+
+    def counts(self, chunks):
+        # Term counts of a text given as pieces that end at whitespace (a
+        # plain string is one piece); no term spans two pieces
+        counts = Counter()
+        for chunk in [chunks] if isinstance(chunks, str) else chunks:
+            counts.update(self.analyzer(chunk))
+        return counts
+
+    def pair_idf(self, counts_a, counts_b):
+        # idf fitted on just the two texts (N = 2), for a model with no corpus
+        def idf(term):
+            return math.log(3 / (1 + (term in counts_a) + (term in counts_b))) + 1
+        return idf
+
+    def transform(self, text):
+        # L2-normalized TF-IDF vector as a sparse {term: weight} dict
+        return self.weigh(self.counts(text))
+
+    def weigh(self, counts, idf=None):
+        if idf is None:
+            idf = self.idf
+            if self.doc_count:
+                counts = {term: tf for term, tf in counts.items() if term in self.doc_freq}
+        vector = {term: tf * idf(term) for term, tf in counts.items()}
+        norm = math.sqrt(sum(v * v for v in vector.values()))
+        return {term: v / norm for term, v in vector.items()} if norm else {}
+
+    def similarity(self, text_a, text_b):
+        # Cosine similarity in percent; either text may be an iterable of chunks
+        counts_a, counts_b = self.counts(text_a), self.counts(text_b)
+        idf = None if self.doc_count else self.pair_idf(counts_a, counts_b)
+        vec_a, vec_b = self.weigh(counts_a, idf), self.weigh(counts_b, idf)
+        if len(vec_b) < len(vec_a):
+            vec_a, vec_b = vec_b, vec_a
+        return sum(v * vec_b.get(term, 0.0) for term, v in vec_a.items()) * 100
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"doc_count": self.doc_count, "doc_freq": self.doc_freq}, f)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        model = cls()
+        model.doc_count = data["doc_count"]
+        model.doc_freq = Counter(data["doc_freq"])
+        return model
+
+def load_model(path=MODEL_PATH):
+    # Saved corpus model if present, otherwise an empty (pair-fitted) model
+    if path and os.path.exists(path):
+        return SemanticModel.load(path)
+    return SemanticModel()
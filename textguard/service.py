@@ -0,0 +1,226 @@
+import asyncio
+import json
+import logging
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from .index import CorpusIndex
+from .report import compare, corpus_index, worker_state
+from .semantic import MODEL_PATH, load_model
+
+# --- LOCAL HTTP SCANNING SERVICE ---
+#
+#   POST /scan      {"source": str, "suspect": str, "n": 4, "w": 4}  -> scan report
+#   POST /lookup    {"text": str, "k": 10}                            -> ranked corpus sources
+#   POST /semantic  {"a": str, "b": str}                              -> {"semantic": float}
+#   GET  /health                                                      -> load counters
+#
+# An asyncio front end parses requests; CPU-bound work runs in a process
+# pool. At most `concurrency` jobs run at once and at most `max_pending`
+# more may wait; beyond that requests get 503 + Retry-After immediately.
+# `timeout` bounds queue wait plus run time (504). A timed-out job cannot
+# be interrupted inside its worker, so it keeps its slot (and counts as
+# active) until the worker finishes; while timed-out jobs fill every slot,
+# new requests get 503 instead of queueing behind them.
+
+MAX_HEADERS = 100
+
+log = logging.getLogger(__name__)
+
+class ServiceError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+def scan_task(config, source, suspect):
+    record = compare(worker_state(config), None, None, source, suspect)
+    del record["source"], record["suspect"]
+    return record
+
+def lookup_task(config, text, k):
+    return corpus_index(worker_state(config)).query(text, k=k)
+
+def semantic_task(config, a, b):
+    return {"semantic": worker_state(config)["model"].similarity(a, b)}
+
+class ScanService:
+    def __init__(self, workers=None, concurrency=None, max_pending=64, timeout=30.0,
+                 index_path=None, model_path=MODEL_PATH, max_body=32 << 20, encoding="utf-8", verify=True):
+        # Bad --index or --semantic-model files fail here, once, not in every worker
+        if index_path:
+            with CorpusIndex.open(index_path):
+                pass
+        load_model(model_path)
+        workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=workers)
+        # Start the workers now: forked on the first request, they would inherit
+        # that client's socket and keep its connection open after we close it
+        self.pool.submit(os.getpid).result()
+        self.concurrency = concurrency or workers
+        self.slots = asyncio.Semaphore(self.concurrency)
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.index_path = index_path
+        self.model_path = model_path
+        self.max_body = max_body
+        self.encoding = encoding
+        self.verify = verify
+        self.active = 0
+        self.served = 0
+        self.rejected = 0
+        self.timed_out = 0
+        # Timed-out jobs whose worker has not finished yet
+        self.zombies = 0
+
+    def config(self, n=4, w=4):
+        # Same worker configuration tuple as the batch CLI
+        return (n, w, self.verify, self.model_path, self.index_path, None, None, 0, 5, 1, self.encoding)
+
+    async def run_job(self, task, *args):
+        # Slots held by timed-out jobs still running in a worker count as busy
+        if self.active >= self.concurrency + self.max_pending or self.zombies >= self.concurrency:
+            self.rejected += 1
+            raise ServiceError(HTTPStatus.SERVICE_UNAVAILABLE, "server busy, retry later")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        self.active += 1
+        try:
+            await asyncio.wait_for(self.slots.acquire(), self.timeout)
+        except asyncio.TimeoutError:
+            self.active -= 1
+            self.timed_out += 1
+            raise ServiceError(HTTPStatus.GATEWAY_TIMEOUT, f"scan exceeded {self.timeout}s")
+
+        try:
+            future = loop.run_in_executor(self.pool, task, *args)
+        except BaseException:
+            self.slots.release()
+            self.active -= 1
+            raise
+        state = {"zombie": False}
+
+        def release(_):
+            # Runs when the worker is really done, not when the client gave up
+            self.slots.release()
+            self.active -= 1
+            if state["zombie"]:
+                self.zombies -= 1
+
+        future.add_done_callback(release)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            if not future.done():
+                state["zombie"] = True
+                self.zombies += 1
+            raise ServiceError(HTTPStatus.GATEWAY_TIMEOUT, f"scan exceeded {self.timeout}s")
+
+    async def dispatch(self, method, path, body):
+        if path == "/health" and method == "GET":
+            return {"status": "ok", "active": self.active, "concurrency": self.concurrency,
+                    "max_pending": self.max_pending, "served": self.served,
+                    "rejected": self.rejected, "timed_out": self.timed_out, "zombies": self.zombies}
+        routes = {"/scan", "/lookup", "/semantic"}
+        if path not in routes:
+            raise ServiceError(HTTPStatus.NOT_FOUND, f"no route {path}")
+        if method != "POST":
+            raise ServiceError(HTTPStatus.METHOD_NOT_ALLOWED, "use POST")
+        try:
+            data = json.loads(body or b"{}")
+            if path == "/scan":
+                n, w = int(data.get("n", 4)), int(data.get("w", 4))
+                if not (1 <= n <= 64 and 1 <= w <= 64):
+                    raise ValueError("n and w must be between 1 and 64")
+                job = (scan_task, self.config(n, w), str(data["source"]), str(data["suspect"]))
+            elif path == "/lookup":
+                if not self.index_path:
+                    raise ServiceError(HTTPStatus.NOT_FOUND, "service started without --index")
+                job = (lookup_task, self.config(), str(data["text"]), int(data.get("k", 10)))
+            else:
+                job = (semantic_task, self.config(), str(data["a"]), str(data["b"]))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, f"bad request body: {e}")
+        return await self.run_job(*job)
+
+    async def read_line(self, reader, status):
+        # One line of the request head; past the stream limit (64 KiB) the request gets `status`
+        try:
+            return (await reader.readline()).decode("latin-1").strip()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise ServiceError(status, "request line or header too long")
+
+    async def read_request(self, reader):
+        request_line = await self.read_line(reader, HTTPStatus.REQUEST_URI_TOO_LONG)
+        parts = request_line.split()
+        if len(parts) != 3:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "malformed request line")
+        method, target, _ = parts
+        headers = {}
+        while True:
+            line = await self.read_line(reader, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE)
+            if not line:
+                break
+            if len(headers) >= MAX_HEADERS:
+                raise ServiceError(HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, f"more than {MAX_HEADERS} headers")
+            if ":" not in line:
+                raise ServiceError(HTTPStatus.BAD_REQUEST, "malformed headers")
+            name, value = line.split(":", 1)
+            headers[name.strip().lower()] = value.strip()
+        try:
+            length = int(headers.get("content-length", 0))
+        except ValueError:
+            raise ServiceError(HTTPStatus.BAD_REQUEST, "bad Content-Length")
+        if length > self.max_body:
+            raise ServiceError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE, f"body over {self.max_body} bytes")
+        body = await reader.readexactly(length) if length > 0 else b""
+        return method, target.split("?", 1)[0], body
+
+    async def handle(self, reader, writer):
+        status, payload, extra = HTTPStatus.OK, None, ""
+        try:
+            try:
+                method, path, body = await asyncio.wait_for(self.read_request(reader), self.timeout)
+                payload = await self.dispatch(method, path, body)
+                self.served += 1
+            except ServiceError as e:
+                status, payload = e.status, {"error": str(e)}
+                if status == HTTPStatus.SERVICE_UNAVAILABLE:
+                    extra = "Retry-After: 1\r\n"
+            except asyncio.TimeoutError:
+                status, payload = HTTPStatus.REQUEST_TIMEOUT, {"error": "request not received in time"}
+            except (asyncio.IncompleteReadError, ConnectionError):
+                return
+            except Exception:
+                # A failing job (or a bug) answers 500 instead of dropping the connection
+                log.exception("request failed")
+                status, payload = HTTPStatus.INTERNAL_SERVER_ERROR, {"error": "internal server error"}
+            data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            head = (f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"{extra}Connection: close\r\n\r\n")
+            writer.write(head.encode("latin-1") + data)
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765):
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        async with server:
+            await server.serve_forever()
+
+    def close(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+def run(host="127.0.0.1", port=8765, **options):
+    service = ScanService(**options)
+    print(f"textguard: serving on http://{host}:{port}", file=sys.stderr)
+    try:
+        asyncio.run(service.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
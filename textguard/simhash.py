@@ -0,0 +1,54 @@
+from .parallel import SIMHASH
+from .sketches import SketchIndex
+
+# --- SIMHASH NEAR-DUPLICATE INDEX (Permuted-Table Hamming Lookup) ---
+
+def hamming(a, b):
+    return (a ^ b).bit_count()
+
+class SimHashIndex(SketchIndex):
+    """
+    DSA Logic: Permuted-table lookup over engine.simhash fingerprints. The
+    64 bits are cut into k + 1 blocks; by pigeonhole, two fingerprints within
+    k bits agree exactly on at least one block. Each table maps one block's
+    value to documents, so "any document within k bits?" reads k + 1
+    buckets and popcounts the XOR of the few entries found.
+    Time Complexity: O(k + C) per query for C bucket entries
+    """
+    SETTINGS = ("k", "n", "w", "dual_hash")
+    SLOT = SIMHASH
+
+    def __init__(self, k=3, n=4, w=4, backend="numpy", dual_hash=True):
+        if not 0 <= k < 64:
+            raise ValueError("k must be between 0 and 63")
+        super().__init__(n=n, w=w, backend=backend, dual_hash=dual_hash)
+        self.k = k
+        bounds = [64 * i // (k + 1) for i in range(k + 2)]
+        # (shift, mask) of each block
+        self.blocks = [(lo, (1 << (hi - lo)) - 1) for lo, hi in zip(bounds, bounds[1:])]
+        self.tables = [{} for _ in self.blocks]
+
+    def sketch_options(self):
+        return (False, 0, 0, True)
+
+    def bucket(self, number, fingerprint):
+        for table, (shift, mask) in zip(self.tables, self.blocks):
+            table.setdefault((fingerprint >> shift) & mask, []).append(number)
+
+    def near(self, fingerprint, k=None):
+        # (doc_id, distance) of every document within k bits, closest first
+        k = self.k if k is None else k
+        if not 0 <= k <= self.k:
+            raise ValueError(f"k must be between 0 and {self.k} for this index")
+        if fingerprint is None:
+            return []
+        found = {}
+        for table, (shift, mask) in zip(self.tables, self.blocks):
+            for number in table.get((fingerprint >> shift) & mask, ()):
+                if number not in found:
+                    found[number] = hamming(fingerprint, self.sketches[number])
+        hits = sorted((distance, number) for number, distance in found.items() if distance <= k)
+        return [(self.doc_ids[number], distance) for distance, number in hits]
+
+    def query(self, text, k=None):
+        return [{"doc_id": doc_id, "distance": distance} for doc_id, distance in self.near(self.sketch(text), k)]
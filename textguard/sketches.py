@@ -0,0 +1,119 @@
+import abc
+import json
+import numpy as np
+from .engine import TextGuardEngine
+from .parallel import sketch_documents, sketch_files, sketch_text
+
+# --- DOCUMENT SKETCH INDEXES (Shared by MinHash LSH and SimHash) ---
+
+class SketchIndex(abc.ABC):
+    """
+    Doc-id bookkeeping, ingestion and persistence shared by the sketch
+    indexes. Sketches come from the same one-pass worker task as corpus
+    fingerprints (parallel.sketch_text); subclasses say which sketch they
+    need (sketch_options, SLOT) and how to bucket it (bucket).
+    Persistence is a NumPy .npz: settings, sketch values, a presence mask
+    for documents too short to sketch, and the doc ids as JSON (no pickling).
+    """
+    SETTINGS = ("n", "w", "dual_hash")
+
+    def __init__(self, n=4, w=4, backend="numpy", dual_hash=True):
+        self.engine = TextGuardEngine(n=n, w=w, backend=backend, dual_hash=bool(dual_hash))
+        self.doc_ids = []
+        self.doc_index = {}
+        self.sketches = []
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.doc_index
+
+    def params(self):
+        engine = self.engine
+        return (engine.n, engine.w, engine.backend, engine.dual_hash)
+
+    @abc.abstractmethod
+    def sketch_options(self):
+        # (fingerprints, num_perm, seed, simhash) argument of sketch_text
+        pass
+
+    def sketch(self, text):
+        return sketch_text(self.params(), self.sketch_options(), text)[self.SLOT]
+
+    @abc.abstractmethod
+    def bucket(self, number, sketch):
+        # Files document number under its sketch's buckets
+        pass
+
+    def add(self, doc_id, text):
+        self.add_sketch(doc_id, self.sketch(text))
+
+    def add_sketch(self, doc_id, sketch):
+        # Documents shorter than n tokens (sketch None) are kept but never bucketed
+        if doc_id in self.doc_index:
+            raise KeyError(f"Document already indexed: {doc_id}")
+        number = len(self.doc_ids)
+        self.doc_index[doc_id] = number
+        self.doc_ids.append(doc_id)
+        self.sketches.append(sketch)
+        if sketch is not None:
+            self.bucket(number, sketch)
+
+    def add_many(self, docs, workers=None, chunksize=8):
+        # Bulk ingestion of {doc_id: text}, sketched in parallel
+        doc_ids = list(docs)
+        engine = self.engine
+        results = sketch_documents([docs[d] for d in doc_ids], engine.n, engine.w, engine.backend, workers,
+                                   chunksize, engine.dual_hash, self.sketch_options())
+        for doc_id, result in zip(doc_ids, results):
+            self.add_sketch(doc_id, result[self.SLOT])
+
+    def add_files(self, paths, workers=None, chunksize=8, encoding="utf-8"):
+        # Bulk ingestion of text files; the path is used as doc_id
+        paths = [str(p) for p in paths]
+        engine = self.engine
+        results = sketch_files(paths, engine.n, engine.w, engine.backend, workers, chunksize, encoding,
+                               engine.dual_hash, self.sketch_options())
+        for path, result in zip(paths, results):
+            self.add_sketch(path, result[self.SLOT])
+
+    # --- Persistence ---
+
+    def settings(self):
+        # Constructor arguments, in SETTINGS order, as stored in the file
+        engine = self.engine
+        shared = {"n": engine.n, "w": engine.w, "dual_hash": engine.dual_hash}
+        return [int(shared[name] if name in shared else getattr(self, name)) for name in self.SETTINGS]
+
+    def sketch_shape(self):
+        # Shape of one stored sketch: () for a single 64-bit value
+        return ()
+
+    def save(self, path):
+        present = np.array([s is not None for s in self.sketches], dtype=bool)
+        values = np.zeros((len(self.sketches),) + self.sketch_shape(), dtype=np.uint64)
+        for i, sketch in enumerate(self.sketches):
+            if sketch is not None:
+                values[i] = sketch
+        with open(path, "wb") as f:
+            np.savez(f, settings=np.array(self.settings(), dtype=np.int64), sketches=values,
+                     present=present, names=np.array(json.dumps(self.doc_ids)))
+
+    @classmethod
+    def stored_settings(cls, path):
+        # {setting: value} of a saved index, without loading its sketches
+        with np.load(path, allow_pickle=False) as data:
+            return dict(zip(cls.SETTINGS, data["settings"].tolist()))
+
+    @classmethod
+    def load(cls, path, backend="numpy"):
+        with np.load(path, allow_pickle=False) as data:
+            index = cls(backend=backend, **dict(zip(cls.SETTINGS, data["settings"].tolist())))
+            doc_ids = json.loads(str(data["names"]))
+            values = data["sketches"]
+            # One value per document comes back as Python ints, rows stay arrays
+            values = values.tolist() if values.ndim == 1 else values
+            for doc_id, sketch, present in zip(doc_ids, values, data["present"].tolist()):
+                index.add_sketch(doc_id, sketch if present else None)
+        return index
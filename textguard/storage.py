@@ -0,0 +1,129 @@
+import json
+import mmap
+import struct
+import numpy as np
+
+# --- ON-DISK FINGERPRINT INDEX (Memory-Mapped) ---
+#
+# Layout (little-endian, every array 8-byte aligned):
+#   header      MAGIC, version, n, w, flags, docs D, unique hashes U, postings P, names length
+#               flags bit 0: dual-modulus hashes (engine dual_hash)
+#   hashes      uint64[U]    sorted, unique fingerprint hashes
+#   post_start  uint64[U+1]  postings of hashes[i] are [post_start[i], post_start[i+1])
+#   post_doc    uint32[P]    document number of each posting
+#   post_offset uint32[P]    token offset of each posting
+#   doc_fps     uint64[D]    distinct fingerprints per document
+#   names       UTF-8 JSON list of the D doc ids
+
+MAGIC = b"TGFP"
+VERSION = 2
+HEADER = struct.Struct("<4sIIIIQQQQ")
+DUAL_HASH = 1
+
+def align8(size):
+    return (size + 7) & ~7
+
+def write_index(path, n, w, dual_hash, doc_ids, doc_fps, hashes, docs, offsets):
+    """
+    Sorts the flat postings by (hash, doc, offset) and writes the file.
+    Time Complexity: O(P log P)
+    """
+    hashes = np.asarray(hashes, dtype=np.uint64)
+    docs = np.asarray(docs, dtype=np.uint32)
+    offsets = np.asarray(offsets, dtype=np.uint32)
+    order = np.lexsort((offsets, docs, hashes))
+    hashes, docs, offsets = hashes[order], docs[order], offsets[order]
+
+    unique, starts = np.unique(hashes, return_index=True)
+    post_start = np.append(starts, len(hashes)).astype(np.uint64)
+    names = json.dumps(list(doc_ids)).encode("utf-8")
+    flags = DUAL_HASH if dual_hash else 0
+    header = HEADER.pack(MAGIC, VERSION, n, w, flags, len(doc_ids), len(unique), len(hashes), len(names))
+
+    with open(path, "wb") as f:
+        for block in (header, unique, post_start, docs, offsets,
+                      np.asarray(doc_fps, dtype=np.uint64), names):
+            data = block if isinstance(block, bytes) else block.tobytes()
+            f.write(data)
+            f.write(b"\0" * (align8(len(data)) - len(data)))
+
+class MappedIndex:
+    """
+    DSA Logic: Read-only view of an index file through one shared mmap.
+    Arrays are zero-copy np.frombuffer views, so opening is O(D) and the
+    OS shares the pages between every process that maps the same file.
+    Lookups are binary searches (np.searchsorted) over the sorted hashes.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as f:
+            self.buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.buffer) < HEADER.size:
+            raise ValueError(f"Not a TextGuard index file: {path}")
+        magic, version, self.n, self.w, flags, docs, unique, postings, names = HEADER.unpack_from(self.buffer)
+        if magic != MAGIC:
+            raise ValueError(f"Not a TextGuard index file: {path}")
+        if version != VERSION:
+            raise ValueError(f"Unsupported index version {version}: {path}")
+        self.dual_hash = bool(flags & DUAL_HASH)
+
+        offset = align8(HEADER.size)
+        self.hashes, offset = self.view(np.uint64, unique, offset)
+        self.post_start, offset = self.view(np.uint64, unique + 1, offset)
+        self.post_doc, offset = self.view(np.uint32, postings, offset)
+        self.post_offset, offset = self.view(np.uint32, postings, offset)
+        self.doc_fps, offset = self.view(np.uint64, docs, offset)
+        self.doc_ids = json.loads(self.buffer[offset:offset + names].decode("utf-8"))
+
+    def view(self, dtype, count, offset):
+        array = np.frombuffer(self.buffer, dtype=dtype, count=count, offset=offset)
+        return array, offset + align8(array.nbytes)
+
+    def __len__(self):
+        return len(self.doc_ids)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        # Views must be dropped before the mmap can be closed
+        self.hashes = self.post_start = self.post_doc = self.post_offset = self.doc_fps = None
+        self.buffer.close()
+
+    def find(self, h):
+        # Index of h in the sorted hash array, or -1
+        i = int(np.searchsorted(self.hashes, np.uint64(h)))
+        if i < len(self.hashes) and self.hashes[i] == h:
+            return i
+        return -1
+
+    def lookup(self, h):
+        i = self.find(h)
+        if i < 0:
+            return []
+        start, end = int(self.post_start[i]), int(self.post_start[i + 1])
+        return [(self.doc_ids[d], pos) for d, pos in
+                zip(self.post_doc[start:end].tolist(), self.post_offset[start:end].tolist())]
+
+    def shared_counts(self, hashes):
+        """
+        Distinct query hashes shared with each document, as a length-D array.
+        Time Complexity: O(Q log U + P_hit)
+        """
+        q = np.unique(np.asarray(hashes, dtype=np.uint64))
+        pos = np.searchsorted(self.hashes, q)
+        inside = pos < len(self.hashes)
+        pos = pos[inside]
+        pos = pos[self.hashes[pos] == q[inside]]
+
+        starts = self.post_start[pos].astype(np.int64)
+        lengths = self.post_start[pos + 1].astype(np.int64) - starts
+        # Expand every [start, end) posting range into one flat index array
+        shift = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        postings = np.arange(int(lengths.sum())) + shift
+        pairs = np.repeat(np.arange(len(pos), dtype=np.int64), lengths) * len(self.doc_ids)
+        pairs = np.unique(pairs + self.post_doc[postings])
+        return np.bincount(pairs % len(self.doc_ids), minlength=len(self.doc_ids))
@@ -0,0 +1,235 @@
+import re
+from contextlib import contextmanager
+import numpy as np
+from .engine import sorted_unique
+
+# --- STREAMING SCAN (Bounded-Memory Suspect Processing) ---
+
+CHUNK_SIZE = 1 << 20
+# Whitespace-free text iter_tokens carries (plus one chunk) before cutting a run
+MAX_TOKEN = 1 << 24
+WHITESPACE = re.compile(r'\s')
+
+@contextmanager
+def open_text(source, encoding="utf-8"):
+    # Accepts a path or an already-open text file
+    if hasattr(source, "read"):
+        yield source
+    else:
+        with open(source, encoding=encoding, errors="replace") as f:
+            yield f
+
+def iter_chunks(stream, chunk_size=CHUNK_SIZE):
+    """
+    Yields the text of stream in pieces of about chunk_size characters that
+    end at whitespace, so no token is ever split at a chunk boundary. The
+    raw text after the last whitespace of each chunk is carried into the
+    next one. Only the new chunk is searched (backwards) for whitespace, so
+    a long run without any costs O(run), not O(run^2). A single run longer
+    than MAX_TOKEN characters is cut there to keep memory bounded; that is
+    the one case where the tokens differ from preprocess().
+    """
+    carry = []
+    carried = 0
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        last_space = WHITESPACE.search(chunk[::-1])
+        if last_space is None and carried + len(chunk) <= MAX_TOKEN:
+            carry.append(chunk)
+            carried += len(chunk)
+            continue
+        cut = len(chunk) - last_space.start() if last_space is not None else len(chunk)
+        carry.append(chunk[:cut])
+        yield "".join(carry)
+        carry = [chunk[cut:]]
+        carried = len(carry[0])
+    if carried:
+        yield "".join(carry)
+
+class StreamingShingler:
+    """
+    DSA Logic: hash_tokens() over text that arrives in chunks. Each chunk is
+    tokenized and hashed in one vectorized call, prefixed with the last
+    n - 1 tokens of the chunk before it, so every shingle that straddles a
+    boundary is hashed exactly once. Memory: O(chunk + n).
+    """
+    def __init__(self, engine):
+        self.engine = engine
+        self.tail = []
+        self.count = 0
+
+    @property
+    def shingles(self):
+        # Shingles hashed so far, i.e. the offset of the next chunk's first hash
+        return max(0, self.count - self.engine.n + 1)
+
+    def push(self, text):
+        # (tokens, hashes) of one chunk; hashes[j] is the shingle starting at tokens[j]
+        engine = self.engine
+        tokens = engine.tokenize(" ".join(self.tail + [text]) if self.tail else text)
+        hashes = np.asarray(engine.hash_tokens(tokens), dtype=np.uint64)
+        self.count += len(tokens) - len(self.tail)
+        self.tail = tokens[max(0, len(tokens) - engine.n + 1):] if engine.n > 1 else []
+        return tokens, hashes
+
+class StreamingWinnower:
+    """
+    DSA Logic: vector_winnow() over hashes that arrive in chunks. The last
+    w - 1 hashes are carried into the next chunk along with the pick of the
+    last window, so every window is decided once and ties follow the same
+    keep-previous rule as one call over the whole array. A stream shorter
+    than w keeps every hash, as winnow_positions does.
+    """
+    def __init__(self, engine):
+        self.engine = engine
+        self.carry = np.zeros(0, dtype=np.uint64)
+        # Shingle offset of carry[0], and of the last window's pick once there is one
+        self.offset = 0
+        self.previous = None
+
+    def push(self, hashes):
+        # New fingerprints as (hashes, shingle offsets) arrays
+        w = self.engine.w
+        combined = np.concatenate((self.carry, hashes))
+        if len(combined) < w:
+            self.carry = combined
+            return combined[:0], np.zeros(0, dtype=np.int64)
+        previous = None if self.previous is None else self.previous - self.offset
+        picked, positions = self.engine.vector_winnow(combined, previous)
+        positions = positions + self.offset
+        if len(positions):
+            self.previous = int(positions[-1])
+        done = len(combined) - (w - 1)
+        self.carry = combined[done:]
+        self.offset += done
+        return picked, positions
+
+    def finish(self):
+        # Fingerprints still owed for a stream shorter than w
+        if self.previous is not None:
+            return self.carry[:0], np.zeros(0, dtype=np.int64)
+        return self.carry, np.arange(len(self.carry)) + self.offset
+
+def stream_fingerprints(engine, source, chunk_size=CHUNK_SIZE, encoding="utf-8"):
+    # Positional fingerprints of a path or text file as (hashes, offsets) arrays
+    shingler = StreamingShingler(engine)
+    winnower = StreamingWinnower(engine)
+    parts = []
+    with open_text(source, encoding) as stream:
+        for text in iter_chunks(stream, chunk_size):
+            parts.append(winnower.push(shingler.push(text)[1]))
+    if shingler.count < engine.n:
+        return np.zeros(0, dtype=np.uint64), np.zeros(0, dtype=np.int64)
+    parts.append(winnower.finish())
+    return np.concatenate([h for h, _ in parts]), np.concatenate([pos for _, pos in parts])
+
+def fingerprint_stream(engine, source, chunk_size=CHUNK_SIZE, encoding="utf-8"):
+    """
+    Positional fingerprints of a path or text file, equal to
+    engine.fingerprint(whole_text) on every backend without holding the
+    text in memory.
+    """
+    hashes, positions = stream_fingerprints(engine, source, chunk_size, encoding)
+    return list(zip(hashes.tolist(), positions.tolist()))
+
+def rewind(source):
+    # A way to read source again from the start, or None for one-shot streams
+    if not hasattr(source, "read"):
+        return source
+    if source.seekable():
+        start = source.tell()
+        def reopen():
+            source.seek(start)
+            return source
+        return reopen
+    return None
+
+def phrases_at(engine, source, offsets, chunk_size=CHUNK_SIZE, encoding="utf-8"):
+    """
+    Second pass over source that rebuilds the shingles starting at the given
+    token offsets. Keeps only one chunk and the requested phrases.
+    """
+    wanted = sorted(set(offsets))
+    phrases = {}
+    if not wanted:
+        return phrases
+    shingler = StreamingShingler(engine)
+    with open_text(source, encoding) as stream:
+        for text in iter_chunks(stream, chunk_size):
+            start = shingler.shingles
+            tokens, hashes = shingler.push(text)
+            for offset in wanted:
+                if start <= offset < start + len(hashes):
+                    j = offset - start
+                    phrases[offset] = " ".join(tokens[j:j + engine.n])
+            if len(phrases) == len(wanted):
+                break
+    return phrases
+
+def scan_stream(engine, source_a, source_b, chunk_size=CHUNK_SIZE, encoding="utf-8"):
+    """
+    execute_scan(A, B) for two paths or text files. A's fingerprint set is
+    the only structure that grows with input; B is hashed and probed one
+    chunk at a time (scan_vectorized) and matches keep just their first
+    token offset. Top-k phrases are rebuilt by a second pass over B, or
+    captured on the fly when B cannot be re-read.
+    Memory: O(fingerprints of A + chunk_size)
+    """
+    fingerprints_a = sorted_unique(stream_fingerprints(engine, source_a, chunk_size, encoding)[0])
+    bloom = engine.build_filter(fingerprints_a) if len(fingerprints_a) else None
+
+    reopen_b = rewind(source_b)
+    shingler = StreamingShingler(engine)
+    matches = 0
+    bloom_skips = 0
+    match_freq_map = {}
+    match_pos = {}
+    captured = {}
+    with open_text(source_b, encoding) as stream:
+        for text in iter_chunks(stream, chunk_size):
+            start = shingler.shingles
+            tokens, hashes = shingler.push(text)
+            if bloom is None or not len(hashes):
+                continue
+            found, skips, freq, first = engine.scan_vectorized(bloom, fingerprints_a, hashes)
+            matches += found
+            bloom_skips += skips
+            for h, count in freq.items():
+                if h not in match_freq_map:
+                    match_pos[h] = start + first[h]
+                    if reopen_b is None:
+                        captured[h] = " ".join(tokens[first[h]:first[h] + engine.n])
+                match_freq_map[h] = match_freq_map.get(h, 0) + count
+
+    if not len(fingerprints_a) or shingler.count < engine.n:
+        return None
+
+    top_k_raw = engine.get_top_k_matches(match_freq_map, k=5)
+    phrases = captured
+    if reopen_b is not None:
+        for _, h in top_k_raw:
+            cached = engine.phrase_cache.get(h)
+            if cached is not None:
+                phrases[h] = cached
+        missing = [match_pos[h] for _, h in top_k_raw if h not in phrases]
+        if missing:
+            source = reopen_b() if callable(reopen_b) else reopen_b
+            by_offset = phrases_at(engine, source, missing, chunk_size, encoding)
+            for _, h in top_k_raw:
+                if h not in phrases and match_pos[h] in by_offset:
+                    phrases[h] = by_offset[match_pos[h]]
+                    engine.phrase_cache.put(h, phrases[h])
+    top_k_formatted = [
+        {"phrase": phrases.get(h, "Unknown"), "count": freq}
+        for freq, h in top_k_raw
+    ]
+    fps = len(fingerprints_a)
+    return {
+        "score": (matches / fps) * 100 if fps > 0 else 0,
+        "matches": matches,
+        "skips": bloom_skips,
+        "fps": fps,
+        "top_k": top_k_formatted
+    }
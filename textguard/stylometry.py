@@ -0,0 +1,29 @@
+import re
+
+# --- STYLOMETRY UTILS ---
+
+SENTENCE_END = re.compile(r'[.!?]+')
+
+def analyze_style(text):
+    """
+    (average words per sentence, distinct / total words). text may also be
+    an iterable of pieces that each end at whitespace, as stream.iter_chunks
+    yields; a sentence cut between two pieces still counts once.
+    """
+    sentences = words = 0
+    distinct = set()
+    # Whether the sentence still open at the end of the last piece has text
+    pending = False
+    for chunk in [text] if isinstance(text, str) else text:
+        parts = SENTENCE_END.split(chunk)
+        pending = pending or bool(parts[0].strip())
+        if len(parts) > 1:
+            sentences += pending + sum(1 for part in parts[1:-1] if part.strip())
+            pending = bool(parts[-1].strip())
+        tokens = chunk.split()
+        words += len(tokens)
+        distinct.update(tokens)
+    sentences += pending
+    avg_sentence_len = words / sentences if sentences else 0
+    vocab_richness = len(distinct) / words if words else 0
+    return avg_sentence_len, vocab_richness
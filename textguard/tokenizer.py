@@ -0,0 +1,237 @@
+import re
+import threading
+from operator import itemgetter
+import numpy as np
+
+# --- TOKENIZER (Interned Token IDs & Character Offsets) ---
+
+PUNCT = re.compile(r'[^\w\s]')
+# Character classes of the first 256 code points; the rest are classified
+# once per distinct code point in the text
+LATIN_SPACE = np.array([chr(c).isspace() for c in range(256)])
+LATIN_WORD = np.array([re.match(r'\w', chr(c)) is not None for c in range(256)])
+
+def classify(points, table, test):
+    # Boolean class per code point: table lookup below 256, test() above
+    if not len(points) or points.max() < 256:
+        return table[points]
+    result = np.zeros(len(points), dtype=bool)
+    low = points < 256
+    result[low] = table[points[low]]
+    if not low.all():
+        high = points[~low]
+        uniq = np.unique(high)
+        flags = np.fromiter((test(chr(c)) for c in uniq.tolist()), dtype=bool, count=len(uniq))
+        result[~low] = flags[np.searchsorted(uniq, high)]
+    return result
+
+def power_mod(base, exps, mod):
+    """
+    Element-wise base^exps mod p for a uint64 exponent array, from two small
+    lookup tables: base^e = base^(hi * 2048) * base^lo. p < 2^32, so every
+    product fits in uint64.
+    Time Complexity: O(N + max(exps) / 2048)
+    """
+    block = 2048
+    exps = np.asarray(exps, dtype=np.uint64)
+    top = int(exps.max()) if len(exps) else 0
+    low = [1]
+    for _ in range(block):
+        low.append(low[-1] * base % mod)
+    high = [1]
+    for _ in range(top // block):
+        high.append(high[-1] * low[block] % mod)
+    low = np.array(low[:block], dtype=np.uint64)
+    high = np.array(high, dtype=np.uint64)
+    return high[exps >> np.uint64(11)] * low[exps & np.uint64(block - 1)] % np.uint64(mod)
+
+def poly_hashes(tokens, base, mod):
+    """
+    Polynomial hash mod p of every string at once (the per-character Horner
+    loop of get_double_hash): each code point is scaled by base^-offset in
+    the concatenated text, so a string's hash is a cumulative-sum difference
+    rescaled by base^(last offset).
+    Time Complexity: O(total characters) NumPy ops
+    """
+    lengths = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+    points = np.frombuffer("".join(tokens).encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    p = np.uint64(mod)
+    # Code points < 2^21 times powers < 2^32, and sums of those stay below 2^64
+    terms = points.astype(np.uint64) * power_mod(pow(base, mod - 2, mod), np.arange(len(points)), mod) % p
+    sums = np.concatenate(([0], np.cumsum(terms, dtype=np.uint64))).astype(np.uint64)
+    ends = np.cumsum(lengths)
+    last = np.maximum(ends - 1, 0)
+    hashes = (sums[ends] - sums[ends - lengths]) % p * power_mod(base, last, mod) % p
+    hashes[lengths == 0] = 0
+    return hashes
+
+def token_offsets(text):
+    """
+    Character spans [start, end) in the original text of the tokens that
+    preprocess() yields: whitespace-delimited runs holding a word character.
+    Time Complexity: O(len(text)) NumPy ops
+    """
+    points = np.frombuffer(text.encode("utf-32-le", "surrogatepass"), dtype=np.uint32)
+    dtype = np.uint32 if len(points) < 1 << 32 else np.uint64
+    if not len(points):
+        return np.zeros(0, dtype=dtype), np.zeros(0, dtype=dtype)
+    space = classify(points, LATIN_SPACE, str.isspace)
+    word = classify(points, LATIN_WORD, lambda ch: re.match(r'\w', ch) is not None)
+
+    bounds = np.concatenate(([0], np.flatnonzero(space[1:] != space[:-1]) + 1, [len(points)]))
+    runs = ~space[bounds[:-1]]
+    starts, ends = bounds[:-1][runs], bounds[1:][runs]
+    # Runs of pure punctuation vanish in preprocess()
+    word_sums = np.concatenate(([0], np.cumsum(word, dtype=np.int64)))
+    keep = word_sums[ends] > word_sums[starts]
+    return starts[keep].astype(dtype), ends[keep].astype(dtype)
+
+class Vocabulary:
+    """
+    DSA Logic: Token interning. Each distinct token gets a dense uint32 ID
+    the first time it is seen, so a document is 4 bytes per token instead of
+    one string object per token. Token lengths and per-modulus polynomial
+    hashes are cached by ID, so hashing only touches tokens never seen before.
+    Shared by every document of an engine; grows with the distinct vocabulary.
+    Raw whitespace-split pieces ("word," or "(word") map to the ID of their
+    stripped token in raw_ids, so punctuation is stripped once per distinct
+    piece rather than once per text.
+    """
+    def __init__(self):
+        self.ids = {}
+        self.tokens = []
+        # lowercased piece -> token ID, or -1 for a piece that is all punctuation
+        self.raw_ids = {}
+        self.lock = threading.Lock()
+        # name -> (uint64 buffer, filled count); buffers double when full
+        self.tables = {}
+
+    def __len__(self):
+        return len(self.tokens)
+
+    @staticmethod
+    def lookup(table, keys, add):
+        # table[key] for every key, one C-level dict lookup each; add(keys)
+        # fills in the missing keys only when there are any
+        if len(keys) < 2:
+            return [add(keys)[key] for key in keys]
+        get = itemgetter(*keys)
+        try:
+            return get(table)
+        except KeyError:
+            return get(add(keys))
+
+    def intern(self, words):
+        # uint32 ID array for a list of token strings
+        return np.array(self.lookup(self.ids, words, self.add_tokens), dtype=np.uint32)
+
+    def intern_pieces(self, pieces):
+        # uint32 IDs of the preprocess() tokens of lowercased, whitespace-split text
+        ids = np.array(self.lookup(self.raw_ids, pieces, self.add_pieces), dtype=np.int64)
+        return ids[ids >= 0].astype(np.uint32)
+
+    def add_tokens(self, words):
+        # IDs for tokens never seen before, in order of first occurrence
+        ids = self.ids
+        new = [token for token in dict.fromkeys(words) if token not in ids]
+        if new:
+            with self.lock:
+                for token in new:
+                    if token not in ids:
+                        ids[token] = len(self.tokens)
+                        self.tokens.append(token)
+        return ids
+
+    def add_pieces(self, pieces):
+        # Strips punctuation from pieces never seen before; removing characters
+        # never creates whitespace, so stripping after the split gives the same tokens
+        raw_ids = self.raw_ids
+        new = [piece for piece in dict.fromkeys(pieces) if piece not in raw_ids]
+        if new:
+            stripped = [PUNCT.sub('', piece) for piece in new]
+            ids = self.add_tokens([token for token in stripped if token])
+            with self.lock:
+                for piece, token in zip(new, stripped):
+                    raw_ids[piece] = ids[token] if token else -1
+        return raw_ids
+
+    def table(self, name, compute):
+        # Per-ID values; compute(tokens) only runs on the tokens added since the last call
+        with self.lock:
+            size = len(self.tokens)
+            buffer, filled = self.tables.get(name, (np.zeros(1024, dtype=np.uint64), 0))
+            if filled < size:
+                if size > len(buffer):
+                    grown = np.zeros(max(size, 2 * len(buffer)), dtype=np.uint64)
+                    grown[:filled] = buffer[:filled]
+                    buffer = grown
+                buffer[filled:size] = compute(self.tokens[filled:size])
+                self.tables[name] = (buffer, size)
+            return buffer[:size]
+
+    def token_lengths(self):
+        return self.table("length", lambda tokens: list(map(len, tokens)))
+
+    def token_hashes(self, base, mod):
+        # Polynomial hash of every token mod p
+        return self.table((base, mod), lambda tokens: poly_hashes(tokens, base, mod))
+
+    def spaced_hashes(self, base, mod):
+        # Polynomial hash of " " + token mod p
+        return self.table(("spaced", base, mod), lambda tokens: poly_hashes([" " + token for token in tokens], base, mod))
+
+    def token_shifts(self, base, mod):
+        # base^(length + 1) mod p: moves a hash past one token and its leading space
+        return self.table(("shift", base, mod),
+                          lambda tokens: power_mod(base, np.fromiter(map(len, tokens), dtype=np.uint64, count=len(tokens)) + np.uint64(1), mod))
+
+class Tokens:
+    # One tokenized document: uint32 token IDs into a shared Vocabulary,
+    # optional character offsets, and list-like access to the token strings
+    def __init__(self, vocab, ids, starts=None, ends=None):
+        self.vocab = vocab
+        self.ids = ids
+        self.starts = starts
+        self.ends = ends
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, key):
+        tokens = self.vocab.tokens
+        if isinstance(key, slice):
+            return [tokens[i] for i in self.ids[key].tolist()]
+        return tokens[self.ids[key]]
+
+    def __iter__(self):
+        return map(self.vocab.tokens.__getitem__, self.ids.tolist())
+
+    def words(self):
+        return list(self)
+
+class Tokenizer:
+    """
+    Lowercasing and splitting run as whole-text C passes; punctuation is
+    stripped per distinct piece through Vocabulary.raw_ids, and the piece
+    strings only live until they are looked up.
+    Produces exactly the tokens of TextGuardEngine.preprocess(), so hashes
+    and saved indexes do not change. Offsets are opt-in since only span
+    reporting needs them.
+    """
+    def __init__(self, vocab=None):
+        self.vocab = vocab if vocab is not None else Vocabulary()
+
+    def tokenize(self, text, offsets=False):
+        ids = self.vocab.intern_pieces(text.lower().split())
+        starts = ends = None
+        if offsets:
+            starts, ends = token_offsets(text)
+            if len(starts) != len(ids):
+                # lower() changed a character class; match tokens one by one
+                starts, ends = self.slow_offsets(text)
+        return Tokens(self.vocab, ids, starts, ends)
+
+    def slow_offsets(self, text):
+        spans = [m.span() for m in re.finditer(r'\S+', text) if PUNCT.sub('', m.group().lower())]
+        spans = np.array(spans, dtype=np.int64).reshape(-1, 2)
+        return spans[:, 0].astype(np.uint32), spans[:, 1].astype(np.uint32)
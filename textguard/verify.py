@@ -0,0 +1,152 @@
+import numpy as np
+
+# --- EXACT VERIFICATION (Suffix Array + LCP over Token IDs) ---
+
+# Largest pair (A + B tokens) verified by default. Peak memory is O(N log N)
+# int64: one rank array per doubling round plus the sparse table, 300-450 MB
+# per million tokens depending on the longest repeat, so a 32 MiB service
+# body (~5M tokens) is refused.
+MAX_TOKENS = 1 << 20
+
+def suffix_array(seq):
+    """
+    DSA Logic: Prefix doubling. Suffixes are ranked by their first k
+    symbols, then re-sorted by (rank[i], rank[i + k]) so k doubles each
+    round; stops as soon as all ranks are distinct.
+    Time Complexity: O(N log N) sort per round, O(log L) rounds for
+    longest repeat L, so O(N log^2 N) worst case
+    Returns (sa, levels): levels[p] ranks every suffix by its first 2^p
+    symbols (the last level is the inverse permutation of sa).
+    """
+    n = len(seq)
+    rank = np.unique(np.asarray(seq), return_inverse=True)[1].astype(np.int64).ravel()
+    sa = np.argsort(rank, kind="stable")
+    levels = [rank]
+    k = 1
+    while n > 1 and rank[sa[-1]] < n - 1:
+        # (rank[i], rank[i + k] or -1 past the end) packed into one int64 sort key
+        key = rank * (n + 1)
+        key[:n - k] += rank[k:] + 1
+        sa = np.argsort(key)
+        sorted_key = key[sa]
+        steps = sorted_key[1:] != sorted_key[:-1]
+        rank = np.empty(n, dtype=np.int64)
+        rank[sa] = np.concatenate(([0], np.cumsum(steps)))
+        levels.append(rank)
+        k *= 2
+    return sa, levels
+
+def lcp_array(sa, levels):
+    """
+    lcp[r] is the longest common prefix of suffixes sa[r - 1] and sa[r].
+    Binary lifting over the doubling ranks, for all adjacent pairs at once:
+    from the longest block down, a pair advances by 2^p whenever its next
+    2^p symbols share a rank.
+    Time Complexity: O(N log L) NumPy ops
+    """
+    n = len(sa)
+    lcp = np.zeros(n, dtype=np.int64)
+    if n < 2:
+        return lcp
+    left, right = sa[:-1].astype(np.int64), sa[1:].astype(np.int64)
+    h = np.zeros(n - 1, dtype=np.int64)
+    for p in range(len(levels) - 1, -1, -1):
+        rank = levels[p]
+        i, j = left + h, right + h
+        inside = (i < n) & (j < n)
+        same = inside & (rank[np.minimum(i, n - 1)] == rank[np.minimum(j, n - 1)])
+        h[same] += 1 << p
+    lcp[1:] = h
+    return lcp
+
+def range_min(values):
+    # Sparse table: query(lo, hi) is min(values[lo:hi + 1]) for index arrays, hi >= lo
+    table = [values]
+    while 2 ** len(table) <= len(values):
+        prev, half = table[-1], 2 ** (len(table) - 1)
+        table.append(np.minimum(prev[:-half], prev[half:]))
+
+    def query(lo, hi):
+        p = np.floor(np.log2(hi - lo + 1)).astype(np.int64)
+        result = np.empty(len(lo), dtype=values.dtype)
+        for level in np.unique(p).tolist():
+            at = p == level
+            result[at] = np.minimum(table[level][lo[at]], table[level][hi[at] - 2 ** level + 1])
+        return result
+    return query
+
+def matching_statistics(sa, lcp, len_a):
+    """
+    For every suffix of B (text positions after len_a + 1), the longest
+    prefix that also starts somewhere in A, plus one such A position. The
+    nearest A suffix above and below in suffix order bounds it, with the
+    minimum LCP in between as the match length; nearest A neighbours come
+    from running max/min indexes, the minima from a sparse table.
+    Time Complexity: O(N log N) NumPy ops
+    Returns (length, witness) indexed by text position.
+    """
+    n = len(sa)
+    length = np.zeros(n, dtype=np.int64)
+    witness = np.full(n, -1, dtype=np.int64)
+    order = np.arange(n)
+    is_a = sa < len_a
+    above = np.maximum.accumulate(np.where(is_a, order, -1))
+    below = np.minimum.accumulate(np.where(is_a, order, n)[::-1])[::-1]
+    rows = np.flatnonzero(sa > len_a)
+    query = range_min(lcp)
+
+    best = np.zeros(len(rows), dtype=np.int64)
+    best_at = np.full(len(rows), -1, dtype=np.int64)
+    # Below first so that the A suffix above wins ties
+    for near, lo, hi in ((below[rows], rows + 1, below[rows]), (above[rows], above[rows] + 1, rows)):
+        found = (near >= 0) & (near < n)
+        run = np.zeros(len(rows), dtype=np.int64)
+        run[found] = query(lo[found], hi[found])
+        better = found & (run >= best)
+        best[better], best_at[better] = run[better], sa[near[better]]
+    length[sa[rows]] = best
+    witness[sa[rows]] = best_at
+    return length, witness
+
+def common_passages(ids_a, ids_b, min_tokens):
+    """
+    Every maximal token run of B that also occurs verbatim in A and is at
+    least min_tokens long, as (pos_a, pos_b, tokens), in B order. Runs
+    already covered by the previous passage are dropped.
+    """
+    len_a = len(ids_a)
+    if not len_a or not len(ids_b):
+        return []
+    # Sentinel -1 never equals a token ID, so no match crosses the boundary
+    seq = np.concatenate((np.asarray(ids_a, dtype=np.int64), [-1], np.asarray(ids_b, dtype=np.int64)))
+    sa, levels = suffix_array(seq)
+    length, witness = matching_statistics(sa, lcp_array(sa, levels), len_a)
+
+    sizes = length[len_a + 1:]
+    starts = np.flatnonzero(sizes >= min_tokens)
+    ends = starts + sizes[starts]
+    # Kept when it reaches past every earlier passage
+    reach = np.concatenate(([0], np.maximum.accumulate(ends)[:-1])) if len(ends) else ends
+    keep = ends > reach
+    starts, sizes_kept = starts[keep], sizes[starts[keep]]
+    pos_a = witness[len_a + 1 + starts]
+    return list(zip(pos_a.tolist(), starts.tolist(), sizes_kept.tolist()))
+
+def exact_spans(passages, tokens_a, tokens_b):
+    # (pos_a, pos_b, tokens) triples as character spans; score is 1.0 by construction
+    return [{
+        "start_a": int(tokens_a.starts[i]),
+        "end_a": int(tokens_a.ends[i + size - 1]),
+        "start_b": int(tokens_b.starts[j]),
+        "end_b": int(tokens_b.ends[j + size - 1]),
+        "tokens": size,
+        "score": 1.0,
+    } for i, j, size in passages]
+
+def coverage(passages, total):
+    # Percent of B tokens inside at least one passage (passages are in B order)
+    covered = end = 0
+    for _, j, size in passages:
+        covered += max(0, j + size - max(j, end))
+        end = max(end, j + size)
+    return covered / total * 100 if total else 0.0